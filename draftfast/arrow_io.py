@@ -0,0 +1,178 @@
+'''
+Optional Apache Arrow / Parquet support for player pools, lineups
+and exposure. Requires pyarrow (pip install draftfast[arrow]).
+'''
+from typing import List
+import numpy as np
+from draftfast.orm import Roster
+from draftfast.columnar import ColumnarPool, STRING_FIELDS, FLOAT_FIELDS
+from draftfast.games import GameTable
+from draftfast.exposure import ExposureSummary
+
+PYARROW_MISSING = (
+    'pyarrow is required for Arrow / Parquet support. '
+    'Install it with "pip install draftfast[arrow]".'
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(PYARROW_MISSING)
+    return pyarrow
+
+
+def pool_from_arrow(table, column_map: dict = None,
+                    game_table: GameTable = None) -> ColumnarPool:
+    '''
+    Builds a ColumnarPool from an Arrow table. Columns are read by
+    pool field name (name, pos, cost, proj, team, matchup, ...);
+    column_map maps a field to a differently named column, e.g.
+    {'cost': 'Salary'}. Float columns without nulls are taken
+    without copying, so they are read-only views of the Arrow
+    buffers. If there is no proj column, average_score is
+    used, as with salary files.
+    '''
+    pa = _pyarrow()
+    column_map = column_map or {}
+    names = set(table.column_names)
+
+    columns = {}
+    for field in STRING_FIELDS:
+        column = column_map.get(field, field)
+        if column in names:
+            columns[field] = _column(table, column).to_pylist()
+    for field in FLOAT_FIELDS:
+        column = column_map.get(field, field)
+        if column in names:
+            columns[field] = _float_array(pa, _column(table, column))
+
+    if 'name' not in columns:
+        raise ValueError('Arrow table has no player name column')
+    if 'proj' not in columns and 'average_score' in columns:
+        columns['proj'] = columns['average_score']
+    if 'possible_positions' not in columns and 'pos' in columns:
+        columns['possible_positions'] = columns['pos']
+
+    pool = ColumnarPool(**columns)
+    pool.index_games(game_table or GameTable())
+    return pool
+
+
+def read_pool_parquet(path: str, column_map: dict = None,
+                      game_table: GameTable = None) -> ColumnarPool:
+    '''Reads only the pool's columns from a Parquet file'''
+    pa = _pyarrow()
+    column_map = column_map or {}
+    wanted = [
+        column_map.get(field, field)
+        for field in STRING_FIELDS + FLOAT_FIELDS
+    ]
+    schema = pa.parquet.read_schema(path)
+    table = pa.parquet.read_table(
+        path,
+        columns=[c for c in wanted if c in schema.names],
+    )
+    return pool_from_arrow(table, column_map, game_table)
+
+
+def lineups_to_arrow(rosters: List[Roster]):
+    '''
+    One row per player per lineup, in each roster's slot order:
+    lineup, slot, name, pos, team, matchup, cost, proj, player_id.
+    '''
+    pa = _pyarrow()
+    rows = {
+        'lineup': [],
+        'slot': [],
+        'name': [],
+        'pos': [],
+        'team': [],
+        'matchup': [],
+        'cost': [],
+        'proj': [],
+        'player_id': [],
+    }
+    for lineup, roster in enumerate(rosters):
+        for slot, p in enumerate(roster.sorted_players()):
+            rows['lineup'].append(lineup)
+            rows['slot'].append(slot)
+            rows['name'].append(p.name)
+            rows['pos'].append(p.pos)
+            rows['team'].append(p.team)
+            rows['matchup'].append(p.matchup)
+            rows['cost'].append(float(p.cost))
+            rows['proj'].append(float(p.proj))
+            rows['player_id'].append(getattr(p, 'player_id', None))
+
+    return pa.table({
+        'lineup': pa.array(rows['lineup'], type=pa.int32()),
+        'slot': pa.array(rows['slot'], type=pa.int16()),
+        'name': pa.array(rows['name'], type=pa.string()),
+        'pos': pa.array(rows['pos'], type=pa.string()),
+        'team': pa.array(rows['team'], type=pa.string()),
+        'matchup': pa.array(rows['matchup'], type=pa.string()),
+        'cost': pa.array(rows['cost'], type=pa.float64()),
+        'proj': pa.array(rows['proj'], type=pa.float64()),
+        'player_id': pa.array(rows['player_id'], type=pa.string()),
+    })
+
+
+def exposure_to_arrow(rosters: List[Roster], bounds: List[dict] = None):
+    '''
+    One row per rostered player, most exposed first: name, pos,
+    team, lineups (count), exposure (share of lineups) and the
+    min / max bound, if any.
+    '''
+    pa = _pyarrow()
+    summary = ExposureSummary(rosters, bounds)
+    names = summary.names
+    players = [summary.players[n] for n in names]
+    bounds = summary.bounds
+
+    return pa.table({
+        'name': pa.array(names, type=pa.string()),
+        'pos': pa.array([p.pos for p in players], type=pa.string()),
+        'team': pa.array([p.team for p in players], type=pa.string()),
+        'lineups': pa.array(summary.counts, type=pa.int32()),
+        'exposure': pa.array(summary.percentages, type=pa.float64()),
+        'min': pa.array(
+            [bounds[n]['min'] if n in bounds else None for n in names],
+            type=pa.float64(),
+        ),
+        'max': pa.array(
+            [bounds[n]['max'] if n in bounds else None for n in names],
+            type=pa.float64(),
+        ),
+    })
+
+
+def write_lineups_parquet(rosters: List[Roster], path: str):
+    _pyarrow().parquet.write_table(lineups_to_arrow(rosters), path)
+
+
+def write_exposure_parquet(rosters: List[Roster], path: str,
+                           bounds: List[dict] = None):
+    _pyarrow().parquet.write_table(exposure_to_arrow(rosters, bounds), path)
+
+
+def _column(table, name):
+    column = table.column(name)
+    # pyarrow < 0.15 wraps chunked arrays in a Column
+    return getattr(column, 'data', column)
+
+
+def _float_array(pa, column) -> np.ndarray:
+    column = column.cast(pa.float64())
+    if column.null_count:
+        return np.array(
+            [0 if v is None else v for v in column.to_pylist()],
+            dtype=np.float64,
+        )
+    if column.num_chunks == 0:
+        return np.zeros(0)
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy()
+    return np.concatenate([c.to_numpy() for c in column.chunks])
@@ -0,0 +1,198 @@
+from typing import List
+import numpy as np
+from draftfast.orm import Player
+from draftfast.games import GameTable
+from draftfast.showdown.orm import ShowdownPlayer
+
+# id columns use -1 where a player has no team / game / opponent
+MISSING_ID = -1
+
+STRING_FIELDS = (
+    'name',
+    'pos',
+    'possible_positions',
+    'team',
+    'matchup',
+    # showdown only: the position behind CPT / FLEX
+    'real_pos',
+)
+
+FLOAT_FIELDS = (
+    'cost',
+    'proj',
+    'average_score',
+    'projected_ownership_pct',
+)
+
+ID_FIELDS = (
+    'team_id',
+    'opp_id',
+    'game_id',
+)
+
+FIELDS = STRING_FIELDS + FLOAT_FIELDS + ID_FIELDS
+
+
+class ColumnarPool(object):
+    '''
+    Column-oriented player pool: one NumPy array per Player field,
+    all indexed by pool position. Pools can be built straight from
+    parsed rows without creating Player objects, and converted to
+    and from Player lists for the optimizer.
+    '''
+
+    def __init__(self, game_table: GameTable = None, **columns):
+        unknown = set(columns) - set(FIELDS)
+        if unknown:
+            raise ValueError('Unknown pool columns: {}'.format(
+                ', '.join(sorted(unknown))
+            ))
+
+        size = len(columns['name'])
+        for field in STRING_FIELDS:
+            values = columns.get(field)
+            if values is None:
+                values = [None] * size
+            setattr(self, field, _object_array(values))
+        for field in FLOAT_FIELDS:
+            values = columns.get(field)
+            if values is None:
+                values = np.zeros(size)
+            setattr(self, field, np.asarray(values, dtype=np.float64))
+        for field in ID_FIELDS:
+            values = columns.get(field)
+            if values is None:
+                values = np.full(size, MISSING_ID)
+            setattr(self, field, np.asarray(values, dtype=np.int32))
+
+        for field in FIELDS:
+            if len(getattr(self, field)) != size:
+                raise ValueError('Pool column {} has length {}, not {}'.format(
+                    field, len(getattr(self, field)), size,
+                ))
+
+        self.game_table = game_table
+        self._key_index = None
+        self._name_index = None
+
+    def __len__(self):
+        return len(self.name)
+
+    def __repr__(self):
+        return '<ColumnarPool: {} players>'.format(len(self))
+
+    @classmethod
+    def from_records(cls, records, game_table: GameTable = None):
+        '''
+        Builds a pool from an iterable of dicts keyed by field name,
+        e.g. rows decoded by salary_download. Team and game ids are
+        filled in from team / matchup.
+        '''
+        fields = STRING_FIELDS + FLOAT_FIELDS
+        columns = {field: [] for field in fields}
+        for record in records:
+            for field in fields:
+                columns[field].append(record.get(field))
+
+        for field in FLOAT_FIELDS:
+            columns[field] = [v or 0 for v in columns[field]]
+
+        pool = cls(**columns)
+        pool.index_games(game_table or GameTable())
+        return pool
+
+    @classmethod
+    def from_players(cls, players: List[Player],
+                     game_table: GameTable = None):
+        columns = {
+            field: [getattr(p, field, None) for p in players]
+            for field in STRING_FIELDS + FLOAT_FIELDS
+        }
+        pool = cls(**columns)
+        pool.index_games(game_table or GameTable())
+        return pool
+
+    def index_games(self, game_table: GameTable):
+        self.game_table = game_table
+        for i in range(len(self)):
+            team_id, game_id, opp_id, _ = game_table.index(
+                self.team[i],
+                self.matchup[i],
+            )
+            self.team_id[i] = _id_or_missing(team_id)
+            self.game_id[i] = _id_or_missing(game_id)
+            self.opp_id[i] = _id_or_missing(opp_id)
+        return self
+
+    def to_players(self) -> List[Player]:
+        return [self.get_player(i) for i in range(len(self))]
+
+    def get_player(self, i: int) -> Player:
+        '''
+        The Player at row i; rows with a real_pos become
+        ShowdownPlayers, captains if pos is CPT.
+        '''
+        possible_positions = self.possible_positions[i]
+        real_pos = self.real_pos[i]
+        player = Player(
+            pos=self.pos[i] if real_pos is None else real_pos,
+            name=self.name[i],
+            cost=self.cost[i],
+            proj=float(self.proj[i]),
+            average_score=float(self.average_score[i]),
+            projected_ownership_pct=float(self.projected_ownership_pct[i]),
+            team=self.team[i],
+            matchup=self.matchup[i],
+            possible_positions=possible_positions,
+            multi_position=bool(possible_positions) and
+            '/' in possible_positions,
+        )
+        if real_pos is not None:
+            player = ShowdownPlayer(player, captain=self.pos[i] == 'CPT')
+        player.team_id = _id_or_none(self.team_id[i])
+        player.game_id = _id_or_none(self.game_id[i])
+        player.opp_id = _id_or_none(self.opp_id[i])
+        if self.game_table is not None and player.opp_id is not None:
+            player.home = \
+                self.game_table.game_home[player.game_id] == player.team_id
+        return player
+
+    def key(self, i: int) -> str:
+        '''Same identifier as Player.solver_id'''
+        return '{} {} {}'.format(self.name[i], self.pos[i], self.team[i])
+
+    def index_of(self, key: str) -> int:
+        if self._key_index is None:
+            self._key_index = {
+                self.key(i): i for i in range(len(self))
+            }
+        return self._key_index.get(key)
+
+    def indexes_of_name(self, name: str) -> List[int]:
+        if self._name_index is None:
+            self._name_index = {}
+            for i, n in enumerate(self.name):
+                self._name_index.setdefault(n, []).append(i)
+        return self._name_index.get(name, [])
+
+    def take(self, indexes):
+        '''Returns a new pool holding only the given rows'''
+        indexes = np.asarray(indexes, dtype=np.int64)
+        return ColumnarPool(
+            game_table=self.game_table,
+            **{f: getattr(self, f)[indexes] for f in FIELDS}
+        )
+
+
+def _object_array(values) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
+
+
+def _id_or_missing(value) -> int:
+    return MISSING_ID if value is None else value
+
+
+def _id_or_none(value):
+    return None if value == MISSING_ID else int(value)
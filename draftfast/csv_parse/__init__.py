@@ -1,11 +1,21 @@
 from . import (
     mlb_upload,
+    parse_cache,
+    pid_index,
+    projection_blend,
+    projection_index,
+    slot_assignment,
     upload,
     salary_download,
     uploaders,
 )
 
 assert mlb_upload
+assert parse_cache
+assert pid_index
+assert projection_blend
+assert projection_index
+assert slot_assignment
 assert upload
 assert salary_download
 assert uploaders
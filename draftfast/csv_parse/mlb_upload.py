@@ -1,9 +1,10 @@
 import os
 import subprocess
 import csv
-from itertools import islice
 
-from draftfast import dke_exceptions as dke
+from draftfast.rules import DRAFT_KINGS
+from draftfast.csv_parse.pid_index import build_pid_index
+from draftfast.csv_parse.slot_assignment import get_slot_assigner
 
 upload_file = '{}/data/current-upload.csv'.format(os.getcwd())
 
@@ -28,33 +29,13 @@ def create_upload_file():
 
 
 def map_pids(pid_file):
-    player_map = {}
-    with open(pid_file, 'r') as f:
-        n = 0
-        fields = None
-        for line in f.readlines():
-            n += 1
-            if 'TeamAbbrev' in line:  # line with field names was found
-                fields = line.split(',')
-                break
-
-        if not fields:
-            raise dke.InvalidCSVUploadFileException(
-                "Check that you're using the DK CSV upload template, " +
-                "which can be found at " +
-                "https://www.draftkings.com/lineup/upload.")
-
-        f.close()
-        f = islice(open(pid_file, 'r'), n, None)
-        reader = csv.DictReader(f, fieldnames=fields)
-        for line in reader:
-            player_map[line['Name'] + ' ' + line['Position']] = line['ID']
-
-    return player_map
+    return build_pid_index(pid_file, game=DRAFT_KINGS)
 
 
 def update_upload_csv(player_map, roster):
-    sorted_players = roster.sorted_players()
+    sorted_players = get_slot_assigner(DRAFT_KINGS, 'MLB').order(
+        roster.sorted_players()
+    )
     with open(upload_file, 'a') as f:
         writer = csv.writer(f)
         writer.writerow([
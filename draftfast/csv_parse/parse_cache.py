@@ -0,0 +1,61 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+# bump when the parsed Player layout changes to invalidate old entries
+CACHE_VERSION = 2
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(file_location: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_location, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file_locations: list, **options) -> str:
+    '''
+    Key for a parsed pool: the content hash of every input file
+    plus the parse options, so renamed or re-downloaded copies of
+    the same slate share an entry and edited files never do.
+    '''
+    digest = hashlib.sha256()
+    digest.update(str(CACHE_VERSION).encode())
+    for file_location in file_locations:
+        if file_location:
+            digest.update(file_digest(file_location).encode())
+        else:
+            digest.update(b'-')
+    for k in sorted(options):
+        digest.update('{}={!r};'.format(k, options[k]).encode())
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, '{}.pickle'.format(key))
+
+
+def load(cache_dir: str, key: str):
+    try:
+        with open(_cache_path(cache_dir, key), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def dump(cache_dir: str, key: str, players: list):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # write then rename so concurrent workers never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(players, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _cache_path(cache_dir, key))
+    except Exception:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,113 @@
+import csv
+from draftfast.rules import DRAFT_KINGS, FAN_DUEL
+from draftfast import dke_exceptions as dke
+
+NAME_MAP = {
+    DRAFT_KINGS: {
+        'start': 'TeamAbbrev',
+        'name': 'Name',
+        'position': 'Position',
+        'roster_position': 'Roster Position',
+        'id': 'ID',
+    },
+    FAN_DUEL: {
+        # matched against the raw header line, so keeps its quotes
+        'start': '"Nickname"',
+        'name': 'Nickname',
+        'position': 'Position',
+        'id': 'Player ID + Player Name',
+    },
+}
+
+# showdown captain and FLEX rows share name and position
+SHOWDOWN_KEY_FIELDS = ('name', 'position', 'roster_position')
+
+UPLOAD_TEMPLATE_ERROR = (
+    "Check that you're using the DK CSV upload template, "
+    "which can be found at "
+    "https://www.draftkings.com/lineup/upload."
+)
+
+
+def build_pid_index(pid_file, game=DRAFT_KINGS, encoding='utf-8',
+                    errors='replace', key_fields=('name', 'position'),
+                    strip_dst=False, required=True) -> dict:
+    '''
+    Reads a site upload template in a single pass: lines are scanned
+    until the player list header is found, and the rest of the same
+    handle is parsed as CSV rows. Returns {key: player ID} where key
+    joins the key_fields values with a space, e.g. "LeBron James SF"
+    (see player_key).
+    '''
+    names = NAME_MAP[game]
+
+    with open(pid_file, 'r', encoding=encoding, errors=errors) as f:
+        fields = None
+        for line in f:
+            if names['start'] in line:  # line with field names was found
+                fields = next(csv.reader([line]))
+                break
+
+        if not fields:
+            if required:
+                raise dke.InvalidCSVUploadFileException(
+                    UPLOAD_TEMPLATE_ERROR
+                )
+            return {}
+
+        columns = {field: idx for idx, field in enumerate(fields)}
+        key_idxs = [columns[names[k]] for k in key_fields]
+        slot_idx = columns[names['roster_position']] \
+            if 'roster_position' in key_fields else None
+        position_idx = columns[names['position']]
+        id_idx = columns[names['id']]
+        width = len(fields)
+
+        player_map = {}
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            if slot_idx is not None:
+                row[slot_idx] = _showdown_slot(row[slot_idx])
+
+            # DraftKings adds spaces to DST for NFL
+            if strip_dst and 'DST' in row[position_idx]:
+                key = ' '.join(row[i].strip() for i in key_idxs)
+            else:
+                key = ' '.join(row[i] for i in key_idxs)
+
+            player_map[key] = row[id_idx]
+
+    return player_map
+
+
+def player_key(player, key_fields=('name', 'position')) -> str:
+    '''A player's key in a build_pid_index map with the same fields'''
+    values = {
+        'name': player.name,
+        'position': player.possible_positions,
+        # CPT or FLEX for ShowdownPlayers
+        'roster_position': player.pos,
+    }
+    return ' '.join(values[k] for k in key_fields)
+
+
+def attach_player_ids(players, player_map, key_fields=('name', 'position')):
+    '''
+    Stores each player's site ID on the player so uploads do not
+    need a lookup per slot per lineup. Players missing from the
+    map are left unchanged.
+    '''
+    for p in players:
+        player_id = player_map.get(player_key(p, key_fields))
+        if player_id is not None:
+            p.player_id = player_id
+
+    return players
+
+
+def _showdown_slot(roster_position: str) -> str:
+    # non-captain rows are labelled FLEX or UTIL depending on sport
+    return 'CPT' if roster_position == 'CPT' else 'FLEX'
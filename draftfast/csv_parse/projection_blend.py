@@ -0,0 +1,209 @@
+from typing import List
+import numpy as np
+from draftfast.csv_parse.projection_index import (
+    ProjectionIndex,
+    read_projection_csv,
+)
+
+WEIGHTED = 'weighted'
+MEDIAN = 'median'
+TRIMMED = 'trimmed'
+
+BLEND_METHODS = (WEIGHTED, MEDIAN, TRIMMED)
+
+
+class ProjectionSource(object):
+    '''
+    One projection feed: a {name: points} dict (names as in a
+    projection CSV, e.g. "Andrew Luck IND"), a blending weight and
+    optional per-position weights that replace it, e.g.
+    {'DST': 0} to ignore a source's defense projections.
+    '''
+
+    def __init__(self, projections: dict, weight: float = 1,
+                 position_weights: dict = None, name: str = None):
+        self.projections = projections
+        self.weight = weight
+        self.position_weights = position_weights or {}
+        self.name = name
+
+    def __repr__(self):
+        return '<ProjectionSource: {} ({} players, weight {})>'.format(
+            self.name,
+            len(self.projections),
+            self.weight,
+        )
+
+    @classmethod
+    def from_csv(cls, projection_file_location: str, weight: float = 1,
+                 position_weights: dict = None, encoding='utf-8',
+                 errors='replace'):
+        return cls(
+            read_projection_csv(
+                projection_file_location,
+                encoding=encoding,
+                errors=errors,
+            ),
+            weight=weight,
+            position_weights=position_weights,
+            name=projection_file_location,
+        )
+
+    def cache_key(self) -> tuple:
+        return (
+            sorted(self.projections.items()),
+            self.weight,
+            sorted(self.position_weights.items()),
+        )
+
+    def weights_for(self, positions) -> np.ndarray:
+        if not self.position_weights:
+            return np.full(len(positions), float(self.weight))
+        return np.array([
+            self._position_weight(pos) for pos in positions
+        ], dtype=np.float64)
+
+    def _position_weight(self, pos: str) -> float:
+        for p in (pos or '').split('/'):
+            if p in self.position_weights:
+                return float(self.position_weights[p])
+        return float(self.weight)
+
+
+def projection_matrix(names, teams, sources: List[ProjectionSource],
+                      renames: dict = None, team_list: list = None):
+    '''
+    Aligns every source to the pool through ProjectionIndex:
+    returns an (players x sources) array with NaN where a source
+    has no projection for a player.
+    '''
+    matrix = np.full((len(names), len(sources)), np.nan)
+    for j, source in enumerate(sources):
+        index = ProjectionIndex(
+            source.projections,
+            renames=renames,
+            teams=team_list,
+        )
+        points, matched = index.join(names, teams)
+        matrix[matched, j] = points[matched]
+    return matrix
+
+
+def blend(matrix: np.ndarray, weights: np.ndarray = None,
+          method: str = WEIGHTED, trim: float = 0.2) -> np.ndarray:
+    '''
+    Blends each row of a projection matrix, ignoring NaN. Rows
+    with no projections (or zero total weight) blend to NaN.
+
+    - weighted: weighted mean
+    - median: median of the sources with a non-zero weight
+    - trimmed: mean after dropping the lowest and highest trim
+      share of each row's sources
+    '''
+    if method not in BLEND_METHODS:
+        raise ValueError(
+            'Unknown blend method {}, expected one of {}'.format(
+                method,
+                ', '.join(BLEND_METHODS),
+            )
+        )
+
+    matrix = np.array(matrix, dtype=np.float64)
+    if weights is None:
+        weights = np.ones_like(matrix)
+    weights = np.where(np.isnan(matrix), 0, weights)
+
+    # sources weighted 0 for a player are left out of every method
+    matrix[weights == 0] = np.nan
+    available = ~np.isnan(matrix)
+    counts = available.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == WEIGHTED:
+            total = np.where(available, matrix * weights, 0).sum(axis=1)
+            result = total / weights.sum(axis=1)
+        elif method == MEDIAN:
+            result = np.full(len(matrix), np.nan)
+            rows = counts > 0
+            result[rows] = np.nanmedian(matrix[rows], axis=1)
+        else:
+            # NaN sorts last, so each row's values are its first counts
+            ordered = np.sort(matrix, axis=1)
+            cut = np.floor(counts * trim).astype(int)
+            cut = np.minimum(cut, (counts - 1) // 2)
+            columns = np.arange(matrix.shape[1])
+            keep = (columns >= cut[:, None]) & \
+                (columns < (counts - cut)[:, None])
+            total = np.where(keep, ordered, 0).sum(axis=1)
+            result = total / keep.sum(axis=1)
+
+    result[counts == 0] = np.nan
+    return result
+
+
+def blend_projections(names, teams, positions,
+                      sources: List[ProjectionSource],
+                      method: str = WEIGHTED, trim: float = 0.2,
+                      renames: dict = None, team_list: list = None):
+    '''
+    Returns (projections, source_counts) for parallel name / team /
+    position sequences. Players no source covers get 0.
+    '''
+    matrix = projection_matrix(
+        names,
+        teams,
+        sources,
+        renames=renames,
+        team_list=team_list,
+    )
+    weights = np.column_stack([
+        source.weights_for(positions) for source in sources
+    ]) if sources else np.zeros((len(names), 0))
+
+    result = blend(matrix, weights, method=method, trim=trim)
+    counts = (~np.isnan(matrix) & (weights != 0)).sum(axis=1)
+    return np.nan_to_num(result), counts
+
+
+def blend_players(players: list, sources: List[ProjectionSource],
+                  method: str = WEIGHTED, trim: float = 0.2,
+                  renames: dict = None, team_list: list = None) -> list:
+    '''Sets proj on every player and returns players with no source'''
+    points, counts = blend_projections(
+        [p.name for p in players],
+        [p.team for p in players],
+        [p.pos for p in players],
+        sources,
+        method=method,
+        trim=trim,
+        renames=renames,
+        team_list=team_list,
+    )
+    unmatched = []
+    for p, proj, count in zip(players, points.tolist(), counts):
+        p.proj = proj if count else 0
+        if not count:
+            unmatched.append(p)
+    return unmatched
+
+
+def blend_pool(pool, sources: List[ProjectionSource],
+               method: str = WEIGHTED, trim: float = 0.2,
+               renames: dict = None) -> list:
+    '''
+    Sets a ColumnarPool's proj column and returns the indexes of
+    rows with no source.
+    '''
+    team_list = pool.game_table.teams if pool.game_table else None
+    points, counts = blend_projections(
+        pool.name,
+        pool.team,
+        pool.pos,
+        sources,
+        method=method,
+        trim=trim,
+        renames=renames,
+        team_list=team_list,
+    )
+    pool.proj = points
+    return np.flatnonzero(counts == 0).tolist()
@@ -0,0 +1,212 @@
+import csv
+import re
+import unicodedata
+import warnings
+from typing import List
+import numpy as np
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# e.g. "Russell Wilson SEA" in NFL projection feeds
+TEAM_RE = re.compile(r'^[A-Z]{2,4}$')
+
+_PUNCTUATION_RE = re.compile(r"[.,'`’]")
+_SEPARATOR_RE = re.compile(r'[-_\s]+')
+
+
+def normalize_name(name: str, strip_suffixes: bool = True) -> str:
+    '''
+    Join key for a player name: accents, case, punctuation and
+    generational suffixes are dropped, so "Larry Nance Jr." and
+    "larry nance" share a key.
+    '''
+    if not name:
+        return ''
+
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = _PUNCTUATION_RE.sub('', name.lower())
+    tokens = _SEPARATOR_RE.sub(' ', name).strip().split(' ')
+    while strip_suffixes and len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def _rename_pairs(renames) -> list:
+    '''
+    Renames come as a {salary name: projection name} dict or,
+    as in nba.data_cleaning_constants, a list of
+    {'dk_name': ..., 'name': ...} dicts.
+    '''
+    if not renames:
+        return []
+    if isinstance(renames, dict):
+        return list(renames.items())
+    return [(r['dk_name'], r['name']) for r in renames]
+
+
+def read_projection_csv(projection_file_location: str, encoding='utf-8',
+                        errors='replace') -> dict:
+    '''Reads a playername,points CSV into {name: points}'''
+    projections = {}
+    with open(projection_file_location, 'r',
+              encoding=encoding, errors=errors) as csv_file:
+        csv_data = csv.DictReader(csv_file)
+        for row in csv_data:
+            name = row.get('playername').strip().rstrip()
+            projections[name] = float(row.get('points'))
+
+    return projections
+
+
+class ProjectionIndex(object):
+    '''
+    Normalized-key index over a {name: points} projection dict,
+    built once and joined against a whole pool. Keys ending in a
+    team abbreviation ("Andrew Luck IND") only match players on
+    that team; renames map alternate spellings to one name and
+    are applied to both projection and pool names.
+
+    Names are matched exactly (suffixes kept) first, then on the
+    suffix-free key. When two projections share a suffix-free key
+    ("Larry Nance" and "Larry Nance Jr."), that key is ambiguous:
+    it is left out of the loose match and recorded in collisions
+    rather than one projection overwriting the other.
+    '''
+
+    def __init__(self, projections: dict, renames=None,
+                 teams: List[str] = None):
+        self.renames = {
+            normalize_name(k): normalize_name(v)
+            for k, v in _rename_pairs(renames)
+        }
+        self.teams = set(t.upper() for t in teams) if teams else None
+        self.collisions = {}
+        self._exact = {}
+        self._loose = {}
+        self._ambiguous = set()
+
+        exact_sources, loose_sources = {}, {}
+        for key, points in projections.items():
+            name, team = self._split_team(key)
+            exact, loose = self._keys(name)
+            exact, loose = (exact, team), (loose, team)
+            if exact in exact_sources:
+                self._collide(exact, exact_sources[exact], key)
+                continue
+            self._exact[exact] = points
+            exact_sources[exact] = key
+
+            if loose in loose_sources:
+                self._collide(loose, loose_sources[loose], key)
+                self._ambiguous.add(loose)
+            else:
+                self._loose[loose] = points
+                loose_sources[loose] = key
+
+        for loose in self._ambiguous:
+            self._loose.pop(loose, None)
+        if self.collisions:
+            warnings.warn(
+                'Projection names collide after normalization: {}'.format(
+                    '; '.join(
+                        ', '.join(names)
+                        for names in self.collisions.values()
+                    )
+                )
+            )
+
+    def __len__(self):
+        return len(self._exact)
+
+    def _collide(self, key, first: str, other: str):
+        names = self.collisions.setdefault(key, [first])
+        if other not in names:
+            names.append(other)
+
+    def _split_team(self, key: str):
+        key = key.strip()
+        if normalize_name(key) in self.renames:
+            return key, None
+
+        head, _, last = key.rpartition(' ')
+        is_team = head and TEAM_RE.match(last) and (
+            last in self.teams if self.teams is not None
+            else last.lower() not in SUFFIXES
+        )
+        if is_team:
+            return head, last
+        return key, None
+
+    def _keys(self, name: str):
+        '''(exact, loose) keys for a raw name, after renames'''
+        loose = normalize_name(name)
+        renamed = self.renames.get(loose)
+        if renamed is not None:
+            return renamed, renamed
+        return normalize_name(name, strip_suffixes=False), loose
+
+    def lookup(self, name: str, team: str = None):
+        '''Returns the projection for a player, or None'''
+        exact, loose = self._keys(name)
+        teams = (team.upper(), None) if team is not None else (None,)
+        for t in teams:
+            points = self._exact.get((exact, t))
+            if points is None:
+                points = self._loose.get((loose, t))
+            if points is not None:
+                return points
+        return None
+
+    def join(self, names, teams):
+        '''
+        Looks up projections for parallel name / team sequences.
+        Each distinct (name, team) pair is resolved once. Returns
+        (projections, matched) arrays; unmatched rows are 0.
+        '''
+        keys = np.empty(len(names), dtype=object)
+        keys[:] = [
+            '{}\t{}'.format(n or '', (t or '').upper())
+            for n, t in zip(names, teams)
+        ]
+        if not len(keys):
+            return np.zeros(0), np.zeros(0, dtype=bool)
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        unique_points = np.zeros(len(unique_keys))
+        unique_matched = np.zeros(len(unique_keys), dtype=bool)
+        for i, key in enumerate(unique_keys):
+            name, team = key.split('\t')
+            points = self.lookup(name, team or None)
+            if points is not None:
+                unique_points[i] = points
+                unique_matched[i] = True
+
+        return unique_points[inverse], unique_matched[inverse]
+
+    def join_players(self, players: list) -> list:
+        '''
+        Sets proj on every player (0 if unmatched) and returns
+        the players with no projection.
+        '''
+        points, matched = self.join(
+            [p.name for p in players],
+            [p.team for p in players],
+        )
+        unmatched = []
+        for p, proj, m in zip(players, points.tolist(), matched):
+            if m:
+                p.proj = proj
+            else:
+                p.proj = 0
+                unmatched.append(p)
+        return unmatched
+
+    def join_pool(self, pool) -> list:
+        '''
+        Sets the proj column of a ColumnarPool and returns the
+        indexes of rows with no projection.
+        '''
+        points, matched = self.join(pool.name, pool.team)
+        pool.proj = points
+        return np.flatnonzero(~matched).tolist()
@@ -3,6 +3,19 @@ from draftfast.orm import Player
 from draftfast.pickem.pickem_orm import TieredPlayer
 from draftfast.showdown.orm import ShowdownPlayer
 from draftfast.rules import DRAFT_KINGS, FAN_DUEL
+from draftfast.games import GameTable
+from draftfast.columnar import ColumnarPool
+from draftfast.csv_parse import parse_cache
+from draftfast.csv_parse.pid_index import (
+    SHOWDOWN_KEY_FIELDS,
+    attach_player_ids,
+    build_pid_index,
+)
+from draftfast.csv_parse.projection_index import (
+    ProjectionIndex,
+    read_projection_csv,
+)
+from draftfast.csv_parse import projection_blend
 
 GAME_KEY_MAP = {
     DRAFT_KINGS: {
@@ -36,8 +49,62 @@ def generate_players_from_csvs(
     encoding='utf-8',
     errors='replace',
     ruleset=None,
+    split_positions=True,
+    cache_dir=None,
+    pid_file=None,
+    renames=None,
+    projection_sources=None,
+    blend_method=projection_blend.WEIGHTED,
 ) -> list:
-    players = []
+    '''
+    Parses a salary file (and optional projection file) into players.
+    If cache_dir is set, the parsed pool is stored there keyed by the
+    files' content hash and the parse options, and later calls with
+    the same inputs load it without re-parsing. If pid_file (a site
+    upload template) is set, each player's site ID is stored on
+    player.player_id.
+
+    Projections are joined on normalized names (see
+    projection_index); renames maps alternate spellings, e.g.
+    draftfast.nfl.data_cleaning_constants.RENAMES.
+    projection_sources (a list of projection_blend.ProjectionSource)
+    blends several feeds with blend_method instead of using a
+    single projection file.
+    '''
+    if cache_dir:
+        key = parse_cache.cache_key(
+            [salary_file_location, projection_file_location, pid_file],
+            game=game,
+            encoding=encoding,
+            errors=errors,
+            league=ruleset.league if ruleset else None,
+            game_type=ruleset.game_type if ruleset else None,
+            split_positions=split_positions,
+            renames=sorted((renames or {}).items()),
+            projection_sources=[
+                source.cache_key() for source in projection_sources or []
+            ],
+            blend_method=blend_method,
+        )
+        players = parse_cache.load(cache_dir, key)
+        if players is None:
+            players = generate_players_from_csvs(
+                salary_file_location=salary_file_location,
+                game=game,
+                projection_file_location=projection_file_location,
+                verbose=verbose,
+                encoding=encoding,
+                errors=errors,
+                ruleset=ruleset,
+                split_positions=split_positions,
+                pid_file=pid_file,
+                renames=renames,
+                projection_sources=projection_sources,
+                blend_method=blend_method,
+            )
+            parse_cache.dump(cache_dir, key, players)
+        return players
+
     projections = None
     if projection_file_location:
         projections = _generate_projection_dict(
@@ -46,142 +113,345 @@ def generate_players_from_csvs(
             errors,
         )
 
-    with open(salary_file_location, 'r',
-              encoding=encoding, errors=errors) as csv_file:
-        csv_data = csv.DictReader(csv_file)
-        pos_key = 'Position'
-        is_nhl = ruleset and ruleset.league == 'NHL'
-        is_showdown = ruleset and ruleset.game_type == 'showdown'
-        if is_nhl or is_showdown:
-            pos_key = 'Roster Position'
-
-        for row in csv_data:
-            if ruleset and ruleset.game_type == 'pickem':
-                player = TieredPlayer(
-                    cost=0,  # salary not applicable in pickem
-                    name=row['Name'],
-                    pos=row['Position'],
-                    team=row['TeamAbbrev'],
-                    matchup=row['Game Info'],
-                    average_score=float(row['AvgPointsPerGame']),
-                    tier=row['Roster Position'],
-                )
-                _set_projections(
-                    projections,
-                    player,
-                    verbose,
-                )
-                players.append(player)
-            elif is_showdown:
-                pos = row[pos_key]
-                player = generate_player(
-                    pos=row['Position'],
-                    row=row,
-                    game=game,
-                )
-                _set_projections(
-                    projections,
-                    player,
-                    verbose,
-                )
-                captain = pos == 'CPT'
-                players.append(
-                    ShowdownPlayer(
-                        player,
-                        captain=captain,
-                    )
-                )
-            else:
-                for pos in row[pos_key].split('/'):
-                    if is_nhl and pos == 'UTIL':
-                        continue
-                    player = generate_player(
-                        pos=pos,
-                        row=row,
-                        game=game,
-                    )
-                    _set_projections(
-                        projections,
-                        player,
-                        verbose,
-                    )
-
-                    players.append(player)
+    game_table = GameTable()
+    players = list(iter_players_from_csv(
+        salary_file_location=salary_file_location,
+        game=game,
+        verbose=verbose,
+        encoding=encoding,
+        errors=errors,
+        ruleset=ruleset,
+        split_positions=split_positions,
+        game_table=game_table,
+    ))
+
+    if projection_sources:
+        unmatched = projection_blend.blend_players(
+            players,
+            projection_sources,
+            method=blend_method,
+            renames=renames,
+            team_list=game_table.teams,
+        )
+        _report_unmatched([p.name for p in unmatched], verbose)
+    elif projections:
+        index = ProjectionIndex(
+            projections,
+            renames=renames,
+            teams=game_table.teams,
+        )
+        unmatched = index.join_players(players)
+        _report_unmatched([p.name for p in unmatched], verbose)
+
+    if pid_file:
+        is_pickem = ruleset and ruleset.game_type == 'pickem'
+        key_fields = ('name', 'position')
+        if is_pickem:
+            key_fields = ('name',)
+        elif ruleset and ruleset.game_type == 'showdown' and \
+                game == DRAFT_KINGS:
+            key_fields = SHOWDOWN_KEY_FIELDS
+        pid_map = build_pid_index(
+            pid_file,
+            game=game,
+            encoding=encoding,
+            errors=errors,
+            key_fields=key_fields,
+            strip_dst=not is_pickem,
+            required=not is_pickem,
+        )
+        attach_player_ids(players, pid_map, key_fields=key_fields)
 
     return players
 
 
-# TODO - extract
-def _create_classic_player():
-    pass
+def iter_players_from_csv(
+    salary_file_location: str,
+    game: str,
+    projections: dict = None,
+    verbose=False,
+    encoding='utf-8',
+    errors='replace',
+    ruleset=None,
+    split_positions=True,
+    game_table: GameTable = None,
+):
+    '''
+    Lazily yields players from a salary file. If a GameTable is
+    given, each player is indexed into it as it is read. projections
+    may be a {name: points} dict or a ProjectionIndex.
+    '''
+    if not projections:
+        projections = None
+    elif not isinstance(projections, ProjectionIndex):
+        projections = ProjectionIndex(projections)
 
+    if ruleset and ruleset.game_type == 'pickem':
+        create_player = _create_tiered_player
+    elif ruleset and ruleset.game_type == 'showdown':
+        create_player = _create_showdown_player
+    else:
+        create_player = _create_classic_player
 
-def _create_tiered_player():
-    pass
+    for record in _iter_records(salary_file_location, game, encoding,
+                                errors, ruleset, split_positions):
+        player = create_player(record)
+        _set_projections(projections, player, verbose)
+        if game_table is not None:
+            player.team_id, player.game_id, player.opp_id, player.home = \
+                game_table.index(player.team, player.matchup)
+        yield player
 
 
-def _create_showdown_player():
-    pass
+def generate_columnar_pool(
+    salary_file_location: str,
+    game: str,
+    projection_file_location='',
+    verbose=False,
+    encoding='utf-8',
+    errors='replace',
+    ruleset=None,
+    split_positions=True,
+    renames=None,
+    projection_sources=None,
+    blend_method=projection_blend.WEIGHTED,
+) -> ColumnarPool:
+    '''
+    Parses a salary file straight into a ColumnarPool, without
+    creating Player objects. Showdown rows keep their real position
+    in real_pos, with pos set to CPT or FLEX, and come back as
+    ShowdownPlayers from to_players.
+    '''
+    if ruleset and ruleset.game_type == 'pickem':
+        raise ValueError(
+            'Columnar pools have no tier column for pickem; use '
+            'generate_players_from_csvs to get TieredPlayers'
+        )
 
+    is_showdown = ruleset and ruleset.game_type == 'showdown'
 
-def generate_player(pos, row, game):
+    projections = None
+    if projection_file_location:
+        projections = _generate_projection_dict(
+            projection_file_location,
+            encoding,
+            errors,
+        )
+
+    def records():
+        for record in _iter_records(salary_file_location, game, encoding,
+                                    errors, ruleset, split_positions):
+            if is_showdown:
+                record['real_pos'] = record['pos']
+                record['pos'] = 'CPT' \
+                    if record['roster_position'] == 'CPT' else 'FLEX'
+            record['proj'] = record['average_score']
+            yield record
+
+    pool = ColumnarPool.from_records(records())
+    if projection_sources:
+        unmatched = projection_blend.blend_pool(
+            pool,
+            projection_sources,
+            method=blend_method,
+            renames=renames,
+        )
+        _report_unmatched([pool.name[i] for i in unmatched], verbose)
+    elif projections:
+        index = ProjectionIndex(
+            projections,
+            renames=renames,
+            teams=pool.game_table.teams,
+        )
+        unmatched = index.join_pool(pool)
+        _report_unmatched([pool.name[i] for i in unmatched], verbose)
+
+    return pool
+
+
+def _iter_records(salary_file_location, game, encoding, errors,
+                  ruleset, split_positions):
+    with open(salary_file_location, 'r',
+              encoding=encoding, errors=errors) as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        decode = compile_row_decoder(
+            header,
+            game,
+            ruleset=ruleset,
+            split_positions=split_positions,
+        )
+        for row in reader:
+            if not row:
+                continue
+            for record in decode(row):
+                yield record
+
+
+def compile_row_decoder(header: list, game: str, ruleset=None,
+                        split_positions=True):
     '''
-    Parses CSV row for DraftKings or FanDuel
-    and returns a player. Note that DraftKings
-    has different CSV formats for different
-    sports.
+    Resolves a salary file's header layout once (GAME_KEY_MAP keys,
+    alternate keys and the position column) and returns a function
+    that decodes a plain csv.reader row into player records: dicts
+    of Player fields, one per position the row is split into.
     '''
-    avg_key = GAME_KEY_MAP[game]['avg']
-    name_key = GAME_KEY_MAP[game]['name']
-    team_key = GAME_KEY_MAP[game]['team']
-    team_alt_key = GAME_KEY_MAP[game]['team_alt']
-    game_key = GAME_KEY_MAP[game]['game']
-    game_alt_key = GAME_KEY_MAP[game]['game_alt']
-
-    avg = float(row.get(avg_key, 0))
-
-    player = Player(
-        pos,
-        row[name_key].strip().rstrip(),
-        row['Salary'],
-        possible_positions=row['Position'],
-        multi_position='/' in row['Position'],
-        team=row.get(team_key) or row.get(team_alt_key),
-        matchup=row.get(game_key) or row.get(game_alt_key),
-        average_score=avg,
+    columns = {name: idx for idx, name in enumerate(header)}
+    keys = GAME_KEY_MAP[game]
+    is_pickem = ruleset and ruleset.game_type == 'pickem'
+    is_nhl = ruleset and ruleset.league == 'NHL'
+    is_showdown = ruleset and ruleset.game_type == 'showdown'
+
+    position_idx = columns['Position']
+    pos_idx = position_idx
+    if is_nhl or is_showdown or is_pickem:
+        pos_idx = columns['Roster Position']
+
+    if is_pickem:
+        name_idx = columns['Name']
+        salary_idx = None
+        team_idxs = _column_indexes(columns, 'TeamAbbrev')
+        game_idxs = _column_indexes(columns, 'Game Info')
+        avg_idx = columns['AvgPointsPerGame']
+    else:
+        name_idx = columns[keys['name']]
+        salary_idx = columns['Salary']
+        team_idxs = _column_indexes(columns, keys['team'], keys['team_alt'])
+        game_idxs = _column_indexes(columns, keys['game'], keys['game_alt'])
+        avg_idx = columns.get(keys['avg'])
+
+    width = len(header)
+
+    def decode(row: list) -> list:
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+
+        team = _first_value(row, team_idxs)
+        name = row[name_idx]
+        record = {
+            'name': name if is_pickem else name.strip(),
+            'cost': 0 if salary_idx is None else row[salary_idx],
+            'team': team.upper() if team else team,
+            'matchup': _first_value(row, game_idxs),
+            'average_score': float(row[avg_idx] or 0)
+            if avg_idx is not None else 0,
+            'possible_positions': row[position_idx],
+        }
+
+        if is_pickem or is_showdown:
+            record['pos'] = row[position_idx]
+            record['roster_position'] = row[pos_idx]
+            return [record]
+
+        positions = [
+            pos for pos in row[pos_idx].split('/')
+            if not (is_nhl and pos == 'UTIL')
+        ]
+
+        # a single multi-position player for the slot formulation
+        if not split_positions:
+            positions = ['/'.join(positions)]
+
+        records = []
+        for pos in positions:
+            position_record = dict(record)
+            position_record['pos'] = pos
+            records.append(position_record)
+        return records
+
+    return decode
+
+
+def _column_indexes(columns: dict, *keys) -> tuple:
+    return tuple(columns[k] for k in keys if k in columns)
+
+
+def _first_value(row: list, idxs: tuple):
+    for idx in idxs:
+        if row[idx]:
+            return row[idx]
+    return None
+
+
+def _create_classic_player(record: dict) -> Player:
+    return Player(
+        record['pos'],
+        record['name'],
+        record['cost'],
+        possible_positions=record['possible_positions'],
+        multi_position='/' in record['possible_positions'],
+        team=record['team'],
+        matchup=record['matchup'],
+        average_score=record['average_score'],
+    )
+
+
+def _create_tiered_player(record: dict) -> TieredPlayer:
+    return TieredPlayer(
+        cost=0,  # salary not applicable in pickem
+        name=record['name'],
+        pos=record['pos'],
+        team=record['team'],
+        matchup=record['matchup'],
+        average_score=record['average_score'],
+        tier=record['roster_position'],
     )
 
-    return player
+
+def _create_showdown_player(record: dict) -> ShowdownPlayer:
+    return ShowdownPlayer(
+        _create_classic_player(record),
+        captain=record['roster_position'] == 'CPT',
+    )
+
+
+def generate_player(pos, row, game):
+    '''
+    Parses a csv.DictReader row for DraftKings or FanDuel and
+    returns a player at pos. Kept for single rows; whole files go
+    through compile_row_decoder once, as this does per row.
+    '''
+    decode = compile_row_decoder(list(row.keys()), game)
+    record = decode(list(row.values()))[0]
+    record['pos'] = pos
+    return _create_classic_player(record)
 
 
 def _generate_projection_dict(projection_file_location: str,
                               encoding: str,
                               errors: str) -> dict:
-    projections = {}
-    with open(projection_file_location, 'r',
-              encoding=encoding, errors=errors) as csv_file:
-        csv_data = csv.DictReader(csv_file)
-        for row in csv_data:
-            name = row.get('playername').strip().rstrip()
-            projections[name] = float(row.get('points'))
-
-    return projections
+    return read_projection_csv(
+        projection_file_location,
+        encoding=encoding,
+        errors=errors,
+    )
 
 
 def _set_projections(projections, player, verbose):
-    if projections:
-        proj = projections.get(player.name)
-
-        # try to find projection for e.g. 'Andrew Luck IND'
-        if proj is None and player.team is not None:
-            alt_name = '{} {}'.format(player.name, player.team.upper())
-            proj = projections.get(alt_name)
-
-        if proj is None:
-            if verbose:
-                print('No projection for {}'.format(player.name))
-            player.proj = 0
-        else:
-            player.proj = proj
-    else:
-        player.proj = player.average_score
+    player.proj = _lookup_projection(
+        projections,
+        player.name,
+        player.team,
+        player.average_score,
+        verbose,
+    )
+
+
+def _lookup_projection(projections, name, team, average_score, verbose):
+    if projections is None:
+        return average_score
+
+    proj = projections.lookup(name, team)
+    if proj is None:
+        _report_unmatched([name], verbose)
+        return 0
+    return proj
+
+
+def _report_unmatched(names: list, verbose: bool):
+    if verbose:
+        for name in names:
+            print('No projection for {}'.format(name))
@@ -0,0 +1,102 @@
+from draftfast.rules import ROSTER_SLOTS
+from draftfast import dke_exceptions as dke
+
+
+class SlotAssigner(object):
+    '''
+    Assigns a roster's players to a slot template, e.g. a RuleSet's
+    slots, as a bipartite matching between slots and players.
+    Each slot takes the first free eligible player; if there is
+    none, an augmenting path moves earlier players to make room.
+    Results are memoized by the roster's position sequence, which
+    is the position multiset for rosters in sorted_players order.
+    '''
+
+    def __init__(self, slots: list):
+        self.slots = [
+            (slot, frozenset(positions)) for slot, positions in slots
+        ]
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.slots)
+
+    def assign(self, positions) -> tuple:
+        '''
+        Returns, for each slot in template order, the index into
+        positions of the player filling it.
+        '''
+        positions = tuple(positions)
+        assignment = self._memo.get(positions)
+        if assignment is None:
+            assignment = self._match(positions)
+            self._memo[positions] = assignment
+        return assignment
+
+    def order(self, players: list) -> list:
+        '''Returns players in template slot order'''
+        assignment = self.assign(p.pos for p in players)
+        return [players[i] for i in assignment]
+
+    def _match(self, positions: tuple) -> tuple:
+        if len(positions) != len(self.slots):
+            raise dke.InvalidSlotAssignmentException(
+                'Got {} players for {} roster slots'.format(
+                    len(positions),
+                    len(self.slots),
+                )
+            )
+
+        eligible = [
+            [
+                i for i, pos in enumerate(positions)
+                if allowed.intersection(pos.split('/'))
+            ]
+            for _, allowed in self.slots
+        ]
+        player_slot = [None] * len(positions)
+        slot_player = [None] * len(self.slots)
+
+        def augment(s, seen):
+            for i in eligible[s]:
+                if i in seen:
+                    continue
+                seen.add(i)
+                if player_slot[i] is None or augment(player_slot[i], seen):
+                    player_slot[i] = s
+                    slot_player[s] = i
+                    return True
+            return False
+
+        for s in range(len(self.slots)):
+            free = next(
+                (i for i in eligible[s] if player_slot[i] is None),
+                None,
+            )
+            if free is not None:
+                player_slot[free] = s
+                slot_player[s] = free
+            elif not augment(s, set()):
+                raise dke.InvalidSlotAssignmentException(
+                    'No valid slot assignment for positions {}'.format(
+                        ', '.join(positions)
+                    )
+                )
+
+        return tuple(slot_player)
+
+
+_ASSIGNERS = {}
+
+
+def get_slot_assigner(game: str, league: str) -> SlotAssigner:
+    '''Shared, memoized assigner for a site's ROSTER_SLOTS template'''
+    key = (game, league)
+    if key not in _ASSIGNERS:
+        slots = ROSTER_SLOTS.get(game, {}).get(league)
+        if not slots:
+            raise dke.InvalidSlotAssignmentException(
+                'No roster slots defined for {} {}'.format(game, league)
+            )
+        _ASSIGNERS[key] = SlotAssigner(slots)
+    return _ASSIGNERS[key]
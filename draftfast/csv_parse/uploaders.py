@@ -1,90 +1,122 @@
 import csv
-from itertools import islice
 from .upload import (
     write_to_csv,
 )
+from .pid_index import NAME_MAP, build_pid_index  # noqa: F401
+from .pid_index import SHOWDOWN_KEY_FIELDS, player_key
 from draftfast.rules import DRAFT_KINGS, FAN_DUEL
 from draftfast.pickem import pickem_orm, pickem_upload
-from draftfast import dke_exceptions as dke
-
-NAME_MAP = {
-    DRAFT_KINGS: {
-        'start': 'TeamAbbrev',
-        'name': 'Name',
-        'position': 'Position',
-        'id': 'ID',
-    },
-    FAN_DUEL: {
-        'start': '"Nickname"',
-        'name': '"Nickname"',
-        'position': '"Position"',
-        'id': '"Player ID + Player Name"',
-    },
-}
-
-
-def map_pids(pid_file, encoding, errors, game=DRAFT_KINGS):
-    start = NAME_MAP.get(game).get('start')
-    name = NAME_MAP.get(game).get('name')
-    position = NAME_MAP.get(game).get('position')
-    p_id = NAME_MAP.get(game).get('id')
-
-    player_map = {}
-    with open(pid_file, 'r') as f:
-        n = 0
-        fields = None
-        for line in f.readlines():
-            n += 1
-            if start in line:  # line with field names was found
-                fields = line.split(',')
-                break
-
-        if not fields:
-            raise dke.InvalidCSVUploadFileException(
-                "Check that you're using the DK CSV upload template, " +
-                "which can be found at " +
-                "https://www.draftkings.com/lineup/upload.")
-
-        f.close()
-        f = islice(open(pid_file, 'r',
-                        encoding=encoding, errors=errors), n, None)
-        reader = csv.DictReader(f, fieldnames=fields)
-        for line in reader:
-            # DraftKings adds spaces to DST for NFL
-            if 'DST' in line[position]:
-                line[name] = line[name].strip()
-                line[position] = line[position].strip()
-
-            player_map[line[name] + " " + line[position]] = line[p_id]
-
-    return player_map
+
+
+def map_pids(pid_file, encoding, errors, game=DRAFT_KINGS,
+             key_fields=('name', 'position')):
+    return build_pid_index(
+        pid_file,
+        game=game,
+        encoding=encoding,
+        errors=errors,
+        key_fields=key_fields,
+        strip_dst=True,
+    )
 
 
 class CSVUploader(object):
+    '''
+    Writes rosters to a site upload file. Besides write_rosters, an
+    uploader can be used incrementally: open writes the header,
+    write_roster appends (and flushes) one row, and close is safe to
+    call at any point. Only the first open truncates the file; later
+    write_roster calls reopen it for appending, so no rows are lost.
+    write_rosters on a closed uploader rewrites the file from the
+    header; on an open one it adds to the current file. Used as a
+    context manager, it opens on entry and closes on exit, so a run
+    stopped midway keeps its rows:
+
+        with uploaders.DraftKingsNBAUploader(pid_file=pid_file) as up:
+            run_multi(..., roster_writer=up)
+    '''
 
     def __init__(self, pid_file, upload_file='./upload.csv',
-                 encoding='utf-8', errors='replace'):
+                 encoding='utf-8', errors='replace', flush=True):
         self.upload_file = upload_file
         self.encoding = encoding
         self.errors = errors
+        self.flush = flush
         self.pid_map = self._map_pids(pid_file)
+        self._file = None
+        self._writer = None
+        self._started = False
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def open(self):
+        if not self.is_open:
+            mode = 'a' if self._started else 'w'
+            self._file = open(self.upload_file, mode)
+            self._writer = self._create_writer(
+                self._file,
+                header=not self._started,
+            )
+            self._started = True
+        return self
+
+    def close(self):
+        if self.is_open:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
+                self._writer = None
+
+    def write_roster(self, roster):
+        if not self.is_open:
+            self.open()
+        self._write_roster(self._writer, roster)
+        if self.flush:
+            self._file.flush()
+
+    def write_rosters(self, rosters):
+        was_open = self.is_open
+        if not was_open:
+            # a standalone call rewrites the file, as it always has
+            self._started = False
+        self.open()
+        try:
+            for roster in rosters:
+                self.write_roster(roster)
+        finally:
+            if not was_open:
+                self.close()
+
+    def _create_writer(self, f, header=True):
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(self.HEADERS)
+        return writer
+
+    def _write_roster(self, writer, roster):
+        raise NotImplementedError('You must implement _write_roster')
 
     def _map_pids(self, pid_file):
         raise NotImplementedError('You must implement _map_pids')
 
 
 class DraftKingsUploader(CSVUploader):
-    def write_rosters(self, rosters):
-        with open(self.upload_file, 'w') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.HEADERS)
-            for roster in rosters:
-                write_to_csv(
-                    writer=writer,
-                    roster=roster,
-                    player_map=self.pid_map,
-                    league=self.LEAGUE,
-                )
+    def _write_roster(self, writer, roster):
+        write_to_csv(
+            writer=writer,
+            roster=roster,
+            player_map=self.pid_map,
+            league=self.LEAGUE,
+        )
 
     def _map_pids(self, pid_file):
         return map_pids(
@@ -140,17 +172,13 @@ class FanDuelNBAUploader(CSVUploader):
         'SF', 'PF', 'PF', 'C',
     ]
 
-    def write_rosters(self, rosters):
-        with open(self.upload_file, 'w') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.HEADERS)
-            for roster in rosters:
-                write_to_csv(
-                    writer=writer,
-                    roster=roster,
-                    player_map=self.pid_map,
-                    game=FAN_DUEL,
-                )
+    def _write_roster(self, writer, roster):
+        write_to_csv(
+            writer=writer,
+            roster=roster,
+            player_map=self.pid_map,
+            game=FAN_DUEL,
+        )
 
     def _map_pids(self, pid_file):
         return map_pids(
@@ -166,16 +194,18 @@ class FanDuelNFLUploader(CSVUploader):
 
 
 class DraftKingsNBAPickemUploader(CSVUploader):
-    def write_rosters(self, rosters):
-        with open(self.upload_file, 'w') as f:
-            writer = csv.DictWriter(f, fieldnames=pickem_orm.TIERS)
+    def _create_writer(self, f, header=True):
+        writer = csv.DictWriter(f, fieldnames=pickem_orm.TIERS)
+        if header:
             writer.writeheader()
-            for roster in rosters:
-                pickem_upload.write_to_csv(
-                    writer=writer,
-                    roster=roster,
-                    player_map=self.pid_map,
-                )
+        return writer
+
+    def _write_roster(self, writer, roster):
+        pickem_upload.write_to_csv(
+            writer=writer,
+            roster=roster,
+            player_map=self.pid_map,
+        )
 
     def _map_pids(self, pid_file):
         return pickem_upload.map_pids(pid_file)
@@ -186,12 +216,18 @@ class DraftKingsCaptainShowdownUploader(DraftKingsUploader):
         'CPT', 'UTIL', 'UTIL', 'UTIL', 'UTIL', 'UTIL'
     ]
 
-    def write_rosters(self, rosters):
-        with open(self.upload_file, 'w') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.HEADERS)
-            for roster in rosters:
-                writer.writerow([
-                    p.get_player_id(self.pid_map)
-                    for p in roster.sorted_players()
-                ])
+    def _write_roster(self, writer, roster):
+        writer.writerow([
+            p.player_id or self.pid_map[player_key(p, SHOWDOWN_KEY_FIELDS)]
+            for p in roster.sorted_players()
+        ])
+
+    def _map_pids(self, pid_file):
+        # captains have their own IDs
+        return map_pids(
+            pid_file,
+            game=DRAFT_KINGS,
+            encoding=self.encoding,
+            errors=self.errors,
+            key_fields=SHOWDOWN_KEY_FIELDS,
+        )
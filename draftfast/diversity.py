@@ -0,0 +1,179 @@
+'''
+Diversity of a finished portfolio. Lineups are encoded as bitsets
+over pool indexes (one bit per pool player, packed into uint64
+words), so the number of players two lineups share is the popcount
+of their AND. All-pairs results are computed a block of lineups at
+a time to keep memory bounded.
+'''
+from typing import List
+import numpy as np
+from draftfast.orm import Roster
+from draftfast.lineup_store import PoolLookup
+
+WORD_BITS = 64
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    '''Set bits in each element of a uint64 array'''
+    # NumPy >= 2.0 has a native popcount
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.uint8)
+
+    x = words - ((words >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+class LineupBits(object):
+    '''
+    An (lineups x words) uint64 bitset matrix; bit j of a row is
+    set if the lineup uses pool player j.
+    '''
+
+    def __init__(self, words: np.ndarray, size: int):
+        self.words = words
+        self.size = size
+
+    def __len__(self):
+        return len(self.words)
+
+    def __repr__(self):
+        return '<LineupBits: {} lineups, {} players>'.format(
+            len(self),
+            self.size,
+        )
+
+    @classmethod
+    def from_indexes(cls, indexes, size: int):
+        '''
+        Encodes lineups given as lists of pool indexes, e.g. the
+        'pool' field of lineup_store records or the matrix saved by
+        lineup_store.write_array.
+        '''
+        width = max(1, -(-size // WORD_BITS))
+        words = np.zeros((len(indexes), width), dtype=np.uint64)
+        rows = np.repeat(
+            np.arange(len(indexes)),
+            [len(lineup) for lineup in indexes],
+        )
+        columns = np.concatenate(
+            [np.asarray(lineup, dtype=np.int64) for lineup in indexes]
+        ) if len(indexes) else np.zeros(0, dtype=np.int64)
+        bits = np.left_shift(
+            np.uint64(1),
+            (columns % WORD_BITS).astype(np.uint64),
+        )
+        np.bitwise_or.at(words, (rows, columns // WORD_BITS), bits)
+        return cls(words, size)
+
+    @classmethod
+    def from_rosters(cls, rosters: List[Roster], pool):
+        '''Encodes rosters against a player pool (see PoolLookup)'''
+        lookup = pool if isinstance(pool, PoolLookup) else PoolLookup(pool)
+        return cls.from_indexes(
+            [[lookup.index_of(p) for p in r.players] for r in rosters],
+            len(lookup),
+        )
+
+    def sizes(self) -> np.ndarray:
+        '''Players in each lineup'''
+        return popcount(self.words).sum(axis=1)
+
+    def overlap(self, rows, columns=None) -> np.ndarray:
+        '''
+        (len(rows) x len(columns)) players shared between two sets
+        of lineups, given as slices or index arrays (all lineups if
+        columns is None).
+        '''
+        left = self.words[rows]
+        right = self.words if columns is None else self.words[columns]
+        shared = np.zeros((len(left), len(right)), dtype=np.uint8)
+        for w in range(self.words.shape[1]):
+            shared += popcount(left[:, None, w] & right[None, :, w])
+        return shared
+
+    def overlap_histogram(self, chunk_size: int = 500) -> np.ndarray:
+        '''h[k] is the number of lineup pairs sharing exactly k players'''
+        n = len(self)
+        width = int(self.sizes().max()) + 1 if n else 1
+        histogram = np.zeros(width, dtype=np.int64)
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            # pairs within the chunk (upper triangle), then with later rows
+            within = self.overlap(slice(start, stop), slice(start, stop))
+            within = within[np.triu_indices(stop - start, k=1)]
+            later = self.overlap(slice(start, stop), slice(stop, n))
+            histogram += np.bincount(within, minlength=width)[:width]
+            for k in range(width):
+                histogram[k] += np.count_nonzero(later == k)
+        return histogram
+
+    def nearest_neighbours(self, chunk_size: int = 500):
+        '''
+        For each lineup, (overlap, index) of the other lineup it
+        shares the most players with; (-1, -1) for a lone lineup.
+        '''
+        n = len(self)
+        best = np.full(n, -1, dtype=np.int16)
+        neighbour = np.full(n, -1, dtype=np.int64)
+        if n < 2:
+            return best, neighbour
+
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            shared = self.overlap(slice(start, stop)).astype(np.int16)
+            rows = np.arange(stop - start)
+            shared[rows, rows + start] = -1
+            neighbour[start:stop] = shared.argmax(axis=1)
+            best[start:stop] = shared[rows, neighbour[start:stop]]
+        return best, neighbour
+
+    def cluster(self, min_overlap: int) -> np.ndarray:
+        '''
+        Greedy leader clustering: in order, each lineup joins the
+        first cluster whose leader shares at least min_overlap
+        players with it, or leads a new one. Returns each lineup's
+        cluster label; labels are the leaders' indexes.
+        '''
+        n = len(self)
+        labels = np.empty(n, dtype=np.int64)
+        leaders = np.empty(n, dtype=np.int64)
+        count = 0
+        for i in range(n):
+            if count:
+                shared = popcount(
+                    self.words[leaders[:count]] & self.words[i]
+                ).sum(axis=1)
+                matches = np.flatnonzero(shared >= min_overlap)
+                if len(matches):
+                    labels[i] = leaders[matches[0]]
+                    continue
+            leaders[count] = i
+            count += 1
+            labels[i] = i
+        return labels
+
+
+def diversity_report(bits: LineupBits, chunk_size: int = 500) -> dict:
+    '''
+    Summary of a portfolio's diversity: the overlap histogram and,
+    over each lineup's nearest neighbour, the mean and max overlap
+    and the number of lineups with an exact duplicate. The overlaps
+    are None with fewer than two lineups.
+    '''
+    best, _ = bits.nearest_neighbours(chunk_size)
+    sizes = bits.sizes()
+    paired = len(bits) > 1
+    return {
+        'lineups': len(bits),
+        'overlap_histogram': bits.overlap_histogram(chunk_size).tolist(),
+        'mean_nearest_overlap': float(best.mean()) if paired else None,
+        'max_nearest_overlap': int(best.max()) if paired else None,
+        'duplicates': int(np.count_nonzero(best == sizes)),
+    }
@@ -18,6 +18,14 @@ class PlayerBanAndLockException(Exception):
     pass
 
 
+class InvalidSlotAssignmentException(Exception):
+    pass
+
+
+class UnknownOpponentException(Exception):
+    pass
+
+
 MISSING_ERROR = """
 Got {} projections out of {} total players.
 
@@ -6,7 +6,7 @@ from collections import OrderedDict, defaultdict
 
 from draftfast.rules import FT_NBA_RULE_SET, FD_NBA_RULE_SET, DK_NBA_RULE_SET, FT_NBA_FF_RULE_SET, \
     FD_NBA_SINGLE_GAME_RULE_SET, FD_NBA_FLEX3_RULE_SET
-from terminaltables import AsciiTable
+from draftfast import render
 import numpy as np
 
 # TODO encapsulate this into an object
@@ -60,15 +60,29 @@ def parse_exposure_file(file_location):
     return exposures
 
 
+def get_max_lines(bound: dict, n: int) -> int:
+    """
+    Lineups a player can appear in before being banned, shared by
+    every exposure policy. A max that rounds down to no lineups
+    still allows one.
+    """
+    return math.floor(bound['max'] * n) or 1
+
+
 def get_exposure_args(existing_rosters, exposure_bounds, n, use_random,
-                      random_seed, locked_pos, constraints, rule_set, locked) -> dict:
-    exposures = {}
-    for r in existing_rosters:
-        for p in r.players:
-            exposures[p.name] = exposures.get(p.name, 0) + 1
+                      random_seed, locked_pos, constraints, rule_set, locked,
+                      sampler=None) -> dict:
+    exposures = ExposureSummary(existing_rosters).counts_by_name()
 
     if use_random:
-        return get_exposure_args_random(exposures, exposure_bounds, n, random_seed)
+        return get_exposure_args_random(
+            exposures,
+            exposure_bounds,
+            n,
+            random_seed,
+            constraints=constraints,
+            sampler=sampler,
+        )
 
     return get_exposure_args_deterministic(exposures, n, exposure_bounds, locked_pos, constraints, rule_set, locked)
 
@@ -77,14 +91,18 @@ def get_exposure_args_deterministic(exposures, n, exposure_bounds, locked_pos, c
     banned = []
     locked = []
 
-    exposure_bounds = sorted(exposure_bounds, key=lambda k: (exposures.get(k['name'], 0), -k['proj']))
+    # least exposed first, higher projections breaking ties
+    exposure_bounds = sorted(
+        exposure_bounds,
+        key=lambda k: (exposures.get(k['name'], 0), -k.get('proj', 0)),
+    )
 
     for bound in exposure_bounds:
         name = bound['name']
 
         total = n
         min_lines = bound['min'] * total
-        max_lines = math.floor(bound['max'] * total) or 1
+        max_lines = get_max_lines(bound, total)
         lineups = exposures.get(name, 0)
 
         if lineups < min_lines and not constraints.is_banned(name) and name not in locked:
@@ -93,135 +111,411 @@ def get_exposure_args_deterministic(exposures, n, exposure_bounds, locked_pos, c
             banned.append(name)
     return {
         'banned': banned,
-        'locked': locked,
+        # only the least exposed player is locked
+        'locked': locked[:1],
     }
 
 
 def get_exposure_args_random(exposures, exposure_bounds, n,
-                             random_seed) -> dict:
+                             random_seed, constraints=None,
+                             sampler=None) -> dict:
+    """
+    Randomly locks in players based on their max exposure. Players
+    who have reached their max are banned instead. With a
+    LockSampler, players are drawn in random order and only kept
+    if the lock set passes its checks, and lock_all tells the
+    optimizer to lock the whole set; without one, at most one
+    player is locked.
+    """
+    banned = []
+    for bound in exposure_bounds:
+        name = bound['name']
+        max_lines = get_max_lines(bound, n)
+        if exposures.get(name, 0) >= max_lines and \
+                (constraints is None or not constraints.is_locked(name)):
+            banned.append(name)
+
     locked = []
+    exposure_bounds = [b for b in exposure_bounds if b['name'] not in banned]
+    random.shuffle(exposure_bounds)
 
     for bound in exposure_bounds:
         name = bound['name']
 
-        # TODO: maybe exclude players who have met max exposure?
-        # randomly lock in players based on the desired exposure
-        # TODO - downsize locked so solution is not impossible
         r = random.random()
-        if r <= bound['max']:
+        if r > bound['max']:
+            continue
+        if constraints is not None and constraints.is_banned(name):
+            continue
+        if sampler is None:
+            locked.append(name)
+        elif sampler.is_feasible(locked + [name], banned=banned):
             locked.append(name)
 
+    if sampler is None:
+        return {
+            'banned': banned,
+            'locked': locked[:1],
+        }
     return {
-        'banned': [],
+        'banned': banned,
         'locked': locked,
+        # checked by the sampler, so the optimizer locks them all
+        'lock_all': True,
     }
 
 
-# TODO split this up to return total exposures, exposure_diffs
-def check_exposure(rosters, bounds):
-    if not bounds:
-        return {}
+class LockSampler(object):
+    """
+    Fast checks that a set of locked players can be completed into
+    a lineup: the locked players take distinct roster slots (the
+    rule set's slots, or slots built from its position maxes), the
+    other slots are filled with distinct eligible players that are
+    not banned, and the cheapest such lineup is under the salary
+    cap. Players locked through LineupConstraints are counted in
+    every set.
+
+    Other rule set and optimizer constraints (teams, stacks, groups,
+    position minimums without slots) are not checked, so a solve
+    with an accepted lock set can still fail.
+    """
 
-    exposures = {}
-    for r in rosters:
-        for p in r.players:
-            exposures[p.name] = exposures.get(p.name, 0) + 1
+    def __init__(self, player_pool: list, rule_set, constraints=None):
+        self.roster_size = rule_set.roster_size
+        self.salary_max = rule_set.salary_max
+
+        self.costs = {}
+        positions = defaultdict(set)
+        for p in player_pool:
+            if constraints is not None and constraints.is_banned(p.name):
+                continue
+            self.costs[p.name] = min(p.cost, self.costs.get(p.name, p.cost))
+            positions[p.name].update(p.pos.split('/'))
+
+        if rule_set.slots:
+            slots = [allowed for _, allowed in rule_set.slots]
+        else:
+            slots = [
+                [pos] for pos, _, upper in rule_set.position_limits
+                for _ in range(upper)
+            ]
+        self.slots = [frozenset(allowed) for allowed in slots]
+
+        self.name_slots = {
+            name: [
+                s for s, allowed in enumerate(self.slots)
+                if allowed & positions[name]
+            ]
+            for name in self.costs
+        }
+        # eligible names for each slot, cheapest first
+        by_cost = sorted(self.costs, key=lambda name: self.costs[name])
+        self.slot_names = [
+            [name for name in by_cost if s in self.name_slots[name]]
+            for s in range(len(self.slots))
+        ]
+
+        # bitmask dynamic programme over filled slots
+        masks = np.arange(1 << len(self.slots))
+        self.states = len(masks)
+        self.without = [
+            masks[(masks >> s) & 1 == 0] for s in range(len(self.slots))
+        ]
+        filled = np.zeros(len(masks), dtype=int)
+        for s in range(len(self.slots)):
+            filled += (masks >> s) & 1
+        self.complete = np.flatnonzero(filled == self.roster_size)
+
+        self.required = []
+        if constraints is not None:
+            self.required = [
+                name for name in self.costs if constraints.is_locked(name)
+            ]
+
+    def is_feasible(self, names: list, banned=()) -> bool:
+        names = list(OrderedDict.fromkeys(self.required + list(names)))
+        if len(names) > self.roster_size:
+            return False
+        if any(name not in self.costs or name in banned for name in names):
+            return False
+        return bool(self.min_cost(names, banned) <= self.salary_max)
+
+    def min_cost(self, names: list, banned=()) -> float:
+        """
+        Salary of the cheapest lineup containing names (inf if none
+        fits the slots), filling slot masks one player at a time.
+        """
+        if not len(self.complete):
+            return np.inf
+        costs = np.full(self.states, np.inf)
+        costs[0] = 0
+
+        for name in names:
+            costs = self._place(costs, name, keep=False)
+
+        # an optimal fill only uses each slot's roster_size cheapest
+        # candidates: any other would leave a cheaper one unused
+        skip = set(names).union(banned)
+        candidates = OrderedDict()
+        for eligible in self.slot_names:
+            taken = 0
+            for name in eligible:
+                if taken == self.roster_size:
+                    break
+                if name not in skip:
+                    candidates[name] = True
+                    taken += 1
+
+        for name in candidates:
+            costs = self._place(costs, name, keep=True)
+        return costs[self.complete].min()
+
+    def _place(self, costs, name: str, keep: bool):
+        # keep: the player is optional, so states without it survive
+        placed = costs.copy() if keep else np.full(len(costs), np.inf)
+        cost = self.costs[name]
+        for s in self.name_slots[name]:
+            source = self.without[s]
+            target = source | (1 << s)
+            placed[target] = np.minimum(placed[target], costs[source] + cost)
+        return placed
+
+
+class LagrangianExposure(object):
+    """
+    Soft exposure control for run_multi. Each bounded player has a
+    multiplier for its min and its max bound, updated between
+    iterations by the gap between its exposure so far and the bound
+    (a projected subgradient step). Their difference, in points, is
+    added to the player's objective coefficient, so under-exposed
+    players are nudged into lineups and over-exposed ones out.
+
+    Players are only banned once they reach their max, and locked
+    only when every remaining lineup needs them to reach their min.
+    step is the multiplier change, in points, for a full lineup
+    share of error; it defaults to the pool's average projection.
+    """
 
-    exposure_diffs = {}
+    def __init__(self, exposure_bounds: list, n: int, player_pool: list,
+                 step: float = None):
+        self.bounds = OrderedDict((b['name'], b) for b in exposure_bounds)
+        self.n = n
+        if step is None:
+            proj = [p.proj for p in player_pool if p.proj > 0]
+            step = float(np.mean(proj)) if proj else 1.0
+        self.step = step
+        self.lower = {name: 0.0 for name in self.bounds}
+        self.upper = {name: 0.0 for name in self.bounds}
+
+    def update(self, exposures: dict, k: int):
+        """Steps the multipliers after k lineups"""
+        if not k:
+            return
+        for name, bound in self.bounds.items():
+            share = exposures.get(name, 0) / k
+            self.lower[name] = max(
+                0.0,
+                self.lower[name] + self.step * (bound['min'] - share),
+            )
+            self.upper[name] = max(
+                0.0,
+                self.upper[name] + self.step * (share - bound['max']),
+            )
+
+    def adjustments(self) -> dict:
+        return {
+            name: self.lower[name] - self.upper[name]
+            for name in self.bounds
+            if self.lower[name] != self.upper[name]
+        }
+
+    def get_exposure_args(self, existing_rosters, constraints) -> dict:
+        exposures = ExposureSummary(existing_rosters).counts_by_name()
+        k = len(existing_rosters)
+        self.update(exposures, k)
+
+        banned = []
+        needed = []
+        remaining = self.n - k
+        for name, bound in self.bounds.items():
+            lineups = exposures.get(name, 0)
+            min_lines = math.ceil(bound['min'] * self.n)
+            max_lines = get_max_lines(bound, self.n)
+
+            if lineups >= max_lines and not constraints.is_locked(name):
+                banned.append(name)
+            elif 0 < min_lines - lineups >= remaining and \
+                    not constraints.is_banned(name):
+                needed.append((lineups - min_lines, name))
+
+        return {
+            'banned': banned,
+            # lock only the player furthest behind
+            'locked': [name for _, name in sorted(needed)][:1],
+            'adjustments': self.adjustments(),
+        }
+
+
+class ExposureSummary(object):
+    """
+    Exposure of a set of rosters, computed once: per-player lineup
+    counts and shares, and for each bound (indexed by name) the
+    required min / max lineups with any deficit or overage. The
+    exposure table, check_exposure and run_multi's report all read
+    from it.
+    """
 
-    for bound in bounds:
-        name = bound['name']
-        exposure = exposures.get(name, 0)
+    def __init__(self, rosters, bounds=None):
+        self.n = len(rosters)
+
+        counts = {}
+        self.players = {}
+        for r in rosters:
+            for p in r.players:
+                counts[p.name] = counts.get(p.name, 0) + 1
+                self.players[p.name] = p
+
+        # most exposed first, ties in the order players were seen
+        self.names = sorted(counts, key=lambda name: -counts[name])
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.counts = np.array(
+            [counts[name] for name in self.names],
+            dtype=int,
+        )
+        self.percentages = self.counts / self.n if self.n else np.zeros(0)
+
+        # later bounds for a name replace earlier ones
+        self.bounds = OrderedDict()
+        for bound in bounds or []:
+            self.bounds[bound['name']] = bound
+
+        self.bound_names = list(self.bounds)
+        self.bound_counts = np.array([
+            self.count(name) for name in self.bound_names
+        ], dtype=int)
+        self.min_lineups = np.array([
+            self.n * b['min'] for b in self.bounds.values()
+        ], dtype=float)
+        self.max_lineups = np.array([
+            self.n * b['max'] for b in self.bounds.values()
+        ], dtype=float)
+        self.deficits = np.maximum(self.min_lineups - self.bound_counts, 0)
+        self.overages = np.maximum(self.bound_counts - self.max_lineups, 0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def count(self, name) -> int:
+        i = self.index.get(name)
+        return 0 if i is None else int(self.counts[i])
+
+    def counts_by_name(self) -> dict:
+        return dict(zip(self.names, self.counts.tolist()))
+
+    def diffs(self) -> dict:
+        """
+        {name: lineups over (positive) or under (negative) its
+        bound} for every player outside their bounds
+        """
+        exposure_diffs = {}
+        over = self.overages > 0
+        under = self.deficits > 0
+        for i, (name, bound) in enumerate(self.bounds.items()):
+            exposure = int(self.bound_counts[i])
+            if over[i]:
+                exposure_diffs[name] = exposure - self.n * bound['max']
+            elif under[i]:
+                exposure_diffs[name] = exposure - self.n * bound['min']
+        return exposure_diffs
+
+    def diff_messages(self) -> list:
+        messages = []
+        for n, d in self.diffs().items():
+            if d < 0:
+                message = '{} is UNDER exposure by {} lineups'
+            else:
+                message = '{} is OVER exposure by {} lineups'
+            messages.append(message.format(n, d))
+        return messages
+
+    def table(self, fmt: str = render.TABLE, limit: int = None,
+              offset: int = 0) -> str:
+        """
+        Renders the exposure report. limit / offset select a page of
+        players (most exposed first); see draftfast.render for fmt.
+        """
+        return render.render_exposure(self, fmt=fmt, limit=limit,
+                                      offset=offset)
 
-        if exposure > len(rosters) * bound['max']:
-            exposure_diffs[name] = exposure - len(rosters) * bound['max']
-        elif exposure < len(rosters) * bound['min']:
-            exposure_diffs[name] = exposure - len(rosters) * bound['min']
 
-    return exposure_diffs
+def check_exposure(rosters, bounds):
+    if not bounds:
+        return {}
+
+    return ExposureSummary(rosters, bounds).diffs()
 
 
 def get_exposure_table(rosters, bounds):
-    exposures = {}
+    return ExposureSummary(rosters, bounds).table()
+
+
+def get_exposure_incidence(rosters, exclude=[], sparse=False):
+    """
+    Returns (players, A): the distinct rostered players (by name,
+    ordered by short name) and the rosters x players 0/1 matrix A
+    of which lineups use which player. A is a scipy.sparse CSR
+    matrix if sparse is set (scipy is optional), else a dense array.
+    """
+    excluded = set(exclude)
     players = {}
     for r in rosters:
         for p in r.players:
-            exposures[p.name] = exposures.get(p.name, 0) + 1
-            players[p.name] = p
-
-    exposures = OrderedDict(sorted(exposures.items(),
-                                   key=lambda t: t[1],
-                                   reverse=True))
-
-    table_data = []
-    headers = [
-        'Position',
-        'Player',
-        'Team',
-        'Matchup',
-        'Salary',
-        'Projection',
-        '# Lineups',
-        'Min',
-        'Max'
-    ]
-    table_data.append(headers)
-
-    for name, num in exposures.items():
-        s_min = ''
-        s_max = ''
-
-        # TODO format min/max as a single string
-        if bounds:
-            for bound in bounds:
-                if bound['name'] == name:
-                    s_min = len(rosters) * bound['min']
-                    s_max = len(rosters) * bound['max']
-                    if num > s_max:
-                        s_max = '\x1b[0;31;40m{:0.2f}\x1b[0m'.format(s_max)
-                    elif num < s_min:
-                        s_min = '\x1b[0;31;40m{:0.2f}\x1b[0m'.format(s_min)
-
-                    continue
-
-        table_data.append(players[name].to_exposure_table_row(num,
-                                                              s_min,
-                                                              s_max))
-
-    table = AsciiTable(table_data)
-    table.justify_columns[4] = 'right'
-    table.justify_columns[5] = 'right'
-    table.justify_columns[6] = 'right'
-    table.justify_columns[7] = 'right'
-    table.justify_columns[8] = 'right'
-
-    return 'Roster Exposure:\n' + table.table
-
-
-def get_exposure_matrix(rosters, exclude=[]):
-    players = set()
-    for r in rosters:
+            if p.name not in players and p not in excluded:
+                players[p.name] = p
+
+    players = sorted(
+        players.values(),
+        key=lambda p: (str(p.short_name), p.name),
+    )
+    columns = {p.name: j for j, p in enumerate(players)}
+
+    rows = []
+    cols = []
+    for i, r in enumerate(rosters):
         for p in r.players:
-            if p in exclude:
-                continue
-            players.add(p)
-
-    sorted_names = sorted([p.short_name for p in players])
-    player_matrix = np.zeros((len(players), len(players)), dtype=int)
-
-    for r in rosters:
-        for i, p1 in enumerate(sorted_names):
-            for j, p2 in enumerate(sorted_names):
-                if p1 in r and p2 in r:
-                    player_matrix[i, j] += 1
-
-    rows = [[''] + sorted_names]
-
-    for i, p in enumerate(sorted_names):
-        rows.append([p] + list(player_matrix[i, :]))
+            j = columns.get(p.name)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+
+    shape = (len(rosters), len(players))
+    if sparse:
+        try:
+            from scipy import sparse as sp
+        except ImportError:
+            raise ImportError('scipy is required for sparse exposure matrices')
+        data = np.ones(len(rows), dtype=np.float32)
+        incidence = sp.csr_matrix((data, (rows, cols)), shape=shape)
+        # a player listed twice in a roster still counts once
+        incidence.data[:] = 1
+        return players, incidence
+
+    incidence = np.zeros(shape, dtype=np.float32)
+    incidence[rows, cols] = 1
+    return players, incidence
+
+
+def get_co_exposure(rosters, exclude=[], sparse=False):
+    """
+    Returns (players, C) where C[i, j] is the number of rosters
+    with both players i and j (C[i, i] is player i's exposure),
+    computed as A^T A over the incidence matrix.
+    """
+    players, incidence = get_exposure_incidence(rosters, exclude, sparse)
+    return players, incidence.T.dot(incidence).astype(int)
 
-    table = AsciiTable(rows)
-    table.inner_row_border = True
-    table.justify_columns = {i + 1: 'center' for i in range(len(sorted_names))}
 
-    return table.table
+def get_exposure_matrix(rosters, exclude=[], fmt=render.TABLE, limit=None):
+    players, player_matrix = get_co_exposure(rosters, exclude)
+    return render.render_co_exposure(players, player_matrix, fmt=fmt,
+                                     limit=limit)
@@ -0,0 +1,284 @@
+'''
+Synthetic opponent fields. Lineups are sampled slot by slot from
+projected ownership, a whole batch at a time: each slot draws a
+player for every lineup in the batch from the eligible, unused and
+still affordable players. Lineups that miss the salary range are
+rejected and redrawn.
+'''
+import numpy as np
+from draftfast.rules import RuleSet, DRAFT_KINGS
+from draftfast.columnar import ColumnarPool, MISSING_ID
+from draftfast import lineup_store
+
+
+class FieldGenerator(object):
+    '''
+    Samples valid lineups for a rule set from a pool (a list of
+    Players or a ColumnarPool), weighting players by
+    projected_ownership_pct (proj if the pool has no ownership).
+    Lineups are (lineups x roster size) pool index matrices whose
+    column i fills the rule set's i-th slot. lineup_store saves
+    and loads them as they are; rosters it writes itself use
+    sorted_players order instead, which matches slot order only
+    for slot-assigned rosters.
+
+    Lineups need players from min_teams teams (default 2, as in the
+    optimizer) and min_games games (default 2 for classic rule sets,
+    as DraftKings requires), and at most max_per_team from one team
+    (default: the optimizer's cap). Rows without team or game ids
+    are not counted. Stacking and other optimizer settings are not
+    applied.
+
+    Rule sets without slots are supported when their position
+    minimums add up to the roster size (e.g. showdown).
+    '''
+
+    def __init__(self, pool, rule_set: RuleSet, min_salary: float = None,
+                 ownership=None, min_teams: int = None,
+                 min_games: int = None, max_per_team: int = None):
+        if not isinstance(pool, ColumnarPool):
+            pool = ColumnarPool.from_players(pool)
+        self.pool = pool
+        self.rule_set = rule_set
+        self.salary_max = rule_set.salary_max
+        self.min_salary = rule_set.salary_min if min_salary is None \
+            else min_salary
+
+        self.min_teams = _default_min_teams(rule_set) if min_teams is None \
+            else min_teams
+        self.min_games = _default_min_games(rule_set) if min_games is None \
+            else min_games
+        self.max_per_team = _default_max_per_team(rule_set) \
+            if max_per_team is None else max_per_team
+
+        self.slots = _slots(rule_set)
+        self.eligible = np.array([
+            [bool(allowed.intersection((pos or '').split('/')))
+             for pos in pool.pos]
+            for _, allowed in self.slots
+        ], dtype=bool).reshape(len(self.slots), len(pool))
+
+        # most restrictive slots are filled first
+        self.fill_order = np.argsort(self.eligible.sum(axis=1),
+                                     kind='mergesort')
+
+        # the same player may have a pool row per position
+        names, self.name_ids = np.unique(
+            pool.name.astype(str),
+            return_inverse=True,
+        )
+        self.n_names = len(names)
+        rows_per_name = np.bincount(self.name_ids)[self.name_ids]
+
+        if ownership is None:
+            ownership = pool.projected_ownership_pct
+            if not np.any(ownership > 0):
+                ownership = np.maximum(pool.proj, 0)
+        self.ownership = np.asarray(ownership, dtype=np.float64)
+        self.weights = self.ownership / rows_per_name
+
+        self.slot_players = [np.flatnonzero(row) for row in self.eligible]
+        for (slot, _), players in zip(self.slots, self.slot_players):
+            if not len(players):
+                raise ValueError('No players in the pool can fill {}'.format(
+                    slot
+                ))
+
+        # cheapest and dearest fill of the slots after each step
+        self.min_remaining = _remaining([
+            pool.cost[players].min() for players in self.slot_players
+        ], self.fill_order)
+        self.max_remaining = _remaining([
+            pool.cost[players].max() for players in self.slot_players
+        ], self.fill_order)
+
+    def __repr__(self):
+        return '<FieldGenerator: {} {}, {} players>'.format(
+            self.rule_set.site,
+            self.rule_set.league,
+            len(self.pool),
+        )
+
+    def sample_batch(self, size: int, rng) -> np.ndarray:
+        '''
+        Draws size lineups and returns the valid ones; rows are pool
+        indexes, one column per slot.
+        '''
+        cost = self.pool.cost
+        lineups = np.zeros((size, len(self.slots)), dtype=np.int64)
+        used = np.zeros((size, self.n_names), dtype=bool)
+        spent = np.zeros(size)
+        valid = np.ones(size, dtype=bool)
+
+        for step, slot in enumerate(self.fill_order):
+            players = self.slot_players[slot]
+            costs = cost[players]
+
+            # leave room for the remaining slots at both salary limits
+            budget = self.salary_max - spent - self.min_remaining[step]
+            floor = self.min_salary - spent - self.max_remaining[step]
+            weights = np.where(
+                ~used[:, self.name_ids[players]] &
+                (costs[None, :] <= budget[:, None]) &
+                (costs[None, :] >= floor[:, None]),
+                self.weights[players],
+                0,
+            )
+            cumulative = weights.cumsum(axis=1)
+            total = cumulative[:, -1]
+            valid &= total > 0
+
+            draws = rng.random_sample(size) * total
+            picks = (cumulative <= draws[:, None]).sum(axis=1)
+            picks = players[np.minimum(picks, len(players) - 1)]
+
+            lineups[:, slot] = picks
+            used[np.arange(size), self.name_ids[picks]] = True
+            spent += cost[picks]
+
+        valid &= (spent <= self.salary_max) & (spent >= self.min_salary)
+        valid &= self.meets_team_rules(lineups)
+        return lineups[valid]
+
+    def meets_team_rules(self, lineups: np.ndarray) -> np.ndarray:
+        '''Mask of lineups within the team and game limits'''
+        valid = np.ones(len(lineups), dtype=bool)
+        for ids, minimum in ((self.pool.team_id, self.min_teams),
+                             (self.pool.game_id, self.min_games)):
+            if minimum and minimum > 1:
+                valid &= _distinct(ids[lineups]) >= minimum
+
+        team_ids = self.pool.team_id[lineups]
+        if self.max_per_team and (team_ids != MISSING_ID).any():
+            counts = np.zeros((len(lineups), team_ids.max() + 1), dtype=int)
+            rows = np.repeat(np.arange(len(lineups)), team_ids.shape[1])
+            keep = team_ids.ravel() != MISSING_ID
+            np.add.at(counts, (rows[keep], team_ids.ravel()[keep]), 1)
+            valid &= counts.max(axis=1) <= self.max_per_team
+        return valid
+
+    def generate(self, n: int, seed=None, batch_size: int = 10000,
+                 max_batches: int = None) -> np.ndarray:
+        '''
+        Returns n valid lineups, sampling batches until enough pass.
+        Raises ValueError if max_batches (default: enough for a 1%
+        acceptance rate) go by without reaching n.
+        '''
+        rng = np.random.RandomState(seed)
+        if max_batches is None:
+            max_batches = 100 * (-(-n // batch_size)) + 1
+
+        batches = []
+        found = 0
+        for _ in range(max_batches):
+            if found >= n:
+                break
+            batch = self.sample_batch(batch_size, rng)
+            batches.append(batch)
+            found += len(batch)
+
+        if found < n:
+            raise ValueError(
+                'Only {} of {} lineups were valid; check the salary range, '
+                'positions and team limits'.format(found, n)
+            )
+        return np.concatenate(batches)[:n]
+
+    def calibrate(self, rounds: int = 3, n: int = 5000, seed=None):
+        '''
+        Rescales player weights so sampled exposure tracks
+        ownership: slot-by-slot sampling under salary limits skews
+        exposure, e.g. toward cheap players.
+        '''
+        target = np.bincount(self.name_ids, weights=self.ownership,
+                             minlength=self.n_names)
+        # each player's ownership is counted once, not per pool row
+        target /= np.bincount(self.name_ids, minlength=self.n_names)
+        target = target / target.sum() * len(self.slots)
+
+        rng = np.random.RandomState(seed)
+        for _ in range(rounds):
+            lineups = self.sample_batch(n, rng)
+            if not len(lineups):
+                break
+            exposure = np.bincount(
+                self.name_ids[lineups.ravel()],
+                minlength=self.n_names,
+            ) / len(lineups)
+            ratio = np.ones(self.n_names)
+            seen = (exposure > 0) & (target > 0)
+            ratio[seen] = np.clip(target[seen] / exposure[seen], 0.25, 4)
+            self.weights = self.weights * ratio[self.name_ids]
+        return self
+
+    def lineup_stats(self, lineups: np.ndarray):
+        '''(proj, cost) totals for each lineup'''
+        return (
+            self.pool.proj[lineups].sum(axis=1),
+            self.pool.cost[lineups].sum(axis=1),
+        )
+
+    def records(self, lineups: np.ndarray):
+        '''Lazily yields lineup_store records for lineups'''
+        proj, cost = self.lineup_stats(lineups)
+        for row, p, c in zip(lineups.tolist(), proj, cost):
+            yield lineup_store.index_record(row, p, c)
+
+    def write_jsonl(self, lineups: np.ndarray, path: str):
+        lineup_store.write_records(self.records(lineups), path)
+
+    def write_array(self, lineups: np.ndarray, path: str):
+        proj, cost = self.lineup_stats(lineups)
+        lineup_store.write_index_array(lineups, path, proj, cost)
+
+
+def _remaining(slot_costs: list, fill_order) -> np.ndarray:
+    # total over the slots filled after each step
+    ordered = np.asarray(slot_costs, dtype=np.float64)[fill_order]
+    return np.append(np.cumsum(ordered[::-1])[::-1][1:], 0)
+
+
+def _distinct(ids: np.ndarray) -> np.ndarray:
+    # distinct ids per row, ignoring missing ones
+    ids = np.sort(ids, axis=1)
+    changes = (ids[:, 1:] != ids[:, :-1]).sum(axis=1)
+    return 1 + changes - (ids[:, 0] == MISSING_ID)
+
+
+def _default_min_teams(rule_set: RuleSet) -> int:
+    # the optimizer's min_teams default, which flexy_five skips
+    return 1 if rule_set.game_type == 'flexy_five' else 2
+
+
+def _default_min_games(rule_set: RuleSet) -> int:
+    return 2 if rule_set.game_type == 'classic' else 1
+
+
+def _default_max_per_team(rule_set: RuleSet):
+    # as in Optimizer._set_max_players_per_team
+    if rule_set.game_type == 'flexy_five':
+        return None
+    if rule_set.game_type == 'single':
+        return 4
+    if rule_set.game_type == 'flex3':
+        return 2
+    return 7 if rule_set.site == DRAFT_KINGS else 4
+
+
+def _slots(rule_set: RuleSet) -> list:
+    if rule_set.slots:
+        return [(slot, frozenset(allowed)) for slot, allowed in rule_set.slots]
+
+    minimums = [(pos, lower) for pos, lower, _ in rule_set.position_limits]
+    if sum(lower for _, lower in minimums) != rule_set.roster_size:
+        raise ValueError(
+            'Rule set {} {} has no roster slots'.format(
+                rule_set.site,
+                rule_set.league,
+            )
+        )
+    return [
+        (pos, frozenset([pos]))
+        for pos, lower in minimums
+        for _ in range(lower)
+    ]
@@ -0,0 +1,157 @@
+import re
+from typing import List
+from draftfast.orm import Game, Player
+
+# e.g. "TB@Atl 01:00PM ET", "LAC@NO 12/03/2018 08:00PM ET", "CEL vs LGN"
+MATCHUP_RE = re.compile(
+    r'^\s*(?P<first>[\w.]+)\s*(?P<sep>@|\s(?:vs\.?|v)\s)\s*'
+    r'(?P<second>[\w.]+)\s*(?P<start>.*?)\s*$',
+    re.IGNORECASE,
+)
+
+
+def parse_matchup(matchup: str):
+    '''
+    Parses a DraftKings "GameInfo" or FanDuel "Game" string
+    into (away, home, start_time). Returns None if the string
+    is not a recognizable matchup.
+    '''
+    if not matchup:
+        return None
+
+    match = MATCHUP_RE.match(matchup)
+    if not match:
+        return None
+
+    first = match.group('first').upper()
+    second = match.group('second').upper()
+    start_time = match.group('start') or None
+
+    # "A@B" means A is away; "A vs B" lists the home team first
+    if match.group('sep') == '@':
+        return first, second, start_time
+    return second, first, start_time
+
+
+class GameTable(object):
+    '''
+    Integer-coded teams and games for a player pool. Each matchup
+    string is parsed once; players are then tagged with team_id,
+    opp_id and game_id so opponent and game lookups are list indexes.
+    '''
+
+    def __init__(self):
+        self.teams = []
+        self.games = []
+        self.game_home = []
+        self.game_away = []
+        self._team_ids = {}
+        self._game_ids = {}
+        self._parsed = {}
+
+    def __len__(self):
+        return len(self.games)
+
+    def __repr__(self):
+        return '<GameTable: {} teams, {} games>'.format(
+            len(self.teams),
+            len(self.games),
+        )
+
+    def team_id(self, team: str) -> int:
+        if team is None:
+            return None
+
+        team = team.upper()
+        team_id = self._team_ids.get(team)
+        if team_id is None:
+            team_id = len(self.teams)
+            self._team_ids[team] = team_id
+            self.teams.append(team)
+        return team_id
+
+    def find_team(self, team: str) -> int:
+        '''Id of a known team, or None; unlike team_id never adds one'''
+        if team is None:
+            return None
+        return self._team_ids.get(team.upper())
+
+    def game_id(self, matchup: str) -> int:
+        if matchup in self._parsed:
+            return self._parsed[matchup]
+
+        parsed = parse_matchup(matchup)
+        game_id = None
+        if parsed:
+            game_id = self._add_game(*parsed)
+
+        self._parsed[matchup] = game_id
+        return game_id
+
+    def _add_game(self, away: str, home: str, start_time: str) -> int:
+        key = (away, home, start_time)
+        game_id = self._game_ids.get(key)
+        if game_id is None:
+            game_id = len(self.games)
+            self._game_ids[key] = game_id
+            self.games.append(Game(away, home, start_time=start_time))
+            self.game_away.append(self.team_id(away))
+            self.game_home.append(self.team_id(home))
+        return game_id
+
+    def opponent_id(self, team_id: int, game_id: int) -> int:
+        if team_id is None or game_id is None:
+            return None
+
+        away = self.game_away[game_id]
+        home = self.game_home[game_id]
+        if team_id == away:
+            return home
+        if team_id == home:
+            return away
+        return None
+
+    def index(self, team: str, matchup: str):
+        '''
+        Returns (team_id, game_id, opp_id, home) for a team and
+        matchup string; ids are None where they do not apply.
+        '''
+        team_id = self.team_id(team)
+        game_id = self.game_id(matchup)
+        opp_id = self.opponent_id(team_id, game_id)
+        home = None
+        if opp_id is not None:
+            home = self.game_home[game_id] == team_id
+        return team_id, game_id, opp_id, home
+
+    def index_players(self, players: List[Player]):
+        for p in players:
+            p.team_id, p.game_id, p.opp_id, p.home = \
+                self.index(p.team, p.matchup)
+
+        return self
+
+    def team_name(self, team_id: int) -> str:
+        return self.teams[team_id]
+
+    def to_dict(self) -> dict:
+        '''Plain data from which from_dict rebuilds the same ids'''
+        return {
+            'teams': list(self.teams),
+            'games': [
+                [g.away, g.home, g.start_time] for g in self.games
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        table = cls()
+        for team in data['teams']:
+            table.team_id(team)
+        for away, home, start_time in data['games']:
+            table._add_game(away, home, start_time)
+        return table
+
+
+def index_games(players: List[Player]) -> GameTable:
+    return GameTable().index_players(players)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
 
 
 def _iterableify(x):
@@ -15,13 +16,15 @@ class LineupConstraints(object):
                  position_banned: list = [],
                  groups: list = []):
         self._constraints = []
+        self._constraint_set = set()
+        self._group_index = defaultdict(list)
         self._banned = set()
         self._locked = set()
         self._position_locked = set()
         self._position_banned = set()
 
-        for name in banned:
-            self.ban(name)
+        if banned:
+            self.ban_many(banned)
 
         for solver_id in position_banned:
             self.position_ban(solver_id)
@@ -29,11 +32,11 @@ class LineupConstraints(object):
         for solver_id in position_locked:
             self.position_lock(solver_id)
 
-        for name in locked:
-            self.lock(name)
+        if locked:
+            self.lock_many(locked)
 
-        for players, bounds in groups:
-            self.add_group_constraint(players, bounds)
+        if groups:
+            self.add_groups(groups)
 
     def __iter__(self):
         return ConstraintIterator(self._constraints)
@@ -89,18 +92,9 @@ class LineupConstraints(object):
         return True
 
     def __contains__(self, player):
-        if player in self._locked:
-            return True
-
-        if player in self._banned:
-            return True
-
-        for c in self._constraints:
-            if isinstance(c, PlayerGroupConstraint):
-                if player in c.players:
-                    return True
-
-        return False
+        return player in self._locked or \
+            player in self._banned or \
+            player in self._group_index
 
     def _check_conflicts(self, constraint):
         if isinstance(constraint, PlayerGroupConstraint):
@@ -113,11 +107,21 @@ class LineupConstraints(object):
     def _add(self, constraint):
         self._check_conflicts(constraint)
 
-        if constraint not in self._constraints:
-            self._constraints.append(constraint)
-        else:
+        if constraint in self._constraint_set:
             raise ConstraintConflictException('Duplicate constraint')
 
+        self._constraints.append(constraint)
+        self._constraint_set.add(constraint)
+        for p in constraint.players:
+            self._group_index[p].append(constraint)
+
+    def _check_not_constrained(self, players):
+        for p in players:
+            if p in self:
+                raise ConstraintConflictException(
+                    '{} exists in another constraint'.format(p)
+                )
+
     def is_banned(self, player: str) -> bool:
         return player in self._banned
 
@@ -133,34 +137,60 @@ class LineupConstraints(object):
     def has_group_constraints(self) -> bool:
         return len(self._constraints) != 0
 
+    def get_group_constraints(self, player) -> list:
+        return list(self._group_index.get(player, []))
+
     def add_group_constraint(self, players, bound):
         self._add(PlayerGroupConstraint(players, bound))
 
-    def ban(self, players):
-        _players = _iterableify(players)
+    def add_groups(self, groups):
+        """
+        Adds many (players, bound) group constraints at once. Every
+        group is validated before any of them is added.
+        """
+        constraints = [
+            PlayerGroupConstraint(players, bound)
+            for players, bound in groups
+        ]
+
+        seen = set()
+        for constraint in constraints:
+            self._check_conflicts(constraint)
+            if constraint in seen or constraint in self._constraint_set:
+                raise ConstraintConflictException('Duplicate constraint')
+            seen.add(constraint)
+
+        for constraint in constraints:
+            self._add(constraint)
 
-        if len(_players) == 0:
-            raise ConstraintException('Empty ban group')
+    def ban(self, players):
+        self.ban_many(players)
 
-        for p in _players:
-            if p in self:
-                raise ConstraintConflictException(
-                    '{} exists in another constraint'.format(p)
-                )
-        self._banned.update(_players)
+    def ban_many(self, players):
+        """
+        Bans any iterable of players (or a single name); every player
+        is checked against existing constraints before any is added.
+        """
+        self._banned.update(self._unconstrained(players, 'ban'))
 
     def lock(self, players):
-        _players = _iterableify(players)
+        self.lock_many(players)
+
+    def lock_many(self, players):
+        """
+        Locks any iterable of players (or a single name); every player
+        is checked against existing constraints before any is added.
+        """
+        self._locked.update(self._unconstrained(players, 'lock'))
+
+    def _unconstrained(self, players, kind: str) -> set:
+        _players = set(_iterableify(players))
 
         if len(_players) == 0:
-            raise ConstraintException('Empty lock group')
+            raise ConstraintException('Empty {} group'.format(kind))
 
-        for p in _players:
-            if p in self:
-                raise ConstraintConflictException(
-                    '{} exists in another constraint'.format(p)
-                )
-        self._locked.update(_players)
+        self._check_not_constrained(_players)
+        return _players
 
     def position_lock(self, solver_ids):
         _solver_ids = _iterableify(solver_ids)
@@ -168,11 +198,7 @@ class LineupConstraints(object):
         if len(_solver_ids) == 0:
             raise ConstraintException('Empty position lock group')
 
-        for p in _solver_ids:
-            if p in self:
-                raise ConstraintConflictException(
-                    '{} exists in another constraint'.format(p)
-                )
+        self._check_not_constrained(_solver_ids)
         self._position_locked.update(_solver_ids)
 
     def position_ban(self, solver_ids):
@@ -181,11 +207,7 @@ class LineupConstraints(object):
         if len(_solver_ids) == 0:
             raise ConstraintException('Empty position lock group')
 
-        for p in _solver_ids:
-            if p in self:
-                raise ConstraintConflictException(
-                    '{} exists in another constraint'.format(p)
-                )
+        self._check_not_constrained(_solver_ids)
         self._position_banned.update(_solver_ids)
 
 
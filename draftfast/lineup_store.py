@@ -0,0 +1,236 @@
+import copy
+import json
+from typing import List
+import numpy as np
+from draftfast.orm import Roster, RosterSelect
+from draftfast.rules import RuleSet
+from draftfast.columnar import ColumnarPool
+
+FORMAT_VERSION = 1
+
+# what each stored lineup references its players by
+POOL_INDEX = 'pool'
+SITE_ID = 'ids'
+
+
+class PoolLookup(object):
+    '''
+    Maps roster players to their position in a player pool (a list
+    of Players or a ColumnarPool) and back. Players are matched on
+    solver_id, falling back to name and team for rosters built with
+    slot assignment, whose players take the position they filled.
+    '''
+
+    def __init__(self, pool):
+        if isinstance(pool, ColumnarPool):
+            pool = pool.to_players()
+        self.players = pool
+        self._by_key = {}
+        self._by_name_team = {}
+        self._by_site_id = None
+        for i, p in enumerate(pool):
+            self._by_key.setdefault(p.solver_id, i)
+            self._by_name_team.setdefault((p.name, p.team), i)
+
+    def __len__(self):
+        return len(self.players)
+
+    def index_of(self, player) -> int:
+        i = self._by_key.get(player.solver_id)
+        if i is None:
+            i = self._by_name_team.get((player.name, player.team))
+        if i is None:
+            raise KeyError('{} is not in the pool'.format(player.solver_id))
+        return i
+
+    def index_of_site_id(self, player_id: str, pos: str = None) -> int:
+        '''
+        Pool index for a site ID. Split multi-position players share
+        one ID across their rows, so pos picks the matching row; the
+        first row is used when pos is None or matches none of them.
+        '''
+        if self._by_site_id is None:
+            self._by_site_id = {}
+            for i, p in enumerate(self.players):
+                if getattr(p, 'player_id', None) is not None:
+                    self._by_site_id.setdefault(p.player_id, []).append(i)
+        indexes = self._by_site_id.get(player_id)
+        if not indexes:
+            raise KeyError('No player in the pool has site ID {}'.format(
+                player_id
+            ))
+        for i in indexes:
+            if self.players[i].pos == pos:
+                return i
+        return indexes[0]
+
+
+def lineup_record(roster: Roster, lookup: PoolLookup, key=POOL_INDEX,
+                  metadata: dict = None) -> dict:
+    '''
+    Compact form of a roster: its players (in sorted_players order)
+    as pool indexes or site IDs, plus projection, salary and
+    optional metadata. Positions are stored only when they differ
+    from the pool's, e.g. for slot-assigned multi-position players,
+    and always for site ID records, since split multi-position
+    players share one site ID.
+    '''
+    players = roster.sorted_players()
+    indexes = [lookup.index_of(p) for p in players]
+    if key == SITE_ID:
+        refs = [getattr(p, 'player_id', None) for p in players]
+        missing = [p.name for p, ref in zip(players, refs) if ref is None]
+        if missing:
+            raise ValueError('No site ID for {}; map player IDs first'.format(
+                ', '.join(missing)
+            ))
+    else:
+        refs = indexes
+
+    record = {
+        'v': FORMAT_VERSION,
+        key: refs,
+        'proj': round(roster.projected(), 4),
+        'cost': roster.spent(),
+    }
+    positions = [p.pos for p in players]
+    if key == SITE_ID or \
+            positions != [lookup.players[i].pos for i in indexes]:
+        record['pos'] = positions
+    if metadata:
+        record['meta'] = metadata
+    return record
+
+
+def index_record(indexes: list, proj: float, cost: float,
+                 metadata: dict = None) -> dict:
+    '''Record for a lineup already given as pool indexes'''
+    record = {
+        'v': FORMAT_VERSION,
+        POOL_INDEX: [int(i) for i in indexes],
+        'proj': round(float(proj), 4),
+        'cost': float(cost),
+    }
+    if metadata:
+        record['meta'] = metadata
+    return record
+
+
+def write_jsonl(rosters: List[Roster], path: str, pool, key=POOL_INDEX,
+                metadata: List[dict] = None, append=False):
+    '''
+    Writes one JSON line per roster. metadata, if given, is a list
+    of dicts (e.g. solve time, settings) aligned with rosters.
+    '''
+    lookup = pool if isinstance(pool, PoolLookup) else PoolLookup(pool)
+    metadata = metadata or [None] * len(rosters)
+    write_records(
+        (
+            lineup_record(roster, lookup, key=key, metadata=meta)
+            for roster, meta in zip(rosters, metadata)
+        ),
+        path,
+        append=append,
+    )
+
+
+def write_records(records, path: str, append=False):
+    '''Writes lineup records (see lineup_record) as JSON lines'''
+    with open(path, 'a' if append else 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')))
+            f.write('\n')
+
+
+def read_jsonl(path: str):
+    '''Lazily yields the stored lineup records'''
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_indexes(record: dict, lookup: PoolLookup) -> list:
+    '''Pool indexes of a stored lineup record'''
+    if SITE_ID not in record:
+        return record[POOL_INDEX]
+    positions = record.get('pos') or [None] * len(record[SITE_ID])
+    return [
+        lookup.index_of_site_id(i, pos)
+        for i, pos in zip(record[SITE_ID], positions)
+    ]
+
+
+def load_jsonl(path: str, pool, rule_set: RuleSet = None,
+               roster_gen=None) -> List[Roster]:
+    '''Rehydrates stored lineups against a pool'''
+    lookup = pool if isinstance(pool, PoolLookup) else PoolLookup(pool)
+    rosters = []
+    for record in read_jsonl(path):
+        rosters.append(_build_roster(
+            lookup,
+            record_indexes(record, lookup),
+            _new_roster(rule_set, roster_gen),
+            positions=record.get('pos'),
+        ))
+    return rosters
+
+
+def write_array(rosters: List[Roster], path: str, pool):
+    '''
+    Writes rosters as a NumPy .npz: an int32 (lineups x roster
+    size) matrix of pool indexes in sorted_players order, plus proj
+    and cost arrays. Slot-assigned positions are not kept; use
+    JSONL for those.
+    '''
+    lookup = pool if isinstance(pool, PoolLookup) else PoolLookup(pool)
+    write_index_array(
+        [
+            [lookup.index_of(p) for p in roster.sorted_players()]
+            for roster in rosters
+        ],
+        path,
+        proj=[r.projected() for r in rosters],
+        cost=[r.spent() for r in rosters],
+    )
+
+
+def write_index_array(indexes, path: str, proj, cost):
+    '''Writes an (lineups x roster size) pool index matrix as .npz'''
+    np.savez_compressed(
+        path,
+        version=np.array(FORMAT_VERSION),
+        indexes=np.asarray(indexes, dtype=np.int32),
+        proj=np.asarray(proj, dtype=np.float64),
+        cost=np.asarray(cost, dtype=np.float64),
+    )
+
+
+def load_array(path: str, pool, rule_set: RuleSet = None,
+               roster_gen=None) -> List[Roster]:
+    lookup = pool if isinstance(pool, PoolLookup) else PoolLookup(pool)
+    with np.load(path) as data:
+        indexes = data['indexes']
+    return [
+        _build_roster(lookup, row.tolist(), _new_roster(rule_set, roster_gen))
+        for row in indexes
+    ]
+
+
+def _new_roster(rule_set: RuleSet, roster_gen) -> Roster:
+    if roster_gen:
+        return roster_gen()
+    if rule_set is None:
+        raise ValueError('A rule_set or roster_gen is required')
+    return RosterSelect().roster_gen(rule_set.league)
+
+
+def _build_roster(lookup: PoolLookup, indexes: list, roster: Roster,
+                  positions: list = None) -> Roster:
+    for n, i in enumerate(indexes):
+        player = lookup.players[i]
+        if positions and positions[n] != player.pos:
+            player = copy.copy(player)
+            player.pos = positions[n]
+        roster.add_player(player)
+    return roster.finalize()
@@ -1,4 +1,5 @@
-# TODO - convert this to a dict and use same strategy as NFL
+# salary file name -> projection name, see csv_parse.projection_index,
+# which also takes the {dk_name: name} dict form NFL uses
 RENAMES = [
     {'dk_name': 'Maurice Harkless', 'name': 'Moe Harkless'},
     {'dk_name': 'Larry Nance Jr.', 'name': 'Larry Nance'},
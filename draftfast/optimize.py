@@ -2,10 +2,11 @@ import random
 from copy import deepcopy
 from typing import List
 from draftfast import player_pool as pool
+from draftfast import render
 from draftfast.orm import RosterSelect, Roster
 from draftfast.optimizer import Optimizer
-from draftfast.exposure import check_exposure, \
-    get_exposure_table, get_exposure_matrix, get_exposure_args
+from draftfast.exposure import ExposureSummary, LagrangianExposure, \
+    LockSampler, get_exposure_matrix, get_exposure_args
 from draftfast.rules import RuleSet
 from draftfast.settings import PlayerPoolSettings, OptimizerSettings
 from draftfast.lineup_constraints import LineupConstraints
@@ -52,9 +53,13 @@ def run(rule_set: RuleSet,
         else:
             roster = RosterSelect().roster_gen(rule_set.league)
 
+        slots = optimizer.get_slot_assignment()
         for i, player in enumerate(players):
             if variables[i].solution_value() == 1:
+                if i in slots:
+                    player.slot, player.pos = slots[i]
                 roster.add_player(player)
+        roster.finalize()
 
         if verbose:
             print('Optimal roster for: {}'.format(rule_set.league))
@@ -105,7 +110,24 @@ def run_multi(
     locked_pos=None,
     locked=None,
     lowest_salary=None,
+    roster_writer=None,
+    report_format=render.TABLE,
+    report_limit=None,
+    soft_exposure=False,
 ) -> [List[Roster], list]:
+    '''
+    Generates up to iterations lineups. If roster_writer (e.g. an
+    open csv_parse.uploaders uploader) is given, each roster is
+    passed to its write_roster as soon as it is generated.
+
+    With verbose, the exposure report is printed in report_format
+    (see draftfast.render), limited to the report_limit most exposed
+    players.
+
+    soft_exposure (True, or a configured LagrangianExposure) enforces
+    exposure_bounds through objective penalties instead of locking
+    and banning players each iteration.
+    '''
 
     if not isinstance(rule_set, RuleSet):
         raise Exception("RuleSet not defined. Please refer to the docs")
@@ -113,20 +135,40 @@ def run_multi(
     # set the random seed globally for random lineup exposure
     random.seed(exposure_random_seed)
 
+    if soft_exposure is True:
+        soft_exposure = LagrangianExposure(
+            exposure_bounds,
+            iterations,
+            player_pool,
+        )
+
+    # random exposure checks its lock sets against one shared sampler
+    sampler = None
+    if exposure_random_seed and exposure_bounds and not soft_exposure:
+        sampler = LockSampler(player_pool, rule_set, constraints)
+
     rosters = []
     for idx in range(0, iterations):
-        progress_recorder.set_progress(idx, iterations)
-        exposure_dict = get_exposure_args(
-            existing_rosters=optimizer_settings.existing_rosters,
-            exposure_bounds=exposure_bounds,
-            n=iterations,
-            use_random=bool(exposure_random_seed),
-            random_seed=exposure_random_seed,
-            locked_pos=locked_pos,
-            constraints=constraints,
-            rule_set=rule_set,
-            locked=locked,
-        )
+        if progress_recorder:
+            progress_recorder.set_progress(idx, iterations)
+        if soft_exposure:
+            exposure_dict = soft_exposure.get_exposure_args(
+                optimizer_settings.existing_rosters,
+                constraints,
+            )
+        else:
+            exposure_dict = get_exposure_args(
+                existing_rosters=optimizer_settings.existing_rosters,
+                exposure_bounds=exposure_bounds,
+                n=iterations,
+                use_random=bool(exposure_random_seed),
+                random_seed=exposure_random_seed,
+                locked_pos=locked_pos,
+                constraints=constraints,
+                rule_set=rule_set,
+                locked=locked,
+                sampler=sampler,
+            )
 
         roster = run(
             rule_set=rule_set,
@@ -143,6 +185,8 @@ def run_multi(
 
         if roster:
             rosters.append(roster)
+            if roster_writer is not None:
+                roster_writer.write_roster(roster)
         else:
             break
 
@@ -152,17 +196,19 @@ def run_multi(
     exposure_diffs = {}
 
     if rosters and verbose:
-        print(get_exposure_table(rosters, exposure_bounds))
+        summary = ExposureSummary(rosters, exposure_bounds)
+        print(summary.table(fmt=report_format, limit=report_limit))
         print()
-        print(get_exposure_matrix(rosters))
+        print(get_exposure_matrix(
+            rosters,
+            fmt=report_format,
+            limit=report_limit,
+        ))
         print()
 
-        exposure_diffs = check_exposure(rosters, exposure_bounds)
-        for n, d in exposure_diffs.items():
-            if d < 0:
-                print('{} is UNDER exposure by {} lineups'.format(n, d))
-            else:
-                print('{} is OVER exposure by {} lineups'.format(n, d))
+        exposure_diffs = summary.diffs()
+        for message in summary.diff_messages():
+            print(message)
 
     return rosters, exposure_diffs
 
@@ -1,10 +1,12 @@
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from typing import List
 from ortools.linear_solver import pywraplp
 from draftfast.settings import OptimizerSettings
 from draftfast.dke_exceptions import (InvalidBoundsException,
-                                      PlayerBanAndLockException)
+                                      PlayerBanAndLockException,
+                                      UnknownOpponentException)
 from draftfast.orm import Player
+from draftfast.games import index_games
 from draftfast.rules import RuleSet, DRAFT_KINGS
 from draftfast.lineup_constraints import LineupConstraints
 
@@ -39,9 +41,19 @@ class Optimizer(object):
         self.is_draftkings = rule_set.site == DRAFT_KINGS
         self.flexy_five = rule_set.game_type == 'flexy_five'
         self.settings = settings
+        self.slots = rule_set.slots if settings.use_slots else None
+        self.slot_variables = []
         self.lineup_constraints = lineup_constraints
         self.banned_for_exposure = exposure_dict.get('banned', [])
-        self.locked_for_exposure = exposure_dict.get('locked', [])[:1]
+        # one exposure lock per solve, unless the policy checked that
+        # the whole set fits a lineup (see exposure.LockSampler)
+        self.locked_for_exposure = exposure_dict.get('locked', [])
+        if not exposure_dict.get('lock_all'):
+            self.locked_for_exposure = self.locked_for_exposure[:1]
+        self.exposure_adjustments = exposure_dict.get('adjustments', {})
+
+        self.game_table = index_games(players)
+        self.team_to_idx_map = defaultdict(list)
 
         self.name_to_idx_map = {}
         self.variables = []
@@ -61,6 +73,7 @@ class Optimizer(object):
             )
 
             self._add_player_to_idx_maps(player, idx)
+            self.team_to_idx_map[player.team].append(idx)
 
             if self._is_locked(player):
                 if rule_set.salary_max - (sum(locked_salary) + player.cost) > lowest_salary:
@@ -85,16 +98,24 @@ class Optimizer(object):
             if player.lock and player.ban:
                 raise PlayerBanAndLockException(player.name)
 
-        self.teams = set([p.team for p in self.players])
+        self.teams = set(self.team_to_idx_map.keys())
         self.names = set([p.name for p in self.players])
         self.objective = self.solver.Objective()
         self.objective.SetMaximization()
 
+    def _player_key(self, p: Player) -> str:
+        if self.single or self.flex3:
+            return p.solver_id
+        if self.slots:
+            # one variable per real player, whatever position it fills
+            return '{} {}'.format(p.name, p.team)
+        return p.solver_id.split('-')[0]
+
     def _add_player_to_idx_maps(self, p: Player, idx: int):
         if self.single or self.flex3:
-            self.player_to_idx_map[p.solver_id] = idx
+            self.player_to_idx_map[self._player_key(p)] = idx
         else:
-            self.player_to_idx_map[p.solver_id.split('-')[0]].append(idx)
+            self.player_to_idx_map[self._player_key(p)].append(idx)
 
         if p.name not in self.name_to_idx_map.keys():
             self.name_to_idx_map[p.name] = set()
@@ -122,8 +143,11 @@ class Optimizer(object):
         self._optimize_on_projected_points()
         self._set_salary_range()
         self._set_roster_size()
-        self._set_positions()
-        self._set_general_positions()
+        if self.slots:
+            self._set_slots()
+        else:
+            self._set_positions()
+            self._set_general_positions()
         self._set_stack()
         self._set_combo()
         self._set_no_duplicate_lineups()
@@ -187,7 +211,7 @@ class Optimizer(object):
         for i, player in self.enumerated_players:
             self.objective.SetCoefficient(
                 self.variables[i],
-                player.proj,
+                player.proj + self.exposure_adjustments.get(player.name, 0),
             )
 
     def _set_salary_range(self):
@@ -223,12 +247,11 @@ class Optimizer(object):
                         stack_count,
                     )
 
-                    for i, player in self.enumerated_players:
-                        if stack_team == player.team:
-                            stack_cap.SetCoefficient(
-                                self.variables[i],
-                                1
-                            )
+                    for i in self.team_to_idx_map.get(stack_team, []):
+                        stack_cap.SetCoefficient(
+                            self.variables[i],
+                            1
+                        )
 
     def _set_combo(self):
         if self.settings:
@@ -261,24 +284,40 @@ class Optimizer(object):
         offensive_pos = self.offensive_positions
         defensive_pos = self.defensive_positions
 
-        enumerated_players = self.enumerated_players
+        # keyed by game table team id
+        offensive_against = defaultdict(list)
+        defensive = defaultdict(list)
 
-        for team in self.teams:
-            offensive_against = [
-                self.variables[i] for i, p in enumerated_players
-                if p.pos in offensive_pos and
-                p.is_opposing_team_in_match_up(team)
-            ]
-
-            # TODO this is gross for showdown
-            defensive = [
-                self.variables[i] for i, p in enumerated_players
-                if p.team == team and p.pos in defensive_pos or
-                self.showdown and p.real_pos in defensive_pos
-            ]
-
-            for p in offensive_against:
-                for d in defensive:
+        # TODO this is gross for showdown
+        showdown_defensive = []
+        unknown = []
+
+        for i, p in self.enumerated_players:
+            if self._in_positions(p, offensive_pos):
+                if p.opp_id is None:
+                    unknown.append(p)
+                    continue
+                offensive_against[p.opp_id].append(self.variables[i])
+
+            if self.showdown and p.real_pos in defensive_pos:
+                showdown_defensive.append(self.variables[i])
+            elif self._in_positions(p, defensive_pos) and \
+                    p.team_id is not None:
+                defensive[p.team_id].append(self.variables[i])
+
+        if unknown:
+            raise UnknownOpponentException(
+                'No opponent found in the matchup of {}'.format(
+                    ', '.join(
+                        '{} ({} {})'.format(p.name, p.team, p.matchup)
+                        for p in unknown
+                    )
+                )
+            )
+
+        for team_id, offensive in offensive_against.items():
+            for p in offensive:
+                for d in defensive[team_id] + showdown_defensive:
                     self.solver.Add(p <= 1 - d)
 
     def _set_positions(self):
@@ -292,6 +331,58 @@ class Optimizer(object):
                 if position == player.pos:
                     position_cap.SetCoefficient(self.variables[i], 1)
 
+    def _in_positions(self, p: Player, positions: list) -> bool:
+        if self.slots:
+            return any(pos in positions for pos in p.eligible_positions)
+        return p.pos in positions
+
+    def _set_slots(self):
+        """
+        Slot formulation: each player is a single variable, and is
+        assigned to one roster slot it is eligible for. Assignment
+        variables only exist for eligible (player, slot) pairs.
+        """
+        slot_counts = OrderedDict()
+        for slot, eligible in self.slots:
+            count, positions = slot_counts.get(slot, (0, set(eligible)))
+            slot_counts[slot] = (count + 1, positions)
+
+        player_slot_variables = defaultdict(list)
+        for slot, (count, positions) in slot_counts.items():
+            slot_cap = self.solver.Constraint(count, count)
+            for i, player in self.enumerated_players:
+                if positions.isdisjoint(player.eligible_positions):
+                    continue
+
+                variable = self.solver.IntVar(
+                    0, 1, '{} {}'.format(player.solver_id, slot)
+                )
+                slot_cap.SetCoefficient(variable, 1)
+                player_slot_variables[i].append(variable)
+                self.slot_variables.append((i, slot, positions, variable))
+
+        for i, variable in enumerate(self.variables):
+            assignment = self.solver.Constraint(0, 0)
+            assignment.SetCoefficient(variable, -1)
+            for slot_variable in player_slot_variables[i]:
+                assignment.SetCoefficient(slot_variable, 1)
+
+    def get_slot_assignment(self) -> dict:
+        """
+        Returns {player index: (slot, position)} for a solved slot
+        formulation, where position is the player's eligible position
+        used to fill the slot.
+        """
+        assignment = {}
+        for i, slot, positions, variable in self.slot_variables:
+            if variable.solution_value() == 1:
+                position = next(
+                    pos for pos in self.players[i].eligible_positions
+                    if pos in positions
+                )
+                assignment[i] = (slot, position)
+        return assignment
+
     def _set_general_positions(self):
         for general_position, min_limit, max_limit in \
                 self.general_position_limits:
@@ -316,13 +407,13 @@ class Optimizer(object):
                 0,
                 max_repeats
             )
-            for player in roster.sorted_players():
+            for player in roster.players:
                 if self.single or self.flex3:
-                    i = self.player_to_idx_map.get(player.solver_id)
+                    i = self.player_to_idx_map.get(self._player_key(player))
                     if i is not None:
                         repeated_players.SetCoefficient(self.variables[i], 1)
                 else:
-                    indexes = self.player_to_idx_map.get(player.solver_id.split('-')[0])
+                    indexes = self.player_to_idx_map.get(self._player_key(player))
                     if indexes is not None:
                         for i in indexes:
                             repeated_players.SetCoefficient(self.variables[i], 1)
@@ -335,8 +426,7 @@ class Optimizer(object):
                 team_var = self.solver.IntVar(0, 1, team)
                 teams.append(team_var)
                 players_on_team = [
-                    self.variables[i] for i, p
-                    in self.enumerated_players if p.team == team
+                    self.variables[i] for i in self.team_to_idx_map[team]
                 ]
                 self.solver.Add(team_var <= self.solver.Sum(players_on_team))
 
@@ -365,9 +455,8 @@ class Optimizer(object):
                     team_cap = self.solver.Constraint(0, 2)
                 else:
                     team_cap = self.solver.Constraint(0, max_players_per_team)
-                for i, player in self.enumerated_players:
-                    if team == player.team:
-                        team_cap.SetCoefficient(self.variables[i], 1)
+                for i in self.team_to_idx_map[team]:
+                    team_cap.SetCoefficient(self.variables[i], 1)
 
     def _set_po_settings(self):
         for po_setting in self.settings.lineup_settings:
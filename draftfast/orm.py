@@ -1,7 +1,7 @@
 import locale
-from terminaltables import AsciiTable
 from functools import total_ordering
 import re
+from draftfast import render
 
 try:
     locale.setlocale(locale.LC_ALL, 'en_US')
@@ -13,36 +13,90 @@ def cs(n):
     return locale.format('%d', n, grouping=True)
 
 
+class PlayerList(list):
+    '''
+    A roster's players; any change in place drops the roster's
+    cached slot order.
+    '''
+
+    def __init__(self, players=(), roster=None):
+        super().__init__(players)
+        self.roster = roster
+
+    def _changed(self):
+        # unpickling appends items before roster is restored
+        roster = getattr(self, 'roster', None)
+        if roster is not None:
+            roster._sorted_players = None
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, players):
+        result = super().__iadd__(players)
+        self._changed()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._changed()
+        return result
+
+    def append(self, player):
+        super().append(player)
+        self._changed()
+
+    def extend(self, players):
+        super().extend(players)
+        self._changed()
+
+    def insert(self, index, player):
+        super().insert(index, player)
+        self._changed()
+
+    def pop(self, index=-1):
+        player = super().pop(index)
+        self._changed()
+        return player
+
+    def remove(self, player):
+        super().remove(player)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+
 class Roster:
     def __init__(self):
-        self.players = []
+        self._players = PlayerList(roster=self)
+        self._sorted_players = None
 
-    def __repr__(self):
-        table_data = []
-        headers = [
-            'Position',
-            'Player',
-            'Team',
-            'Matchup',
-            'Salary',
-            'Projection',
-            'vs. Avg.',
-            'Locked'
-        ]
-        table_data.append(headers)
-        for p in self.sorted_players():
-            table_data.append(p.to_table_row())
-
-        table = AsciiTable(table_data)
-        table.justify_columns[4] = 'right'
-        table.justify_columns[5] = 'right'
-        table.justify_columns[6] = 'right'
+    @property
+    def players(self):
+        return self._players
 
-        aggregate_info = '\n\nProjected Score: {:0.2f} \t Cost: ${}'.format(
-            self.projected(),
-            cs(self.spent()))
+    @players.setter
+    def players(self, players):
+        self._players = PlayerList(players, roster=self)
+        self._sorted_players = None
 
-        return table.table + aggregate_info
+    def __repr__(self):
+        return render.render_roster(self)
 
     def __eq__(self, roster):
         if not roster:
@@ -73,7 +127,20 @@ class Roster:
         return player_set_a == player_set_b
 
     def add_player(self, player):
-        self.players.append(player)
+        self._players.append(player)
+
+    def finalize(self):
+        '''
+        Computes the canonical slot order once so that repeated
+        calls to sorted_players (repr, uploads, duplicate lineup
+        constraints) do not re-sort. The cache is dropped whenever
+        the player list changes.
+        '''
+        self._sorted_players = sorted(
+            self._players,
+            key=lambda p: self.position_order(p)
+        )
+        return self
 
     def spent(self):
         return sum([x.cost for x in self.players])
@@ -89,10 +156,10 @@ class Roster:
         return position_order[player.pos], -player.cost
 
     def sorted_players(self):
-        return sorted(
-            self.players,
-            key=lambda p: self.position_order(p)
-        )
+        if self._sorted_players is None:
+            self.finalize()
+        # a copy, so callers cannot change the cached order
+        return list(self._sorted_players)
 
 
 '''
@@ -303,8 +370,15 @@ class Player(object):
         self.position_ban = False
         self.multi_position = multi_position
         self.possible_positions = possible_positions
+        self.player_id = None
+        self.team_id = None
+        self.opp_id = None
+        self.game_id = None
+        self.home = None
 
     def get_player_id(self, player_map):
+        if self.player_id is not None:
+            return self.player_id
         return player_map[self.name + ' ' + self.possible_positions]
 
     def to_table_row(self):
@@ -332,9 +406,20 @@ class Player(object):
             s_max
         ]
 
-    def is_opposing_team_in_match_up(self, team):
-        return (team.upper() != self.team.upper()) and \
-               (team.upper() in self.matchup.upper())
+    def is_opposing_team_in_match_up(self, team, game_table=None):
+        '''
+        True if team is this player's opponent. team is a team id from
+        the GameTable the player was indexed with, or a team name
+        (looked up in game_table, or in the parsed matchup if None).
+        '''
+        opp_id = self.opp_id
+        if isinstance(team, str):
+            if game_table is None:
+                from draftfast.games import GameTable
+                game_table = GameTable()
+                opp_id = game_table.index(self.team, self.matchup)[2]
+            team = game_table.find_team(team)
+        return team is not None and team == opp_id
 
     def __repr__(self):
         v_avg = self.__format_v_avg()
@@ -385,8 +470,14 @@ class Player(object):
     def v_avg(self):
         return self.proj - self.average_score
 
+    @property
+    def eligible_positions(self):
+        return self.pos.split('/')
+
     @property
     def is_home(self):
+        if self.home is not None:
+            return self.home
         match_up_teams = self.matchup.split(' ')[0]
         return self.team == match_up_teams.split('@')[-1]
 
@@ -425,9 +516,18 @@ class Player(object):
 
 
 class Game:
-    def __init__(self, team, opp):
+    def __init__(self, team, opp, start_time=None):
         self.team = team
         self.opponent = opp
+        self.start_time = start_time
+
+    @property
+    def away(self):
+        return self.team
+
+    @property
+    def home(self):
+        return self.opponent
 
     def __repr__(self):
         return '{} @ {}'.format(self.team, self.opponent)
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from typing import List
+import numpy as np
+from draftfast.orm import Roster
+from draftfast.games import GameTable
+from draftfast.columnar import MISSING_ID
+from draftfast.exposure import get_exposure_incidence
+from draftfast.diversity import LineupBits
+
+
+class Portfolio(object):
+    '''
+    Stack structure of a set of rosters. Built once from the
+    rosters x players incidence matrix (see
+    exposure.get_exposure_incidence) and integer team / game codes
+    for the rostered players, so team and game counts for every
+    lineup are a single matrix product.
+
+    Pass a pool's game_table to share its team and game ids.
+    Position filters use each player's real positions, not the
+    showdown (CPT / FLEX) or slot position they were rostered at.
+    '''
+
+    def __init__(self, rosters: List[Roster], game_table: GameTable = None):
+        self.n = len(rosters)
+        self.players, self.incidence = get_exposure_incidence(rosters)
+        self.game_table = game_table or GameTable()
+
+        size = len(self.players)
+        self.positions = np.array(
+            [_real_position(p) for p in self.players],
+            dtype=object,
+        )
+        self.team_ids = np.full(size, MISSING_ID)
+        self.game_ids = np.full(size, MISSING_ID)
+        self.opp_ids = np.full(size, MISSING_ID)
+        for j, p in enumerate(self.players):
+            team_id, game_id, opp_id, _ = self.game_table.index(
+                p.team,
+                p.matchup,
+            )
+            for ids, value in ((self.team_ids, team_id),
+                               (self.game_ids, game_id),
+                               (self.opp_ids, opp_id)):
+                if value is not None:
+                    ids[j] = value
+
+    def __repr__(self):
+        return '<Portfolio: {} lineups, {} players>'.format(
+            self.n,
+            len(self.players),
+        )
+
+    @property
+    def teams(self) -> list:
+        return self.game_table.teams
+
+    @property
+    def games(self) -> list:
+        return self.game_table.games
+
+    def player_mask(self, positions=None, exclude_positions=None):
+        '''
+        Players with any of positions (all if None) and none of
+        exclude_positions; multi-position players ("PG/SG") match
+        on any of theirs.
+        '''
+        mask = np.ones(len(self.players), dtype=bool)
+        if positions is not None:
+            mask &= self._has_position(positions)
+        if exclude_positions is not None:
+            mask &= ~self._has_position(exclude_positions)
+        return mask
+
+    def team_counts(self, positions=None,
+                    exclude_positions=None) -> np.ndarray:
+        '''(lineups x teams) number of players from each team'''
+        return self._counts(
+            self.team_ids,
+            len(self.teams),
+            self.player_mask(positions, exclude_positions),
+        )
+
+    def game_counts(self, positions=None,
+                    exclude_positions=None) -> np.ndarray:
+        '''(lineups x games) number of players from each game'''
+        return self._counts(
+            self.game_ids,
+            len(self.games),
+            self.player_mask(positions, exclude_positions),
+        )
+
+    def team_exposure(self, min_players: int = 1, **filters) -> dict:
+        '''
+        Share of lineups with at least min_players from each team,
+        highest first; e.g. min_players=4 with
+        exclude_positions=['P'] for MLB hitter stacks.
+        '''
+        counts = self.team_counts(**filters)
+        return self._exposure(counts, min_players, self.teams)
+
+    def game_exposure(self, min_players: int = 1, **filters) -> dict:
+        '''Share of lineups with at least min_players from each game'''
+        counts = self.game_counts(**filters)
+        return self._exposure(
+            counts,
+            min_players,
+            [str(g) for g in self.games],
+        )
+
+    def max_stack(self, **filters) -> np.ndarray:
+        '''Size of each lineup's largest team stack'''
+        return self._row_max(self.team_counts(**filters))
+
+    def game_concentration(self, **filters) -> np.ndarray:
+        '''Most players each lineup takes from a single game'''
+        return self._row_max(self.game_counts(**filters))
+
+    def stack_shapes(self, min_size: int = 2, **filters) -> list:
+        '''
+        Each lineup's team stacks of at least min_size players as a
+        descending tuple, e.g. (4, 2); () for no stacks.
+        '''
+        counts = np.sort(self.team_counts(**filters), axis=1)[:, ::-1]
+        return [
+            tuple(row[row >= min_size].tolist()) for row in counts
+        ]
+
+    def shape_counts(self, min_size: int = 2, **filters) -> dict:
+        '''Number of lineups with each stack shape, most common first'''
+        shapes = {}
+        for shape in self.stack_shapes(min_size, **filters):
+            shapes[shape] = shapes.get(shape, 0) + 1
+        return OrderedDict(
+            sorted(shapes.items(), key=lambda x: (-x[1], x[0]))
+        )
+
+    def anchor_stacks(self, anchor=('QB',), partners=('WR', 'TE'),
+                      bring_back=('WR', 'TE', 'RB')):
+        '''
+        For each lineup, (partners, bring_backs): how many partner
+        players share a team with the lineup's anchor (e.g. QB +
+        pass-catchers) and how many bring_back players are on the
+        anchor's opponent. Both are 0 for lineups without an anchor.
+        '''
+        anchor_mask = self.player_mask(anchor)
+        anchor_teams = self._counts(self.team_ids, len(self.teams),
+                                    anchor_mask)
+        anchor_opps = self._counts(self.opp_ids, len(self.teams),
+                                   anchor_mask)
+        partner_teams = self.team_counts(positions=partners)
+        bring_back_teams = self.team_counts(positions=bring_back)
+
+        return (
+            (np.minimum(anchor_teams, 1) * partner_teams).sum(axis=1),
+            (np.minimum(anchor_opps, 1) * bring_back_teams).sum(axis=1),
+        )
+
+    def overlap_histogram(self, chunk_size: int = 500) -> np.ndarray:
+        '''
+        h[k] is the number of lineup pairs sharing exactly k
+        players (see diversity.LineupBits.overlap_histogram).
+        '''
+        rows, columns = np.nonzero(self.incidence)
+        bounds = np.searchsorted(rows, range(1, self.n))
+        indexes = np.split(columns, bounds)[:self.n]
+        bits = LineupBits.from_indexes(indexes, len(self.players))
+        return bits.overlap_histogram(chunk_size)
+
+    def _has_position(self, positions) -> np.ndarray:
+        wanted = set(positions)
+        return np.array([
+            bool(wanted.intersection((pos or '').split('/')))
+            for pos in self.positions
+        ], dtype=bool)
+
+    def _counts(self, ids, width: int, mask) -> np.ndarray:
+        keep = mask & (ids != MISSING_ID)
+        codes = np.zeros((len(self.players), width), dtype=np.float32)
+        codes[np.flatnonzero(keep), ids[keep]] = 1
+        return np.rint(self.incidence.dot(codes)).astype(np.int64)
+
+    def _exposure(self, counts, min_players: int, labels: list) -> dict:
+        if not self.n:
+            return OrderedDict()
+        shares = (counts >= min_players).sum(axis=0) / self.n
+        order = np.argsort(-shares, kind='mergesort')
+        return OrderedDict(
+            (labels[i], float(shares[i])) for i in order if shares[i]
+        )
+
+    def _row_max(self, counts) -> np.ndarray:
+        if not counts.shape[1]:
+            return np.zeros(self.n, dtype=np.int64)
+        return counts.max(axis=1)
+
+
+def _real_position(player) -> str:
+    return getattr(player, 'real_pos', None) or \
+        player.possible_positions or player.pos
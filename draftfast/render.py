@@ -0,0 +1,256 @@
+'''
+Text rendering for rosters and exposure reports. Rows are produced
+lazily and can be limited to a page (limit / offset) before any
+formatting happens. Formats:
+
+- table: terminaltables AsciiTable, as printed by verbose runs
+- plain: aligned columns, no borders or colours
+- csv: one CSV line per row
+- json: one JSON object per row (JSON lines)
+'''
+import csv
+import io
+import json
+from itertools import islice
+from terminaltables import AsciiTable
+
+TABLE = 'table'
+PLAIN = 'plain'
+CSV = 'csv'
+JSON = 'json'
+
+FORMATS = (TABLE, PLAIN, CSV, JSON)
+
+ROSTER_HEADERS = [
+    'Position',
+    'Player',
+    'Team',
+    'Matchup',
+    'Salary',
+    'Projection',
+    'vs. Avg.',
+    'Locked'
+]
+
+EXPOSURE_HEADERS = [
+    'Position',
+    'Player',
+    'Team',
+    'Matchup',
+    'Salary',
+    'Projection',
+    '# Lineups',
+    'Min',
+    'Max'
+]
+
+HIGHLIGHT = '\x1b[0;31;40m{:0.2f}\x1b[0m'
+
+
+def paginate(rows, limit: int = None, offset: int = 0):
+    stop = None if limit is None else offset + limit
+    return islice(rows, offset, stop)
+
+
+def iter_render(headers: list, rows, fmt: str = TABLE, limit: int = None,
+                offset: int = 0, justify: dict = None,
+                inner_row_border=False):
+    '''
+    Yields the rendered output in pieces: one line per row for
+    plain, csv and json, a single string for table (which needs
+    every row of the page to size its columns).
+    '''
+    if fmt not in FORMATS:
+        raise ValueError('Unknown format {}, expected one of {}'.format(
+            fmt,
+            ', '.join(FORMATS),
+        ))
+
+    rows = paginate(rows, limit, offset)
+
+    if fmt == CSV:
+        yield _csv_line(headers)
+        for row in rows:
+            yield _csv_line(row)
+    elif fmt == JSON:
+        if len(set(headers)) != len(headers):
+            raise ValueError('JSON rows need unique headers')
+        for row in rows:
+            yield json.dumps(
+                {h: _json_value(v) for h, v in zip(headers, row)},
+                default=str,
+            )
+    elif fmt == PLAIN:
+        rows = [[_plain(v) for v in row] for row in rows]
+        widths = [
+            max([len(str(h))] + [len(row[i]) for row in rows])
+            for i, h in enumerate(headers)
+        ]
+        for row in [headers] + rows:
+            yield '  '.join(
+                str(v).ljust(w) for v, w in zip(row, widths)
+            ).rstrip()
+    else:
+        table = AsciiTable([headers] + list(rows))
+        table.inner_row_border = inner_row_border
+        for column, alignment in (justify or {}).items():
+            table.justify_columns[column] = alignment
+        yield table.table
+
+
+def render(headers: list, rows, fmt: str = TABLE, limit: int = None,
+           offset: int = 0, justify: dict = None,
+           inner_row_border=False) -> str:
+    return '\n'.join(iter_render(
+        headers,
+        rows,
+        fmt=fmt,
+        limit=limit,
+        offset=offset,
+        justify=justify,
+        inner_row_border=inner_row_border,
+    ))
+
+
+def roster_rows(roster, raw=False):
+    for p in roster.sorted_players():
+        if raw:
+            yield [
+                p.formatted_position,
+                p.name,
+                p.team,
+                p.matchup,
+                p.cost,
+                p.proj,
+                p.v_avg,
+                p.lock,
+            ]
+        else:
+            yield p.to_table_row()
+
+
+def render_roster(roster, fmt: str = TABLE) -> str:
+    rows = roster_rows(roster, raw=fmt != TABLE)
+    if fmt == PLAIN:
+        rows = (
+            row[:6] + ['{:0.2f}'.format(row[6]), 'LOCK' if row[7] else '']
+            for row in rows
+        )
+    output = render(
+        ROSTER_HEADERS,
+        rows,
+        fmt=fmt,
+        justify={4: 'right', 5: 'right', 6: 'right'},
+    )
+    if fmt != TABLE:
+        return output
+
+    # imported here since orm renders rosters through this module
+    from draftfast.orm import cs
+
+    return output + '\n\nProjected Score: {:0.2f} \t Cost: ${}'.format(
+        roster.projected(),
+        cs(roster.spent()),
+    )
+
+
+def exposure_rows(summary, highlight=True, raw=False):
+    '''Rows of an ExposureSummary, most exposed first'''
+    for name, num in zip(summary.names, summary.counts.tolist()):
+        s_min = ''
+        s_max = ''
+
+        # TODO format min/max as a single string
+        bound = summary.bounds.get(name)
+        if bound is not None:
+            s_min = summary.n * bound['min']
+            s_max = summary.n * bound['max']
+            if highlight and num > s_max:
+                s_max = HIGHLIGHT.format(s_max)
+            elif highlight and num < s_min:
+                s_min = HIGHLIGHT.format(s_min)
+
+        p = summary.players[name]
+        if raw:
+            yield [
+                p.formatted_position,
+                p.name,
+                p.team,
+                p.matchup,
+                p.cost,
+                p.proj,
+                num,
+                s_min,
+                s_max,
+            ]
+        else:
+            yield p.to_exposure_table_row(num, s_min, s_max)
+
+
+def render_exposure(summary, fmt: str = TABLE, limit: int = None,
+                    offset: int = 0) -> str:
+    rows = exposure_rows(
+        summary,
+        highlight=fmt == TABLE,
+        raw=fmt != TABLE,
+    )
+    output = render(
+        EXPOSURE_HEADERS,
+        rows,
+        fmt=fmt,
+        limit=limit,
+        offset=offset,
+        justify={i: 'right' for i in range(4, 9)},
+    )
+    if fmt == TABLE:
+        return 'Roster Exposure:\n' + output
+    return output
+
+
+def render_co_exposure(players: list, matrix, fmt: str = TABLE,
+                       limit: int = None) -> str:
+    '''
+    Renders a co-exposure matrix (see exposure.get_co_exposure). With
+    limit, only the limit most exposed players are shown. JSON rows
+    are labelled by solver_id rather than short name.
+    '''
+    keep = list(range(len(players)))
+    if limit is not None:
+        exposure = matrix.diagonal()
+        keep = sorted(sorted(keep, key=lambda i: -exposure[i])[:limit])
+
+    # short names can collide, so JSON keys use the unique solver_id
+    names = [
+        players[i].solver_id if fmt == JSON else players[i].short_name
+        for i in keep
+    ]
+    rows = (
+        [names[n]] + [matrix[i, j] for j in keep]
+        for n, i in enumerate(keep)
+    )
+    return render(
+        [''] + names,
+        rows,
+        fmt=fmt,
+        justify={i + 1: 'center' for i in range(len(names))},
+        inner_row_border=True,
+    )
+
+
+def _csv_line(row) -> str:
+    out = io.StringIO()
+    csv.writer(out).writerow(row)
+    return out.getvalue().rstrip('\r\n')
+
+
+def _json_value(value):
+    # NumPy scalars and arrays, e.g. co-exposure counts
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return value
+
+
+def _plain(value) -> str:
+    if value is None:
+        return ''
+    return str(value)
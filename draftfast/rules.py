@@ -225,6 +225,132 @@ WNBA_GENERAL_POSITIONS = [
     ['F', 3, 4],
 ]
 
+NBA_POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C']
+NFL_FLEX_POSITIONS = ['RB', 'WR', 'TE']
+
+# Roster slots in the order each site's upload template lists them,
+# with the player positions eligible for each slot
+ROSTER_SLOTS = {
+    DRAFT_KINGS: {
+        'NBA': [
+            ['PG', ['PG']],
+            ['SG', ['SG']],
+            ['SF', ['SF']],
+            ['PF', ['PF']],
+            ['C', ['C']],
+            ['G', ['PG', 'SG']],
+            ['F', ['SF', 'PF']],
+            ['UTIL', NBA_POSITIONS],
+        ],
+        'WNBA': [
+            ['G', ['PG', 'SG', 'G']],
+            ['G', ['PG', 'SG', 'G']],
+            ['F', ['SF', 'PF', 'F']],
+            ['F', ['SF', 'PF', 'F']],
+            ['F', ['SF', 'PF', 'F']],
+            ['UTIL', ['PG', 'SG', 'SF', 'PF', 'G', 'F']],
+        ],
+        'NFL': [
+            ['QB', ['QB']],
+            ['RB', ['RB']],
+            ['RB', ['RB']],
+            ['WR', ['WR']],
+            ['WR', ['WR']],
+            ['WR', ['WR']],
+            ['TE', ['TE']],
+            ['FLEX', NFL_FLEX_POSITIONS],
+            ['DST', ['DST']],
+        ],
+        'MLB': [
+            ['P', ['SP', 'RP']],
+            ['P', ['SP', 'RP']],
+            ['C', ['C']],
+            ['1B', ['1B']],
+            ['2B', ['2B']],
+            ['3B', ['3B']],
+            ['SS', ['SS']],
+            ['OF', ['OF']],
+            ['OF', ['OF']],
+            ['OF', ['OF']],
+        ],
+        'SOCCER': [
+            ['F', ['F']],
+            ['F', ['F']],
+            ['M', ['M']],
+            ['M', ['M']],
+            ['D', ['D']],
+            ['D', ['D']],
+            ['GK', ['GK']],
+            ['UTIL', ['F', 'M', 'D', 'GK']],
+        ],
+        'EL': [
+            ['G', ['G']],
+            ['G', ['G']],
+            ['F', ['F']],
+            ['F', ['F']],
+            ['F', ['F']],
+            ['UTIL', ['G', 'F']],
+        ],
+        'NHL': [
+            ['C', ['C']],
+            ['C', ['C']],
+            ['W', ['W']],
+            ['W', ['W']],
+            ['W', ['W']],
+            ['D', ['D']],
+            ['D', ['D']],
+            ['G', ['G']],
+            ['UTIL', ['C', 'W', 'D']],
+        ],
+    },
+    FAN_DUEL: {
+        'NBA': [
+            ['PG', ['PG']],
+            ['PG', ['PG']],
+            ['SG', ['SG']],
+            ['SG', ['SG']],
+            ['SF', ['SF']],
+            ['SF', ['SF']],
+            ['PF', ['PF']],
+            ['PF', ['PF']],
+            ['C', ['C']],
+        ],
+        'WNBA': [
+            ['G', ['G']],
+            ['G', ['G']],
+            ['G', ['G']],
+            ['F', ['F']],
+            ['F', ['F']],
+            ['F', ['F']],
+            ['F', ['F']],
+        ],
+        'NFL': [
+            ['QB', ['QB']],
+            ['RB', ['RB']],
+            ['RB', ['RB']],
+            ['WR', ['WR']],
+            ['WR', ['WR']],
+            ['WR', ['WR']],
+            ['TE', ['TE']],
+            ['FLEX', NFL_FLEX_POSITIONS],
+            ['D', ['D']],
+        ],
+        'MLB': [
+            ['P', ['P']],
+            ['C/1B', ['C', '1B']],
+            ['2B', ['2B']],
+            ['3B', ['3B']],
+            ['SS', ['SS']],
+            ['OF', ['OF']],
+            ['OF', ['OF']],
+            ['OF', ['OF']],
+            ['UTIL', ['C', '1B', '2B', '3B', 'SS', 'OF']],
+        ],
+        'NASCAR': [['D', ['D']]] * 5,
+        'PGA': [['G', ['G']]] * 6,
+    },
+}
+
 
 class RuleSet(object):
     def __init__(self, site, league,
@@ -232,7 +358,7 @@ class RuleSet(object):
                  salary_max, salary_min=0,
                  general_position_limits=None,
                  offensive_positions=None, defensive_positions=None,
-                 game_type='classic'):
+                 game_type='classic', slots=None):
         self.site = site
         self.league = league
         self.roster_size = roster_size
@@ -243,6 +369,7 @@ class RuleSet(object):
         self.offensive_positions = offensive_positions
         self.defensive_positions = defensive_positions
         self.game_type = game_type
+        self.slots = slots
 
 
 DK_NBA_RULE_SET = RuleSet(
@@ -252,6 +379,7 @@ DK_NBA_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[DRAFT_KINGS]['NBA'],
     position_limits=POSITIONS[DRAFT_KINGS]['NBA'],
     general_position_limits=NBA_GENERAL_POSITIONS,
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['NBA'],
 )
 
 DK_NBA_SHOWDOWN_RULE_SET = RuleSet(
@@ -271,6 +399,7 @@ FD_NBA_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[FAN_DUEL]['NBA'],
     position_limits=POSITIONS[FAN_DUEL]['NBA'],
     general_position_limits=NBA_GENERAL_POSITIONS,
+    slots=ROSTER_SLOTS[FAN_DUEL]['NBA'],
 )
 
 FD_NBA_SINGLE_GAME_RULE_SET = RuleSet(
@@ -300,6 +429,7 @@ DK_WNBA_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[DRAFT_KINGS]['WNBA'],
     position_limits=POSITIONS[DRAFT_KINGS]['WNBA'],
     general_position_limits=NBA_GENERAL_POSITIONS,
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['WNBA'],
 )
 
 FD_WNBA_RULE_SET = RuleSet(
@@ -309,6 +439,7 @@ FD_WNBA_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[FAN_DUEL]['WNBA'],
     position_limits=POSITIONS[FAN_DUEL]['WNBA'],
     general_position_limits=NBA_GENERAL_POSITIONS,
+    slots=ROSTER_SLOTS[FAN_DUEL]['WNBA'],
 )
 
 DK_NFL_RULE_SET = RuleSet(
@@ -320,6 +451,7 @@ DK_NFL_RULE_SET = RuleSet(
     offensive_positions=['QB', 'RB', 'WR', 'TE'],
     defensive_positions=['DST'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['NFL'],
 )
 
 FD_NFL_RULE_SET = RuleSet(
@@ -331,6 +463,7 @@ FD_NFL_RULE_SET = RuleSet(
     offensive_positions=['QB', 'RB', 'WR', 'TE'],
     defensive_positions=['D'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[FAN_DUEL]['NFL'],
 )
 
 DK_NFL_SHOWDOWN_RULE_SET = RuleSet(
@@ -364,6 +497,7 @@ FD_PGA_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[FAN_DUEL]['PGA'],
     position_limits=POSITIONS[FAN_DUEL]['PGA'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[FAN_DUEL]['PGA'],
 )
 
 FD_NASCAR_RULE_SET = RuleSet(
@@ -373,6 +507,7 @@ FD_NASCAR_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[FAN_DUEL]['NASCAR'],
     position_limits=POSITIONS[FAN_DUEL]['NASCAR'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[FAN_DUEL]['NASCAR'],
 )
 
 DK_MLB_RULE_SET = RuleSet(
@@ -382,6 +517,7 @@ DK_MLB_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[DRAFT_KINGS]['MLB'],
     position_limits=POSITIONS[DRAFT_KINGS]['MLB'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['MLB'],
 )
 
 FD_MLB_RULE_SET = RuleSet(
@@ -391,6 +527,7 @@ FD_MLB_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[FAN_DUEL]['MLB'],
     position_limits=POSITIONS[FAN_DUEL]['MLB'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[FAN_DUEL]['MLB'],
 )
 
 DK_SOCCER_RULE_SET = RuleSet(
@@ -402,6 +539,7 @@ DK_SOCCER_RULE_SET = RuleSet(
     offensive_positions=['M', 'F'],
     defensive_positions=['GK', 'D'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['SOCCER'],
 )
 
 DK_EURO_LEAGUE_RULE_SET = RuleSet(
@@ -411,6 +549,7 @@ DK_EURO_LEAGUE_RULE_SET = RuleSet(
     salary_max=SALARY_CAP[DRAFT_KINGS]['EL'],
     position_limits=POSITIONS[DRAFT_KINGS]['EL'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['EL'],
 )
 
 DK_NHL_RULE_SET = RuleSet(
@@ -422,6 +561,7 @@ DK_NHL_RULE_SET = RuleSet(
     offensive_positions=['C', 'W'],
     defensive_positions=['G', 'D'],
     general_position_limits=[],
+    slots=ROSTER_SLOTS[DRAFT_KINGS]['NHL'],
 )
 
 DK_NHL_SHOWDOWN_RULE_SET = RuleSet(
@@ -0,0 +1,129 @@
+'''
+Post-slate scoring: actual fantasy points for a pool, scores for
+any number of stored or generated lineups, and their rank against
+a contest field.
+'''
+import numpy as np
+from draftfast.orm import Roster
+from draftfast.columnar import ColumnarPool
+from draftfast.lineup_store import PoolLookup, record_indexes
+from draftfast.csv_parse.projection_index import (
+    ProjectionIndex,
+    read_projection_csv,
+)
+
+BY_NAME = 'name'
+BY_ID = 'id'
+
+
+def read_results_csv(path: str, encoding='utf-8', errors='replace') -> dict:
+    '''Reads a playername,points results CSV into {name: points}'''
+    return read_projection_csv(path, encoding=encoding, errors=errors)
+
+
+def actual_points(pool, results: dict, by: str = BY_NAME,
+                  renames: dict = None, position_multipliers: dict = None):
+    '''
+    Maps a results table onto a pool (a list of Players or a
+    ColumnarPool). Returns (points, matched) arrays in pool order;
+    unmatched players score 0.
+
+    by='name' matches results keyed by player name (optionally with
+    a team, as in projection CSVs) through ProjectionIndex; by='id'
+    matches on site player IDs. position_multipliers scales pool
+    entries by position, e.g. {'CPT': 1.5} for showdown captains.
+    '''
+    if by == BY_ID:
+        if isinstance(pool, ColumnarPool):
+            raise ValueError('ColumnarPool has no player IDs, match by name')
+        values = [results.get(getattr(p, 'player_id', None)) for p in pool]
+        matched = np.array([v is not None for v in values], dtype=bool)
+        points = np.array([v or 0 for v in values], dtype=np.float64)
+    elif by == BY_NAME:
+        if isinstance(pool, ColumnarPool):
+            names, teams = pool.name, pool.team
+        else:
+            names = [p.name for p in pool]
+            teams = [p.team for p in pool]
+        index = ProjectionIndex(results, renames=renames)
+        points, matched = index.join(names, teams)
+    else:
+        raise ValueError('Unknown key {}, expected name or id'.format(by))
+
+    if position_multipliers:
+        positions = pool.pos if isinstance(pool, ColumnarPool) \
+            else [p.pos for p in pool]
+        points = points * np.array([
+            position_multipliers.get(pos, 1) for pos in positions
+        ])
+    return points, matched
+
+
+def lineup_incidence(lineups, pool=None):
+    '''
+    (rows, columns, lineups) of the lineups x pool incidence
+    matrix in coordinate form. lineups may be Rosters, lineup_store
+    records, lists of pool indexes or an (lineups x roster size)
+    index matrix, e.g. from a lineup_store .npz; Rosters and
+    records need the pool they were built from.
+    '''
+    if isinstance(lineups, np.ndarray) and lineups.ndim == 2:
+        rows = np.repeat(np.arange(len(lineups)), lineups.shape[1])
+        return rows, lineups.ravel().astype(np.int64), len(lineups)
+
+    lookup = None
+    rows = []
+    columns = []
+    count = 0
+    for i, lineup in enumerate(lineups):
+        count += 1
+        if isinstance(lineup, (Roster, dict)) and lookup is None:
+            if pool is None:
+                raise ValueError('A pool is required to score rosters')
+            lookup = pool if isinstance(pool, PoolLookup) \
+                else PoolLookup(pool)
+
+        if isinstance(lineup, Roster):
+            indexes = [lookup.index_of(p) for p in lineup.players]
+        elif isinstance(lineup, dict):
+            indexes = record_indexes(lineup, lookup)
+        else:
+            indexes = lineup
+
+        rows.extend([i] * len(indexes))
+        columns.extend(indexes)
+    return (
+        np.array(rows, dtype=np.int64),
+        np.array(columns, dtype=np.int64),
+        count,
+    )
+
+
+def score_lineups(lineups, points: np.ndarray, pool=None) -> np.ndarray:
+    '''
+    Total points for every lineup: one sparse incidence
+    matrix-vector product, A p, with A in coordinate form.
+    '''
+    rows, columns, n = lineup_incidence(lineups, pool)
+    return np.bincount(
+        rows,
+        weights=np.asarray(points, dtype=np.float64)[columns],
+        minlength=n,
+    )
+
+
+def rank_against_field(scores: np.ndarray, field: np.ndarray):
+    '''
+    Returns (rank, percentile) of each score in a field of scores:
+    rank 1 is first, ties share the best rank, and percentile is
+    the share of the field scoring strictly lower, from 0 to 100.
+    '''
+    field = np.sort(np.asarray(field, dtype=np.float64))
+    scores = np.asarray(scores, dtype=np.float64)
+    if not len(field):
+        return np.ones(len(scores), dtype=np.int64), np.zeros(len(scores))
+
+    below = np.searchsorted(field, scores, side='left')
+    not_above = np.searchsorted(field, scores, side='right')
+    rank = len(field) - not_above + 1
+    return rank.astype(np.int64), 100.0 * below / len(field)
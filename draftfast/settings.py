@@ -51,7 +51,8 @@ class OptimizerSettings(object):
                  no_defense_against_captain=False,
                  showdown_teams=None,
                  lineup_settings=None,
-                 min_teams=2):
+                 min_teams=2,
+                 use_slots=False):
         self.stacks = stacks
         self.existing_rosters = existing_rosters or []
         self.force_combo = force_combo
@@ -62,6 +63,7 @@ class OptimizerSettings(object):
         self.showdown_teams = showdown_teams
         self.lineup_settings = lineup_settings or []
         self.min_teams = min_teams
+        self.use_slots = use_slots
 
     # TODO: format this like a proper repr(), i.e. <OptimizerSettings: ...>
     def __repr__(self):
@@ -88,6 +90,9 @@ class OptimizerSettings(object):
         if self.lineup_settings:
             lines.append('Custom Lineup Settings: {}'.format(self.lineup_settings))
 
+        if self.use_slots:
+            lines.append('Slot formulation: {}'.format(self.use_slots))
+
         if len(lines):
             return '\n'.join(lines)
         else:
@@ -0,0 +1,151 @@
+import os
+import json
+import struct
+import tempfile
+import numpy as np
+from draftfast.columnar import (
+    ColumnarPool,
+    STRING_FIELDS,
+    FLOAT_FIELDS,
+    ID_FIELDS,
+)
+from draftfast.games import GameTable
+
+MAGIC = b'DFPOOL1\n'
+ALIGNMENT = 64
+
+# string columns are stored as int32 codes into a per-column table
+MISSING_CODE = -1
+
+
+def write_pool(pool: ColumnarPool, path: str) -> str:
+    '''
+    Writes a pool to a single file that workers can attach with
+    attach_pool instead of unpickling their own copy. Numeric
+    columns are stored raw; string columns as int32 codes plus
+    their distinct values. On Linux, a path under /dev/shm keeps
+    the file in shared memory.
+    '''
+    size = len(pool)
+    blocks = []
+    header = {
+        'size': size,
+        'columns': {},
+        'strings': {},
+        'game_table': pool.game_table.to_dict()
+        if pool.game_table is not None else None,
+    }
+
+    offset = 0
+    for field in FLOAT_FIELDS + ID_FIELDS:
+        array = np.ascontiguousarray(getattr(pool, field))
+        header['columns'][field] = {
+            'dtype': array.dtype.str,
+            'offset': offset,
+        }
+        blocks.append(array)
+        offset = _aligned(offset + array.nbytes)
+
+    for field in STRING_FIELDS:
+        values, codes = _encode_strings(getattr(pool, field))
+        header['strings'][field] = {
+            'values': values,
+            'offset': offset,
+        }
+        blocks.append(codes)
+        offset = _aligned(offset + codes.nbytes)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            for block, block_offset in zip(blocks, _offsets(header)):
+                f.seek(data_start + block_offset)
+                f.write(block.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def attach_pool(path: str) -> ColumnarPool:
+    '''
+    Maps a file written by write_pool read-only. Numeric columns
+    are views of the mapping, so every attached process shares the
+    same pages; only the distinct string values are decoded.
+    '''
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not a draftfast pool file'.format(path))
+        header_size, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+
+    size = header['size']
+    data_start = _aligned(len(MAGIC) + 8 + header_size)
+    buffer = np.memmap(path, mode='r', dtype=np.uint8)
+
+    def view(offset, dtype):
+        dtype = np.dtype(dtype)
+        start = data_start + offset
+        return buffer[start:start + size * dtype.itemsize].view(dtype)
+
+    columns = {}
+    for field, column in header['columns'].items():
+        columns[field] = view(column['offset'], column['dtype'])
+    for field, column in header['strings'].items():
+        codes = view(column['offset'], np.int32)
+        columns[field] = _decode_strings(column['values'], codes)
+
+    game_table = None
+    if header['game_table'] is not None:
+        game_table = GameTable.from_dict(header['game_table'])
+
+    return ColumnarPool(game_table=game_table, **columns)
+
+
+def _encode_strings(values):
+    table = {}
+    distinct = []
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = MISSING_CODE
+            continue
+        code = table.get(value)
+        if code is None:
+            code = len(distinct)
+            table[value] = code
+            distinct.append(value)
+        codes[i] = code
+    return distinct, codes
+
+
+def _decode_strings(values: list, codes: np.ndarray) -> np.ndarray:
+    lookup = np.empty(len(values) + 1, dtype=object)
+    lookup[:-1] = values
+    lookup[-1] = None  # MISSING_CODE indexes the last entry
+    return lookup[codes]
+
+
+def _offsets(header: dict) -> list:
+    return [
+        header['columns'][field]['offset']
+        for field in FLOAT_FIELDS + ID_FIELDS
+    ] + [
+        header['strings'][field]['offset']
+        for field in STRING_FIELDS
+    ]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -1,13 +1,19 @@
+from typing import List
 from draftfast.orm import Player
-from copy import deepcopy
+from draftfast.rules import DRAFT_KINGS, FAN_DUEL
+
+# DraftKings captains cost and score 1.5x, FanDuel MVPs only score 1.5x
+CAPTAIN_MULTIPLIERS = {
+    DRAFT_KINGS: {'cost': 1.5, 'proj': 1.5},
+    FAN_DUEL: {'cost': 1, 'proj': 1.5},
+}
 
 
 class ShowdownPlayer(Player):
     def __init__(self, player: Player, captain: bool = False):
-        for k, v in player.__dict__.items():
-            if hasattr(self, k) or k.startswith('__'):
-                continue
-            setattr(self, k, deepcopy(v))
+        # Player fields are immutable values, so they are shared with
+        # the source player rather than copied
+        self.__dict__.update(player.__dict__)
 
         if captain:
             self.real_pos = self.pos
@@ -27,3 +33,27 @@ class ShowdownPlayer(Player):
         if self.pos == 'CPT':
             return self.proj / 1.5 - self.average_score
         return self.proj - self.average_score
+
+
+def generate_showdown_pool(
+    players: List[Player],
+    site: str = DRAFT_KINGS,
+) -> List[ShowdownPlayer]:
+    '''
+    Builds the FLEX and captain (CPT / MVP) variant of every player
+    in a single pass, applying the site's captain multipliers.
+    FLEX players come first, followed by captains in the same order.
+    '''
+    multipliers = CAPTAIN_MULTIPLIERS[site]
+    cost_multiplier = multipliers['cost']
+    proj_multiplier = multipliers['proj']
+
+    flex = [ShowdownPlayer(p) for p in players]
+    captains = []
+    for p in players:
+        captain = ShowdownPlayer(p, captain=True)
+        captain.cost = p.cost * cost_multiplier
+        captain.proj = p.proj * proj_multiplier
+        captains.append(captain)
+
+    return flex + captains
@@ -0,0 +1,206 @@
+'''
+Monte Carlo evaluation of lineups. Each simulation draws a fantasy
+score for every pool player around its projection, correlated
+within teams and games, and every lineup is scored against the same
+draws.
+'''
+from collections import OrderedDict
+import numpy as np
+from draftfast.orm import Roster
+from draftfast.columnar import ColumnarPool, MISSING_ID
+from draftfast.lineup_store import PoolLookup
+
+NORMAL = 'normal'
+LOGNORMAL = 'lognormal'
+
+DISTRIBUTIONS = (NORMAL, LOGNORMAL)
+
+# standard deviation as a share of projection
+DEFAULT_CV = 0.35
+
+
+class Simulator(object):
+    '''
+    Draws (simulations x players) score samples for a pool.
+
+    Scores have mean proj and standard deviation proj * cv, with cv
+    taken from position_cv by position (default_cv otherwise), and
+    follow a normal or lognormal distribution. Players on the same
+    team have correlation team_corr, players in the same game
+    game_corr; correlation, a (players x players) matrix, replaces
+    both.
+    '''
+
+    def __init__(self, pool, position_cv: dict = None,
+                 default_cv: float = DEFAULT_CV, team_corr: float = 0.2,
+                 game_corr: float = 0.05, correlation: np.ndarray = None,
+                 distribution: str = NORMAL):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                'Unknown distribution {}, expected one of {}'.format(
+                    distribution,
+                    ', '.join(DISTRIBUTIONS),
+                )
+            )
+        if not 0 <= game_corr <= team_corr < 1:
+            raise ValueError(
+                'Correlations must satisfy 0 <= game_corr <= team_corr < 1'
+            )
+
+        if not isinstance(pool, ColumnarPool):
+            pool = ColumnarPool.from_players(pool)
+        self.pool = pool
+        self.distribution = distribution
+        self.team_corr = team_corr
+        self.game_corr = game_corr
+        self._lookup = None
+
+        position_cv = position_cv or {}
+        self.cv = np.array([
+            _position_cv(pos, position_cv, default_cv) for pos in pool.pos
+        ], dtype=np.float64)
+        self.mean = np.maximum(pool.proj, 0)
+
+        self.cholesky = None
+        if correlation is not None:
+            self.cholesky = _cholesky(np.asarray(correlation, dtype=float))
+
+    def __len__(self):
+        return len(self.pool)
+
+    def sample(self, n_sims: int, seed=None) -> np.ndarray:
+        '''(n_sims x players) float32 score samples'''
+        rng = np.random.RandomState(seed)
+        z = self._standard_normals(rng, n_sims)
+        sd = self.mean * self.cv
+
+        if self.distribution == LOGNORMAL:
+            sigma = np.sqrt(np.log1p(self.cv ** 2))
+            with np.errstate(divide='ignore'):
+                mu = np.log(self.mean) - sigma ** 2 / 2
+            z *= sigma
+            z += mu
+            samples = np.exp(z)
+        else:
+            z *= sd
+            z += self.mean
+            samples = z
+        return samples.astype(np.float32)
+
+    def lineup_indexes(self, lineups) -> np.ndarray:
+        '''
+        (lineups x roster size) pool indexes for Rosters or index
+        lists, padded with len(pool) for shorter lineups.
+        '''
+        rows = []
+        for lineup in lineups:
+            if isinstance(lineup, Roster):
+                if self._lookup is None:
+                    self._lookup = PoolLookup(self.pool)
+                lineup = [self._lookup.index_of(p) for p in lineup.players]
+            rows.append(list(lineup))
+
+        width = max([len(r) for r in rows] or [0])
+        indexes = np.full((len(rows), width), len(self), dtype=np.int64)
+        for i, row in enumerate(rows):
+            indexes[i, :len(row)] = row
+        return indexes
+
+    def score(self, lineups, n_sims: int = 10000,
+              percentiles=(5, 25, 50, 75, 95), thresholds=(),
+              chunk_size: int = 500, seed=None) -> dict:
+        '''
+        Scores every lineup against the same n_sims draws. Returns
+        mean, std, percentiles ({q: array}) and beat ({threshold:
+        share of simulations above it}) per lineup. Lineups are
+        scored chunk_size at a time, so memory is bounded by the
+        (n_sims x players) samples plus one (chunk x n_sims) block.
+        '''
+        indexes = self.lineup_indexes(lineups)
+        samples = self.sample(n_sims, seed)
+
+        # players x sims, plus a zero row for padding
+        by_player = np.zeros((len(self) + 1, n_sims), dtype=np.float32)
+        by_player[:-1] = samples.T
+        del samples
+
+        n = len(indexes)
+        result = {
+            'mean': np.zeros(n),
+            'std': np.zeros(n),
+            'percentiles': OrderedDict(
+                (q, np.zeros(n)) for q in percentiles
+            ),
+            'beat': OrderedDict((t, np.zeros(n)) for t in thresholds),
+        }
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            scores = lineup_scores(by_player, indexes[start:stop])
+
+            result['mean'][start:stop] = scores.mean(axis=1)
+            result['std'][start:stop] = scores.std(axis=1)
+            if percentiles:
+                values = np.percentile(scores, list(percentiles), axis=1)
+                for q, value in zip(percentiles, values):
+                    result['percentiles'][q][start:stop] = value
+            for t in thresholds:
+                result['beat'][t][start:stop] = (scores > t).mean(axis=1)
+        return result
+
+    def _standard_normals(self, rng, n_sims: int) -> np.ndarray:
+        size = len(self)
+        if self.cholesky is not None:
+            return rng.standard_normal((n_sims, size)).dot(self.cholesky.T)
+
+        # one factor per game and per team, plus each player's own
+        games = _factor_ids(self.pool.game_id)
+        teams = _factor_ids(self.pool.team_id)
+        z = rng.standard_normal((n_sims, size))
+        z *= np.sqrt(1 - self.team_corr)
+        if self.team_corr > self.game_corr:
+            team_factors = rng.standard_normal((n_sims, teams.max() + 1))
+            z += np.sqrt(self.team_corr - self.game_corr) * \
+                team_factors[:, teams]
+        if self.game_corr:
+            game_factors = rng.standard_normal((n_sims, games.max() + 1))
+            z += np.sqrt(self.game_corr) * game_factors[:, games]
+        return z
+
+
+def lineup_scores(by_player: np.ndarray, indexes: np.ndarray) -> np.ndarray:
+    '''
+    (lineups x sims) lineup totals from (players x sims) scores:
+    the incidence product A S^T, summed one roster slot at a time.
+    '''
+    scores = by_player[indexes[:, 0]].copy() if indexes.shape[1] else \
+        np.zeros((len(indexes), by_player.shape[1]), dtype=np.float32)
+    for slot in range(1, indexes.shape[1]):
+        scores += by_player[indexes[:, slot]]
+    return scores
+
+
+def _position_cv(pos: str, position_cv: dict, default_cv: float) -> float:
+    for p in (pos or '').split('/'):
+        if p in position_cv:
+            return position_cv[p]
+    return default_cv
+
+
+def _factor_ids(ids: np.ndarray) -> np.ndarray:
+    # players without a team / game get a factor of their own
+    ids = np.array(ids, dtype=np.int64)
+    missing = ids == MISSING_ID
+    ids[missing] = ids.max(initial=-1) + 1 + np.arange(missing.sum())
+    return ids
+
+
+def _cholesky(correlation: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        # clip negative eigenvalues to get the nearest usable matrix
+        values, vectors = np.linalg.eigh(correlation)
+        values = np.maximum(values, 1e-8)
+        fixed = (vectors * values).dot(vectors.T)
+        scale = np.sqrt(np.diag(fixed))
+        return np.linalg.cholesky(fixed / np.outer(scale, scale))
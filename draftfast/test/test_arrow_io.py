@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from unittest import SkipTest
+from nose import tools as ntools
+from draftfast import rules
+from draftfast.optimize import run
+from draftfast.csv_parse import salary_download
+
+try:
+    import pyarrow
+    from draftfast import arrow_io
+except ImportError:
+    pyarrow = None
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salaries = '{}/data/dk-nba-salaries.csv'.format(CURRENT_DIR)
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise SkipTest('pyarrow is not installed')
+
+
+def _csv_pool():
+    return salary_download.generate_columnar_pool(
+        salary_file_location=salaries,
+        game=rules.DRAFT_KINGS,
+    )
+
+
+def test_pool_from_arrow():
+    _require_pyarrow()
+    csv_pool = _csv_pool()
+    table = pyarrow.table({
+        'Name': list(csv_pool.name),
+        'pos': list(csv_pool.pos),
+        'Salary': pyarrow.array(csv_pool.cost.astype(int)),
+        'proj': csv_pool.proj,
+        'team': list(csv_pool.team),
+        'matchup': list(csv_pool.matchup),
+    })
+    pool = arrow_io.pool_from_arrow(table, column_map={
+        'name': 'Name',
+        'cost': 'Salary',
+    })
+    ntools.assert_equal(len(pool), len(csv_pool))
+    ntools.assert_equal(list(pool.name), list(csv_pool.name))
+    ntools.assert_equal(list(pool.cost), list(csv_pool.cost))
+    ntools.assert_equal(list(pool.game_id), list(csv_pool.game_id))
+    ntools.assert_equal(list(pool.opp_id), list(csv_pool.opp_id))
+
+
+def test_parquet_round_trip():
+    _require_pyarrow()
+    players = _csv_pool().to_players()
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+    )
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        lineups_file = os.path.join(out_dir, 'lineups.parquet')
+        arrow_io.write_lineups_parquet([roster], lineups_file)
+        pool = arrow_io.read_pool_parquet(lineups_file)
+        ntools.assert_equal(
+            list(pool.name),
+            [p.name for p in roster.sorted_players()],
+        )
+        ntools.assert_almost_equal(pool.proj.sum(), roster.projected())
+
+        exposure_file = os.path.join(out_dir, 'exposure.parquet')
+        arrow_io.write_exposure_parquet(
+            [roster, roster],
+            exposure_file,
+            bounds=[{'name': roster.players[0].name, 'min': 0, 'max': 0.5}],
+        )
+        exposure = pyarrow.parquet.read_table(exposure_file).to_pydict()
+        ntools.assert_equal(exposure['lineups'], [2] * 8)
+        ntools.assert_equal(exposure['exposure'], [1.0] * 8)
+        ntools.assert_equal(exposure['max'].count(0.5), 1)
+    finally:
+        shutil.rmtree(out_dir)
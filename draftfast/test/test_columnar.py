@@ -0,0 +1,45 @@
+from nose import tools as ntools
+from draftfast.columnar import ColumnarPool, MISSING_ID
+from draftfast.orm import Player
+
+
+def _players():
+    return [
+        Player(name='A', cost=5000, proj=20, pos='QB', team='X',
+               matchup='X@Y'),
+        Player(name='B', cost=4000, proj=10, pos='DST', team='Y',
+               matchup='X@Y'),
+        Player(name='C', cost=3000, proj=5, pos='WR'),
+    ]
+
+
+def test_columnar_round_trip():
+    players = _players()
+    pool = ColumnarPool.from_players(players)
+
+    ntools.assert_equal(len(pool), 3)
+    ntools.assert_equal(list(pool.cost), [5000, 4000, 3000])
+    ntools.assert_equal(pool.opp_id[0], pool.team_id[1])
+    ntools.assert_equal(pool.game_id[2], MISSING_ID)
+
+    round_trip = pool.to_players()
+    ntools.assert_equal(round_trip, players)
+    ntools.assert_equal(round_trip[0].proj, 20)
+    ntools.assert_true(round_trip[1].is_home)
+    ntools.assert_equal(round_trip[2].game_id, None)
+
+
+def test_columnar_lookup():
+    pool = ColumnarPool.from_players(_players())
+    ntools.assert_equal(pool.index_of('B DST Y'), 1)
+    ntools.assert_equal(pool.index_of('Z QB X'), None)
+    ntools.assert_equal(pool.indexes_of_name('C'), [2])
+
+    subset = pool.take([2, 0])
+    ntools.assert_equal(list(subset.name), ['C', 'A'])
+    ntools.assert_equal(subset.proj[1], 20)
+
+
+@ntools.raises(ValueError)
+def test_columnar_length_mismatch():
+    ColumnarPool(name=['A', 'B'], cost=[1])
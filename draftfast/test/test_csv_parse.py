@@ -1,7 +1,15 @@
+import csv
 import os
+import shutil
+import tempfile
 from nose import tools as ntools
-from draftfast.csv_parse import salary_download
+from draftfast.csv_parse import salary_download, pid_index
+from draftfast import dke_exceptions as dke
+from draftfast import rules
 from draftfast.rules import DRAFT_KINGS
+from draftfast.optimize import run
+from draftfast.settings import OptimizerSettings
+from draftfast.showdown.orm import ShowdownPlayer
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 salaries = '{}/data/nba-test-salaries.csv'.format(CURRENT_DIR)
@@ -31,3 +39,155 @@ def test_dk_nba_use_proj():
         game=DRAFT_KINGS,
     )
     ntools.assert_equals(players[0].proj, 62.29)
+
+
+def test_dk_nba_parse_cache():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        kwargs = dict(
+            salary_file_location=salaries,
+            projection_file_location=projections,
+            game=DRAFT_KINGS,
+            cache_dir=cache_dir,
+        )
+        players = salary_download.generate_players_from_csvs(**kwargs)
+        ntools.assert_equal(len(os.listdir(cache_dir)), 1)
+
+        cached = salary_download.generate_players_from_csvs(**kwargs)
+        ntools.assert_equal(len(os.listdir(cache_dir)), 1)
+        ntools.assert_equal(cached, players)
+        ntools.assert_equal(cached[0].proj, 62.29)
+
+        salary_download.generate_players_from_csvs(
+            salary_file_location=salaries,
+            game=DRAFT_KINGS,
+            cache_dir=cache_dir,
+        )
+        ntools.assert_equal(len(os.listdir(cache_dir)), 2)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_dk_nba_iter_players():
+    players = salary_download.iter_players_from_csv(
+        salary_file_location=salaries,
+        game=DRAFT_KINGS,
+    )
+    first = next(players)
+    ntools.assert_equal(first.proj, 60.462)
+    ntools.assert_equal(len(list(players)), 220)
+
+
+def test_dk_nba_generate_player():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        game=DRAFT_KINGS,
+    )
+    with open(salaries) as f:
+        row = next(csv.DictReader(f))
+
+    player = salary_download.generate_player(players[0].pos, row, DRAFT_KINGS)
+    ntools.assert_equal(player, players[0])
+    ntools.assert_equal(player.matchup, players[0].matchup)
+    ntools.assert_equal(player.average_score, players[0].average_score)
+
+
+def test_dk_nba_columnar_pool():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        projection_file_location=projections,
+        game=DRAFT_KINGS,
+    )
+    pool = salary_download.generate_columnar_pool(
+        salary_file_location=salaries,
+        projection_file_location=projections,
+        game=DRAFT_KINGS,
+    )
+    ntools.assert_equal(len(pool), 221)
+    ntools.assert_equal(list(pool.name), [p.name for p in players])
+    ntools.assert_equal(list(pool.pos), [p.pos for p in players])
+    ntools.assert_equal(list(pool.cost), [p.cost for p in players])
+    ntools.assert_equal(pool.proj[0], 62.29)
+    ntools.assert_equal(pool.to_players(), players)
+
+
+def test_dk_nfl_showdown_columnar_pool():
+    salary_file = '{}/data/dk-nfl-showdown-salaries.csv'.format(CURRENT_DIR)
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salary_file,
+        game=DRAFT_KINGS,
+        ruleset=rules.DK_NFL_SHOWDOWN_RULE_SET,
+    )
+    pool = salary_download.generate_columnar_pool(
+        salary_file_location=salary_file,
+        game=DRAFT_KINGS,
+        ruleset=rules.DK_NFL_SHOWDOWN_RULE_SET,
+    )
+    pool_players = pool.to_players()
+    ntools.assert_true(all(
+        isinstance(p, ShowdownPlayer) for p in pool_players
+    ))
+    ntools.assert_equal(
+        [(p.pos, p.real_pos, p.captain) for p in pool_players],
+        [(p.pos, p.real_pos, p.captain) for p in players],
+    )
+
+    roster = run(
+        rule_set=rules.DK_NFL_SHOWDOWN_RULE_SET,
+        player_pool=pool_players,
+        optimizer_settings=OptimizerSettings(
+            no_defense_against_captain=True,
+        ),
+    )
+    ntools.assert_not_equal(roster, None)
+
+
+def test_dk_showdown_captain_ids():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location='{}/data/dk-nfl-showdown-salaries.csv'.format(
+            CURRENT_DIR
+        ),
+        pid_file='{}/data/dk-nfl-showdown-pids.csv'.format(CURRENT_DIR),
+        game=DRAFT_KINGS,
+        ruleset=rules.DK_NFL_SHOWDOWN_RULE_SET,
+    )
+    ids = {
+        p.pos: p.player_id for p in players if p.name == 'DeAndre Hopkins'
+    }
+    ntools.assert_equal(ids, {'CPT': '11896030', 'FLEX': '11895994'})
+
+
+@ntools.raises(ValueError)
+def test_columnar_pool_rejects_pickem():
+    salary_download.generate_columnar_pool(
+        salary_file_location='{}/data/dk-nba-pickem-salaries.csv'.format(
+            CURRENT_DIR
+        ),
+        game=DRAFT_KINGS,
+        ruleset=rules.DK_NBA_PICKEM_RULE_SET,
+    )
+
+
+def test_dk_nba_parse_with_pids():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location='{}/data/dk-nba-salaries.csv'.format(
+            CURRENT_DIR
+        ),
+        pid_file='{}/data/dk-nba-pids.csv'.format(CURRENT_DIR),
+        game=DRAFT_KINGS,
+    )
+    pid_map = pid_index.build_pid_index(
+        '{}/data/dk-nba-pids.csv'.format(CURRENT_DIR),
+    )
+    ntools.assert_equal(len(pid_map), 233)
+    for p in players:
+        ntools.assert_equal(p.player_id, p.get_player_id(pid_map))
+        ntools.assert_equal(
+            p.player_id,
+            pid_map['{} {}'.format(p.name, p.possible_positions)],
+        )
+
+
+@ntools.raises(dke.InvalidCSVUploadFileException)
+def test_pid_index_requires_template():
+    pid_index.build_pid_index(salaries)
@@ -207,7 +207,7 @@ def test_dk_nfl_showdown_upload():
     assert_equal(
         row,
         [
-            '11896024',
+            '11896060',
             '11895994',
             '11895995',
             '11895996',
@@ -227,7 +227,7 @@ def test_dk_nba_showdown_upload():
     assert_equal(
         row,
         [
-            '11915867',
+            '11915899',
             '11915844',
             '11915845',
             '11915846',
@@ -247,7 +247,7 @@ def test_dk_mlb_showdown_upload():
     assert_equal(
         row,
         [
-            '12895602',
+            '12895729',
             '12895494',
             '12895495',
             '12895496',
@@ -257,6 +257,80 @@ def test_dk_mlb_showdown_upload():
     )
 
 
+def test_dk_nba_streaming_upload():
+    players = salary_download.generate_players_from_csvs(
+        game=rules.DRAFT_KINGS,
+        salary_file_location='{}/data/dk-nba-salaries.csv'.format(CURRENT_DIR),
+        ruleset=rules.DK_NBA_RULE_SET,
+    )
+    upload_file = '{}/data/current-upload.csv'.format(CURRENT_DIR)
+    uploader = uploaders.DraftKingsNBAUploader(
+        pid_file='{}/data/dk-nba-pids.csv'.format(CURRENT_DIR),
+        upload_file=upload_file,
+    )
+
+    class CheckingWriter(object):
+        written = 0
+
+        def write_roster(self, roster):
+            uploader.write_roster(roster)
+            self.written += 1
+
+            # rows are readable while the run continues
+            with open(upload_file, 'r') as csvfile:
+                rows = list(csv.reader(csvfile))
+            assert_equal(rows[0], uploader.HEADERS)
+            assert_equal(len(rows), self.written + 1)
+
+    writer = CheckingWriter()
+    with uploader:
+        rosters, _ = optimize.run_multi(
+            iterations=3,
+            rule_set=rules.DK_NBA_RULE_SET,
+            player_pool=players,
+            roster_writer=writer,
+        )
+    assert_equal(writer.written, len(rosters))
+    assert_equal(uploader.is_open, False)
+    uploader.close()
+
+
+def test_dk_nba_upload_after_close():
+    players = salary_download.generate_players_from_csvs(
+        game=rules.DRAFT_KINGS,
+        salary_file_location='{}/data/dk-nba-salaries.csv'.format(CURRENT_DIR),
+        ruleset=rules.DK_NBA_RULE_SET,
+    )
+    rosters, _ = optimize.run_multi(
+        iterations=3,
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+    )
+    upload_file = '{}/data/current-upload.csv'.format(CURRENT_DIR)
+    uploader = uploaders.DraftKingsNBAUploader(
+        pid_file='{}/data/dk-nba-pids.csv'.format(CURRENT_DIR),
+        upload_file=upload_file,
+    )
+
+    uploader.write_roster(rosters[0])
+    uploader.close()
+    uploader.write_roster(rosters[1])
+    uploader.write_rosters(rosters[2:])
+    uploader.close()
+
+    with open(upload_file, 'r') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert_equal(rows[0], uploader.HEADERS)
+    assert_equal(len(rows), len(rosters) + 1)
+    assert_equal(rows.count(uploader.HEADERS), 1)
+
+    uploader.write_rosters(rosters[:1])
+    with open(upload_file, 'r') as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert_equal(rows[0], uploader.HEADERS)
+    assert_equal(len(rows), 2)
+
+
 def _get_first_written_row(
         game: str,
         salary_file_location: str,
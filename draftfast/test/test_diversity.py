@@ -0,0 +1,67 @@
+from itertools import combinations
+import numpy as np
+from nose import tools as ntools
+from draftfast.orm import Player, NBARoster
+from draftfast.diversity import LineupBits, diversity_report, popcount
+
+LINEUPS = [
+    [0, 1, 2],
+    [0, 1, 70],
+    [3, 4, 5],
+    [0, 1, 2],
+    [2, 70, 129],
+]
+
+
+def test_popcount():
+    words = np.array([0, 1, 3, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64)
+    ntools.assert_equal(popcount(words).tolist(), [0, 1, 2, 1, 64])
+
+
+def test_overlap():
+    bits = LineupBits.from_indexes(LINEUPS, 130)
+    ntools.assert_equal(bits.words.shape, (5, 3))
+    ntools.assert_equal(bits.sizes().tolist(), [3, 3, 3, 3, 3])
+    ntools.assert_equal(bits.overlap([0], [1, 2, 3, 4]).tolist(),
+                        [[2, 0, 3, 1]])
+
+    expected = [0] * 4
+    for a, b in combinations(LINEUPS, 2):
+        expected[len(set(a) & set(b))] += 1
+    ntools.assert_equal(bits.overlap_histogram(chunk_size=2).tolist(),
+                        expected)
+
+
+def test_nearest_neighbours_and_clusters():
+    bits = LineupBits.from_indexes(LINEUPS, 130)
+    best, neighbour = bits.nearest_neighbours(chunk_size=2)
+    ntools.assert_equal(best.tolist(), [3, 2, 0, 3, 1])
+    ntools.assert_equal(neighbour.tolist(), [3, 0, 0, 0, 0])
+    ntools.assert_equal(bits.cluster(2).tolist(), [0, 0, 2, 0, 4])
+
+    report = diversity_report(bits)
+    ntools.assert_equal(report['duplicates'], 2)
+    ntools.assert_equal(report['max_nearest_overlap'], 3)
+
+    report = diversity_report(LineupBits.from_indexes(LINEUPS[:1], 130))
+    ntools.assert_equal(report['mean_nearest_overlap'], None)
+    ntools.assert_equal(report['max_nearest_overlap'], None)
+    ntools.assert_equal(report['duplicates'], 0)
+
+
+def test_from_rosters():
+    pool = [
+        Player(name='A Player', cost=1, proj=1, pos='PG'),
+        Player(name='B Player', cost=1, proj=1, pos='SG'),
+        Player(name='C Player', cost=1, proj=1, pos='SF'),
+    ]
+    rosters = []
+    for players in [pool[:2], pool[1:]]:
+        roster = NBARoster()
+        for p in players:
+            roster.add_player(p)
+        rosters.append(roster)
+
+    bits = LineupBits.from_rosters(rosters, pool)
+    ntools.assert_equal(bits.overlap(slice(0, 1), slice(1, 2)).tolist(),
+                        [[1]])
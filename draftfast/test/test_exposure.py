@@ -1,8 +1,22 @@
 import os
+import random
 from nose import tools as ntools
-from draftfast.optimize import run_multi
+from draftfast.optimize import run, run_multi
 from draftfast import rules
 from draftfast.csv_parse import salary_download
+from draftfast.orm import Player, NBARoster
+from draftfast.settings import OptimizerSettings
+from draftfast.lineup_constraints import LineupConstraints
+from draftfast.exposure import (
+    ExposureSummary,
+    LagrangianExposure,
+    LockSampler,
+    check_exposure,
+    get_co_exposure,
+    get_exposure_args_random,
+    get_exposure_incidence,
+    get_exposure_matrix,
+)
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 salary_file = '{}/data/dk-nfl-salaries.csv'.format(CURRENT_DIR)
@@ -53,3 +67,235 @@ def test_random_exposure_limits():
     )
     ntools.assert_equal(len(rosters), iterations)
     ntools.assert_equal(len(exposure_diffs), 0)
+
+
+def test_soft_exposure_limits():
+    iterations = 10
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salary_file,
+        projection_file_location=projection_file,
+        game=rules.DRAFT_KINGS,
+    )
+    bounds = [
+        {'name': 'Andrew Luck', 'min': 0.3, 'max': 0.5},
+        {'name': 'Alshon Jeffery', 'min': 0.6, 'max': 0.8},
+        {'name': 'Mike Evans', 'min': 0.4, 'max': 0.6},
+    ]
+    rosters, _ = run_multi(
+        iterations=iterations,
+        rule_set=rules.DK_NFL_RULE_SET,
+        player_pool=players,
+        optimizer_settings=OptimizerSettings(),
+        exposure_bounds=bounds,
+        lowest_salary=0,
+        soft_exposure=True,
+    )
+    ntools.assert_equal(len(rosters), iterations)
+    ntools.assert_equal(check_exposure(rosters, bounds), {})
+
+
+def test_lagrangian_multipliers():
+    pool, rosters = _mock_rosters()
+    engine = LagrangianExposure(
+        [
+            {'name': 'A Player', 'min': 0, 'max': 0.5},
+            {'name': 'C Player', 'min': 1, 'max': 1},
+        ],
+        n=4,
+        player_pool=pool,
+        step=10,
+    )
+    args = engine.get_exposure_args(
+        [rosters[0], rosters[2]],
+        LineupConstraints(),
+    )
+
+    # A in both lineups, C in one: A is pushed out and C in
+    ntools.assert_equal(args['adjustments'], {
+        'A Player': -5.0,
+        'C Player': 5.0,
+    })
+    ntools.assert_equal(args['banned'], ['A Player'])
+
+    # C must be in both remaining lineups to reach its min
+    ntools.assert_equal(args['locked'], ['C Player'])
+
+
+def _mock_nfl_pool():
+    pool = [
+        Player(name='QB 1', cost=8000, proj=20, pos='QB'),
+        Player(name='QB 2', cost=7000, proj=18, pos='QB'),
+        Player(name='TE 1', cost=3000, proj=8, pos='TE'),
+        Player(name='DST 1', cost=2000, proj=5, pos='DST'),
+    ]
+    for i in range(6):
+        pool.append(Player(name='RB {}'.format(i), cost=9000 - i * 1000,
+                           proj=15, pos='RB'))
+        pool.append(Player(name='WR {}'.format(i), cost=9000 - i * 1000,
+                           proj=15, pos='WR'))
+    return pool
+
+
+def test_lock_sampler():
+    sampler = LockSampler(_mock_nfl_pool(), rules.DK_NFL_RULE_SET)
+    ntools.assert_true(sampler.is_feasible(['QB 1', 'WR 0', 'RB 0']))
+
+    # one QB slot, and three RBs fill both RB slots and the FLEX
+    ntools.assert_false(sampler.is_feasible(['QB 1', 'QB 2']))
+    ntools.assert_true(sampler.is_feasible(['RB 3', 'RB 4', 'RB 5']))
+    ntools.assert_false(sampler.is_feasible(['RB 3', 'RB 4', 'RB 5', 'TE 1',
+                                             'WR 3', 'WR 4', 'WR 5',
+                                             'WR 2']))
+
+    # too expensive to fill out under the cap
+    ntools.assert_false(sampler.is_feasible(['WR 0', 'WR 1', 'RB 0', 'RB 1']))
+    ntools.assert_false(sampler.is_feasible(['Nobody']))
+
+    constraints = LineupConstraints()
+    constraints.lock('QB 1')
+    sampler = LockSampler(_mock_nfl_pool(), rules.DK_NFL_RULE_SET,
+                          constraints)
+    ntools.assert_false(sampler.is_feasible(['QB 2']))
+
+
+def test_lock_sampler_fills_eligible_slots():
+    pool = _mock_nfl_pool() + [
+        Player(name='K {}'.format(i), cost=100, proj=0, pos='K')
+        for i in range(9)
+    ]
+    sampler = LockSampler(pool, rules.DK_NFL_RULE_SET)
+
+    # the cheapest names cannot fill any slot
+    ntools.assert_equal(
+        sampler.min_cost(['QB 1']),
+        8000 + 2000 + 3000 + 4000 + 5000 + 4000 + 5000 + 6000 + 6000,
+    )
+    ntools.assert_false(sampler.is_feasible(['QB 1', 'WR 0', 'RB 0', 'RB 1']))
+
+    # nor can banned players
+    ntools.assert_true(sampler.is_feasible(['QB 2']))
+    ntools.assert_false(sampler.is_feasible(['QB 2'], banned=['DST 1']))
+    ntools.assert_false(sampler.is_feasible(['QB 2'], banned=['QB 2']))
+
+
+def test_random_exposure_small_max():
+    # max * n < 1 still allows one lineup, as in the deterministic policy
+    bounds = [{'name': 'QB 1', 'min': 0, 'max': 0.3}]
+    args = get_exposure_args_random({}, bounds, 3, None)
+    ntools.assert_equal(args['banned'], [])
+    args = get_exposure_args_random({'QB 1': 1}, bounds, 3, None)
+    ntools.assert_equal(args['banned'], ['QB 1'])
+
+
+def test_lagrangian_exposure_small_max():
+    pool, rosters = _mock_rosters()
+    engine = LagrangianExposure(
+        [{'name': 'A Player', 'min': 0, 'max': 0.2}],
+        n=4,
+        player_pool=pool,
+    )
+    args = engine.get_exposure_args([], LineupConstraints())
+    ntools.assert_equal(args['banned'], [])
+    args = engine.get_exposure_args(rosters[:1], LineupConstraints())
+    ntools.assert_equal(args['banned'], ['A Player'])
+
+
+def test_random_exposure_sampling():
+    pool = _mock_nfl_pool()
+    bounds = [{'name': p.name, 'min': 0, 'max': 1} for p in pool]
+    bounds[0]['max'] = 0.5
+    sampler = LockSampler(pool, rules.DK_NFL_RULE_SET)
+    random.seed(1)
+    args = get_exposure_args_random(
+        {'QB 1': 1},
+        bounds,
+        2,
+        None,
+        sampler=sampler,
+    )
+    ntools.assert_equal(args['banned'], ['QB 1'])
+    ntools.assert_true(len(args['locked']) > 1)
+    ntools.assert_true(args['lock_all'])
+    ntools.assert_true(sampler.is_feasible(args['locked']))
+
+
+def test_exposure_locks_one_player_by_default():
+    # only one QB slot, so both locks can only hold with lock_all
+    roster = run(
+        rule_set=rules.DK_NFL_RULE_SET,
+        player_pool=_mock_nfl_pool(),
+        exposure_dict={'locked': ['QB 2', 'QB 1']},
+        lowest_salary=0,
+    )
+    ntools.assert_true('QB 2' in [p.name for p in roster.players])
+    ntools.assert_equal(
+        run(
+            rule_set=rules.DK_NFL_RULE_SET,
+            player_pool=_mock_nfl_pool(),
+            exposure_dict={'locked': ['QB 2', 'QB 1'], 'lock_all': True},
+            lowest_salary=0,
+        ),
+        None,
+    )
+
+
+def _mock_rosters():
+    pool = [
+        Player(name='A Player', cost=1, proj=1, pos='PG'),
+        Player(name='B Player', cost=1, proj=1, pos='SG'),
+        Player(name='C Player', cost=1, proj=1, pos='SF'),
+    ]
+    rosters = []
+    for players in [pool[:2], pool[1:], pool]:
+        roster = NBARoster()
+        for p in players:
+            roster.add_player(p)
+        rosters.append(roster)
+    return pool, rosters
+
+
+def test_co_exposure():
+    pool, rosters = _mock_rosters()
+    players, matrix = get_co_exposure(rosters)
+    ntools.assert_equal([p.name for p in players],
+                        ['A Player', 'B Player', 'C Player'])
+    ntools.assert_equal(matrix.tolist(), [
+        [2, 2, 1],
+        [2, 3, 2],
+        [1, 2, 2],
+    ])
+
+    players, matrix = get_co_exposure(rosters, exclude=[pool[1]])
+    ntools.assert_equal(matrix.tolist(), [[2, 1], [1, 2]])
+
+
+def test_exposure_incidence():
+    _, rosters = _mock_rosters()
+    players, incidence = get_exposure_incidence(rosters)
+    ntools.assert_equal(incidence.shape, (3, 3))
+    ntools.assert_equal(incidence.sum(axis=0).tolist(), [2, 3, 2])
+    ntools.assert_true('| A. Player |' in get_exposure_matrix(rosters))
+
+
+def test_exposure_summary():
+    _, rosters = _mock_rosters()
+    summary = ExposureSummary(rosters, [
+        {'name': 'A Player', 'min': 0.5, 'max': 0.5},
+        {'name': 'B Player', 'min': 0, 'max': 0.5},
+        {'name': 'Nobody', 'min': 1 / 3, 'max': 1},
+    ])
+    ntools.assert_equal(summary.names, ['B Player', 'A Player', 'C Player'])
+    ntools.assert_equal(summary.counts.tolist(), [3, 2, 2])
+    ntools.assert_equal(summary.count('Nobody'), 0)
+    ntools.assert_equal(summary.overages.tolist(), [0.5, 1.5, 0])
+    ntools.assert_equal(summary.deficits.tolist(), [0, 0, 1])
+    ntools.assert_equal(summary.diffs(), {
+        'A Player': 0.5,
+        'B Player': 1.5,
+        'Nobody': -1,
+    })
+    ntools.assert_equal(
+        check_exposure(rosters, [{'name': 'C Player', 'min': 1, 'max': 1}]),
+        {'C Player': -1},
+    )
+    ntools.assert_true('Roster Exposure' in summary.table())
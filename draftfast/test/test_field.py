@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from nose import tools as ntools
+from draftfast import rules
+from draftfast import lineup_store
+from draftfast.field import FieldGenerator
+from draftfast.csv_parse import salary_download
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salaries = '{}/data/dk-nba-salaries.csv'.format(CURRENT_DIR)
+showdown_salaries = '{}/data/dk-nba-showdown-salaries.csv'.format(CURRENT_DIR)
+
+
+def _pool():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        game=rules.DRAFT_KINGS,
+    )
+    for p in players:
+        p.projected_ownership_pct = p.proj / 2
+    return players
+
+
+def _assert_valid(generator, lineups):
+    _, cost = generator.lineup_stats(lineups)
+    ntools.assert_true((cost <= generator.salary_max).all())
+    ntools.assert_true((cost >= generator.min_salary).all())
+
+    names = np.sort(generator.name_ids[lineups], axis=1)
+    ntools.assert_false((names[:, 1:] == names[:, :-1]).any())
+    for slot, players in enumerate(lineups.T):
+        ntools.assert_true(generator.eligible[slot][players].all())
+
+
+def test_generate_field():
+    generator = FieldGenerator(_pool(), rules.DK_NBA_RULE_SET,
+                               min_salary=48000)
+    lineups = generator.generate(2000, seed=1, batch_size=500)
+    ntools.assert_equal(lineups.shape, (2000, 8))
+    _assert_valid(generator, lineups)
+
+    again = generator.generate(2000, seed=1, batch_size=500)
+    ntools.assert_true(np.array_equal(lineups, again))
+
+
+def test_showdown_field():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=showdown_salaries,
+        game=rules.DRAFT_KINGS,
+        ruleset=rules.DK_NBA_SHOWDOWN_RULE_SET,
+    )
+    generator = FieldGenerator(players, rules.DK_NBA_SHOWDOWN_RULE_SET)
+    lineups = generator.generate(500, seed=2)
+    _assert_valid(generator, lineups)
+    ntools.assert_equal(
+        set(generator.pool.pos[lineups[:, 0]].tolist()),
+        {'CPT'},
+    )
+
+
+def test_calibrate():
+    generator = FieldGenerator(_pool(), rules.DK_NBA_RULE_SET,
+                               min_salary=48000)
+    target = np.bincount(generator.name_ids,
+                         weights=generator.ownership) / \
+        np.bincount(generator.name_ids)
+    target = target / target.sum() * 8
+
+    def error():
+        lineups = generator.generate(3000, seed=3)
+        exposure = np.bincount(generator.name_ids[lineups.ravel()],
+                               minlength=generator.n_names) / len(lineups)
+        return np.abs(exposure - target).sum()
+
+    before = error()
+    generator.calibrate(rounds=3, seed=4)
+    ntools.assert_true(error() < before)
+
+
+def test_write_records():
+    players = _pool()
+    generator = FieldGenerator(players, rules.DK_NBA_RULE_SET)
+    lineups = generator.generate(20, seed=5)
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(out_dir, 'field.jsonl')
+        generator.write_jsonl(lineups, path)
+        rosters = lineup_store.load_jsonl(
+            path,
+            players,
+            rule_set=rules.DK_NBA_RULE_SET,
+        )
+        _, cost = generator.lineup_stats(lineups)
+        ntools.assert_equal([r.spent() for r in rosters], cost.tolist())
+
+        path = os.path.join(out_dir, 'field.npz')
+        generator.write_array(lineups, path)
+        rosters = lineup_store.load_array(
+            path,
+            players,
+            rule_set=rules.DK_NBA_RULE_SET,
+        )
+        ntools.assert_equal(len(rosters), 20)
+    finally:
+        shutil.rmtree(out_dir)
+
+
+def test_rule_set_without_slots():
+    with ntools.assert_raises(ValueError):
+        FieldGenerator(_pool(), rules.FD_NBA_SINGLE_GAME_RULE_SET)
+
+
+def test_team_and_game_rules():
+    generator = FieldGenerator(_pool(), rules.DK_NBA_RULE_SET,
+                               min_salary=48000, max_per_team=3)
+    pool = generator.pool
+    one_game = np.flatnonzero(pool.game_id == pool.game_id[0])[:8]
+    two_per_team = np.concatenate([
+        np.flatnonzero(pool.team_id == team)[:2] for team in range(4)
+    ])
+    ntools.assert_equal(
+        generator.meets_team_rules(
+            np.array([one_game, two_per_team])
+        ).tolist(),
+        [False, True],
+    )
+
+    lineups = generator.generate(500, seed=3, batch_size=500)
+    ntools.assert_true(generator.meets_team_rules(lineups).all())
+    for row in pool.team_id[lineups]:
+        ntools.assert_true(np.bincount(row).max() <= 3)
@@ -0,0 +1,76 @@
+import os
+from nose import tools as ntools
+from draftfast.games import parse_matchup, index_games
+from draftfast.orm import Player
+from draftfast.csv_parse import salary_download
+from draftfast.rules import DRAFT_KINGS
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salary_file = '{}/data/dk-nfl-salaries.csv'.format(CURRENT_DIR)
+
+
+def test_parse_matchup():
+    ntools.assert_equal(
+        parse_matchup('TB@Atl 01:00PM ET'),
+        ('TB', 'ATL', '01:00PM ET'),
+    )
+    ntools.assert_equal(
+        parse_matchup('LAC@NO 12/03/2018 08:00PM ET'),
+        ('LAC', 'NO', '12/03/2018 08:00PM ET'),
+    )
+    ntools.assert_equal(parse_matchup('CEL vs LGN'), ('LGN', 'CEL', None))
+    ntools.assert_equal(parse_matchup(None), None)
+    ntools.assert_equal(parse_matchup('Postponed'), None)
+
+
+def test_index_games():
+    players = [
+        Player(name='A', cost=1, pos='QB', team='X', matchup='X@Y'),
+        Player(name='B', cost=1, pos='DST', team='Y', matchup='X@Y'),
+        Player(name='C', cost=1, pos='QB', team='NO', matchup='LAC@NO'),
+        Player(name='D', cost=1, pos='QB', team='Z'),
+    ]
+    table = index_games(players)
+
+    ntools.assert_equal(len(table), 2)
+    a, b, c, d = players
+    ntools.assert_equal(a.game_id, b.game_id)
+    ntools.assert_equal(a.opp_id, b.team_id)
+    ntools.assert_equal(b.opp_id, a.team_id)
+    ntools.assert_equal(table.team_name(c.opp_id), 'LAC')
+    ntools.assert_false(a.is_home)
+    ntools.assert_true(b.is_home)
+    ntools.assert_equal(d.game_id, None)
+    ntools.assert_equal(d.opp_id, None)
+
+
+def test_salary_download_indexes_games():
+    players = salary_download.generate_players_from_csvs(
+        salary_file_location=salary_file,
+        game=DRAFT_KINGS,
+    )
+    for p in players:
+        ntools.assert_not_equal(p.game_id, None)
+        ntools.assert_not_equal(p.opp_id, None)
+        ntools.assert_true(p.is_opposing_team_in_match_up(
+            [x for x in players if x.team_id == p.opp_id][0].team
+        ))
+
+
+def test_is_opposing_team_in_match_up():
+    players = [
+        Player(name='A', cost=1, pos='QB', team='NO', matchup='LAC@NO'),
+        Player(name='B', cost=1, pos='QB', team='LA', matchup='LA@NOLA'),
+        Player(name='C', cost=1, pos='QB', team='Z', matchup='Postponed'),
+    ]
+    a, b, c = players
+    # names used to match as substrings of the matchup
+    ntools.assert_true(a.is_opposing_team_in_match_up('LAC'))
+    ntools.assert_false(a.is_opposing_team_in_match_up('LA'))
+    ntools.assert_false(b.is_opposing_team_in_match_up('NO'))
+    ntools.assert_false(c.is_opposing_team_in_match_up('Z'))
+
+    table = index_games(players)
+    ntools.assert_true(a.is_opposing_team_in_match_up(a.opp_id))
+    ntools.assert_true(b.is_opposing_team_in_match_up('nola', table))
+    ntools.assert_false(b.is_opposing_team_in_match_up(a.team_id))
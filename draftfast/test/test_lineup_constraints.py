@@ -203,3 +203,50 @@ def test_group_ban_conflict():
     lcs = LineupConstraints()
     lcs.add_group_constraint(['Eli Manning', 'Doug Martin'], (1, 2))
     lcs.ban(['Eli Manning'])
+
+
+def test_bulk_constraints():
+    lcs = LineupConstraints()
+    lcs.add_groups([
+        (['A', 'B'], 1),
+        (['B', 'C', 'D'], (1, 2)),
+    ])
+    lcs.ban_many(['E', 'F'])
+    lcs.lock_many(name for name in ['G', 'H'])
+
+    ntools.assert_equal(len(lcs), 6)
+    for c in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
+        ntools.assert_true(c in lcs)
+    ntools.assert_false('I' in lcs)
+    ntools.assert_equal(len(lcs.get_group_constraints('B')), 2)
+    ntools.assert_equal(lcs.get_group_constraints('I'), [])
+
+
+@ntools.raises(ConstraintConflictException)
+def test_bulk_ban_conflict():
+    lcs = LineupConstraints()
+    lcs.add_groups([(['A', 'B'], 1)])
+    lcs.ban_many(['C', 'B'])
+
+
+@ntools.raises(ConstraintConflictException)
+def test_bulk_dup_group_rule():
+    lcs = LineupConstraints()
+    lcs.add_groups([
+        (['A', 'B'], 1),
+        (['B', 'A'], 1),
+    ])
+
+
+def test_bulk_groups_atomic():
+    lcs = LineupConstraints()
+    lcs.lock('C')
+    try:
+        lcs.add_groups([
+            (['A', 'B'], 1),
+            (['B', 'C'], 1),
+        ])
+    except ConstraintConflictException:
+        pass
+    ntools.assert_false('A' in lcs)
+    ntools.assert_false(lcs.has_group_constraints())
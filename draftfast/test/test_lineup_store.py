@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+from nose import tools as ntools
+from draftfast import rules
+from draftfast import lineup_store
+from draftfast.optimize import run, run_multi
+from draftfast.settings import OptimizerSettings
+from draftfast.csv_parse import salary_download
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salaries = '{}/data/dk-nba-salaries.csv'.format(CURRENT_DIR)
+pids = '{}/data/dk-nba-pids.csv'.format(CURRENT_DIR)
+
+
+def _pool(**kwargs):
+    return salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        game=rules.DRAFT_KINGS,
+        **kwargs
+    )
+
+
+def _in_temp_dir(fn):
+    def wrapped():
+        out_dir = tempfile.mkdtemp()
+        try:
+            fn(out_dir)
+        finally:
+            shutil.rmtree(out_dir)
+    wrapped.__name__ = fn.__name__
+    return wrapped
+
+
+@_in_temp_dir
+def test_jsonl_round_trip(out_dir):
+    players = _pool()
+    rosters, _ = run_multi(
+        iterations=3,
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+        optimizer_settings=OptimizerSettings(),
+    )
+    path = os.path.join(out_dir, 'lineups.jsonl')
+    lineup_store.write_jsonl(
+        rosters,
+        path,
+        players,
+        metadata=[{'iteration': i} for i in range(len(rosters))],
+    )
+
+    records = list(lineup_store.read_jsonl(path))
+    ntools.assert_equal(len(records), 3)
+    ntools.assert_equal(len(records[0]['pool']), 8)
+    ntools.assert_equal(records[2]['meta'], {'iteration': 2})
+    ntools.assert_equal(records[0]['proj'], rosters[0].projected())
+
+    loaded = lineup_store.load_jsonl(
+        path,
+        players,
+        rule_set=rules.DK_NBA_RULE_SET,
+    )
+    for roster, loaded_roster in zip(rosters, loaded):
+        ntools.assert_true(roster.exact_equal(loaded_roster))
+        ntools.assert_equal(roster.projected(), loaded_roster.projected())
+
+
+@_in_temp_dir
+def test_jsonl_site_ids_and_slots(out_dir):
+    players = _pool(split_positions=False, pid_file=pids)
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+        optimizer_settings=OptimizerSettings(use_slots=True),
+    )
+    path = os.path.join(out_dir, 'lineups.jsonl')
+    lineup_store.write_jsonl(
+        [roster],
+        path,
+        players,
+        key=lineup_store.SITE_ID,
+    )
+    record = next(lineup_store.read_jsonl(path))
+    ntools.assert_equal(
+        record['ids'],
+        [p.player_id for p in roster.sorted_players()],
+    )
+
+    loaded, = lineup_store.load_jsonl(
+        path,
+        players,
+        rule_set=rules.DK_NBA_RULE_SET,
+    )
+    ntools.assert_equal(
+        [p.pos for p in loaded.sorted_players()],
+        [p.pos for p in roster.sorted_players()],
+    )
+
+
+@_in_temp_dir
+def test_jsonl_site_ids_split_positions(out_dir):
+    players = _pool(pid_file=pids)
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=[
+            p for p in players
+            if not (p.name == 'James Harden' and p.pos == 'SG')
+        ],
+        exposure_dict={'locked': ['James Harden']},
+        lowest_salary=0,
+    )
+    path = os.path.join(out_dir, 'lineups.jsonl')
+    lineup_store.write_jsonl(
+        [roster],
+        path,
+        players,
+        key=lineup_store.SITE_ID,
+    )
+
+    loaded, = lineup_store.load_jsonl(
+        path,
+        players,
+        rule_set=rules.DK_NBA_RULE_SET,
+    )
+    harden, = [p for p in loaded.players if p.name == 'James Harden']
+    ntools.assert_equal(harden.pos, 'PG')
+    ntools.assert_true(loaded.exact_equal(roster))
+
+
+@_in_temp_dir
+def test_jsonl_site_ids_required(out_dir):
+    players = _pool()
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+        optimizer_settings=OptimizerSettings(),
+    )
+    path = os.path.join(out_dir, 'lineups.jsonl')
+    with ntools.assert_raises_regex(ValueError, roster.players[0].name):
+        lineup_store.write_jsonl(
+            [roster],
+            path,
+            players,
+            key=lineup_store.SITE_ID,
+        )
+
+
+@_in_temp_dir
+def test_array_round_trip(out_dir):
+    players = _pool()
+    pool = salary_download.generate_columnar_pool(
+        salary_file_location=salaries,
+        game=rules.DRAFT_KINGS,
+    )
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+    )
+    path = os.path.join(out_dir, 'lineups.npz')
+    lineup_store.write_array([roster, roster], path, pool)
+    loaded = lineup_store.load_array(
+        path,
+        pool,
+        rule_set=rules.DK_NBA_RULE_SET,
+    )
+    ntools.assert_equal(len(loaded), 2)
+    ntools.assert_true(loaded[1].exact_equal(roster))
@@ -3,6 +3,7 @@ from nose import tools as ntools
 from draftfast.orm import Player
 from draftfast.optimize import run
 from draftfast import rules
+from draftfast.settings import OptimizerSettings
 from draftfast.csv_parse import salary_download as sd
 
 
@@ -66,3 +67,30 @@ def test_optimize_with_general():
         ntools.assert_true(get_player_count_at_pos(rosters[i], 'G') in [3, 4])
         ntools.assert_true(get_player_count_at_pos(rosters[i], 'F') in [3, 4])
         ntools.assert_true(get_player_count_at_pos(rosters[i], 'C') in [1, 2])
+
+
+def test_optimize_with_slots():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    players = sd.generate_players_from_csvs(
+        game=rules.DRAFT_KINGS,
+        salary_file_location='{}/data/dk-nba-salaries.csv'.format(
+            current_dir
+        ),
+        split_positions=False,
+    )
+    ntools.assert_equal(len(players), 233)
+
+    roster = run(
+        rule_set=rules.DK_NBA_RULE_SET,
+        player_pool=players,
+        optimizer_settings=OptimizerSettings(use_slots=True),
+    )
+    ntools.assert_equal(roster.projected(), 279.53)
+    ntools.assert_equal(
+        sorted(p.slot for p in roster.players),
+        sorted(slot for slot, _ in rules.DK_NBA_RULE_SET.slots),
+    )
+    for p in roster.players:
+        slot_positions = dict(rules.DK_NBA_RULE_SET.slots)[p.slot]
+        ntools.assert_true(p.pos in slot_positions)
+        ntools.assert_true(p.pos in p.possible_positions.split('/'))
@@ -3,12 +3,12 @@ from draftfast.optimize import run
 from draftfast import rules
 from draftfast.orm import Player
 from draftfast.settings import OptimizerSettings
-from draftfast.showdown.orm import ShowdownPlayer
+from draftfast.showdown.orm import ShowdownPlayer, generate_showdown_pool
 from draftfast.lineup_constraints import LineupConstraints
 
 
-def _build_mock_player_pool():
-    player_pool = [
+def _build_base_player_pool():
+    return [
         Player(name='A1', cost=5500, proj=100, pos='QB',
                team='X', matchup='X@Y'),
         Player(name='A2', cost=5500, proj=41, pos='QB',
@@ -59,6 +59,10 @@ def _build_mock_player_pool():
                team='Y', matchup='X@Y'),
     ]
 
+
+def _build_mock_player_pool():
+    player_pool = _build_base_player_pool()
+
     def capt_boost(p):
         return Player(
             name=p.name,
@@ -96,6 +100,38 @@ def test_nfl_dk_showdown_mock():
     ntools.assert_equal(roster.projected(), 421)
 
 
+def test_generate_showdown_pool():
+    base = [
+        Player(name='A1', cost=5000, proj=20, pos='QB', team='X'),
+        Player(name='A2', cost=4000, proj=10, pos='WR', team='Y'),
+    ]
+
+    dk_pool = generate_showdown_pool(base, site=rules.DRAFT_KINGS)
+    ntools.assert_equal(len(dk_pool), 4)
+    ntools.assert_equal([p.pos for p in dk_pool],
+                        ['FLEX', 'FLEX', 'CPT', 'CPT'])
+    ntools.assert_equal(dk_pool[2].cost, 7500)
+    ntools.assert_equal(dk_pool[2].proj, 30)
+    ntools.assert_equal(dk_pool[2].real_pos, 'QB')
+    ntools.assert_equal(base[0].cost, 5000)
+
+    fd_pool = generate_showdown_pool(base, site=rules.FAN_DUEL)
+    ntools.assert_equal(fd_pool[3].cost, 4000)
+    ntools.assert_equal(fd_pool[3].proj, 15)
+
+
+def test_nfl_dk_showdown_generated_pool():
+    roster = run(
+        rule_set=rules.DK_NFL_SHOWDOWN_RULE_SET,
+        player_pool=generate_showdown_pool(_build_base_player_pool()),
+        optimizer_settings=OptimizerSettings(
+            showdown_teams=('X', 'Y'),
+        ),
+    )
+    ntools.assert_not_equal(roster, None)
+    ntools.assert_equal(roster.projected(), 421)
+
+
 def test_nfl_showdown_no_def_against_capt():
     mock_dk_pool = _build_mock_player_pool()
 
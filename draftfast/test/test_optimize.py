@@ -7,6 +7,7 @@ from draftfast.orm import Player
 from draftfast.csv_parse import salary_download
 from draftfast.settings import OptimizerSettings, Stack
 from draftfast.lineup_constraints import LineupConstraints
+from draftfast.dke_exceptions import UnknownOpponentException
 
 mock_nba_pool = [
     Player(name='A1', cost=5500, proj=40, pos='PG'),
@@ -819,3 +820,17 @@ def test_no_mutate_side_Effect():
     )
     brady = next((p for p in players if p.name == 'Tom Brady'))
     ntools.assert_equal(brady.lock, False)
+
+
+def test_no_opp_defense_unknown_matchup():
+    pool = deepcopy(mock_nfl_pool)
+    pool[0].matchup = 'Postponed'
+    with ntools.assert_raises(UnknownOpponentException):
+        run(
+            rule_set=rules.DK_NFL_RULE_SET,
+            player_pool=pool,
+            optimizer_settings=OptimizerSettings(
+                no_offense_against_defense=True
+            ),
+            verbose=True
+        )
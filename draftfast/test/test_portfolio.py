@@ -0,0 +1,88 @@
+from itertools import combinations
+from nose import tools as ntools
+from draftfast.orm import Player, NFLRoster, ShowdownRoster
+from draftfast.showdown.orm import ShowdownPlayer
+from draftfast.portfolio import Portfolio
+
+
+def _player(name, pos, team, matchup):
+    return Player(name=name, pos=pos, team=team, matchup=matchup,
+                  cost=1, proj=1)
+
+
+QB_NO = _player('Drew Brees', 'QB', 'NO', 'TB@NO')
+WR_NO = _player('Michael Thomas', 'WR', 'NO', 'TB@NO')
+TE_NO = _player('Jimmy Graham', 'TE', 'NO', 'TB@NO')
+WR_TB = _player('Mike Evans', 'WR', 'TB', 'TB@NO')
+QB_GB = _player('Aaron Rodgers', 'QB', 'GB', 'GB@CHI')
+RB_CHI = _player('Matt Forte', 'RB', 'CHI', 'GB@CHI')
+
+
+def _portfolio():
+    rosters = []
+    for players in [
+        [QB_NO, WR_NO, TE_NO, WR_TB],
+        [QB_GB, WR_NO, RB_CHI],
+        [QB_NO, WR_TB, RB_CHI],
+    ]:
+        roster = NFLRoster()
+        for p in players:
+            roster.add_player(p)
+        rosters.append(roster)
+    return rosters, Portfolio(rosters)
+
+
+def test_team_and_game_exposure():
+    _, portfolio = _portfolio()
+    ntools.assert_equal(portfolio.team_exposure(), {
+        'NO': 1.0,
+        'TB': 2 / 3,
+        'CHI': 2 / 3,
+        'GB': 1 / 3,
+    })
+    ntools.assert_equal(portfolio.team_exposure(min_players=3),
+                        {'NO': 1 / 3})
+    ntools.assert_equal(portfolio.game_exposure(min_players=3),
+                        {'TB @ NO': 1 / 3})
+    ntools.assert_equal(portfolio.game_concentration().tolist(), [4, 2, 2])
+
+
+def test_stack_shapes():
+    _, portfolio = _portfolio()
+    ntools.assert_equal(portfolio.stack_shapes(), [(3,), (), ()])
+    ntools.assert_equal(portfolio.max_stack(positions=['WR', 'TE']).tolist(),
+                        [2, 1, 1])
+    ntools.assert_equal(list(portfolio.shape_counts().items()), [
+        ((), 2),
+        ((3,), 1),
+    ])
+
+
+def test_anchor_stacks():
+    _, portfolio = _portfolio()
+    partners, bring_backs = portfolio.anchor_stacks()
+    ntools.assert_equal(partners.tolist(), [2, 0, 0])
+    ntools.assert_equal(bring_backs.tolist(), [1, 1, 1])
+
+
+def test_overlap_histogram():
+    rosters, portfolio = _portfolio()
+    expected = [0] * 5
+    for a, b in combinations(rosters, 2):
+        names = set(p.name for p in a.players)
+        expected[len(names.intersection(p.name for p in b.players))] += 1
+    ntools.assert_equal(
+        portfolio.overlap_histogram(chunk_size=2).tolist(),
+        expected,
+    )
+
+
+def test_showdown_positions():
+    roster = ShowdownRoster()
+    roster.add_player(ShowdownPlayer(QB_NO, captain=True))
+    roster.add_player(ShowdownPlayer(WR_NO))
+    roster.add_player(ShowdownPlayer(WR_TB))
+    portfolio = Portfolio([roster])
+    partners, bring_backs = portfolio.anchor_stacks()
+    ntools.assert_equal(partners.tolist(), [1])
+    ntools.assert_equal(bring_backs.tolist(), [1])
@@ -0,0 +1,101 @@
+import os
+import numpy as np
+from nose import tools as ntools
+from draftfast.orm import Player
+from draftfast.rules import DRAFT_KINGS
+from draftfast.csv_parse import salary_download
+from draftfast.csv_parse.projection_blend import (
+    ProjectionSource,
+    blend,
+    blend_players,
+)
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salaries = '{}/data/nba-test-salaries.csv'.format(CURRENT_DIR)
+projections = '{}/data/nba-test-projections.csv'.format(CURRENT_DIR)
+
+nan = np.nan
+MATRIX = [
+    [10, 20, 30, 100, nan],
+    [10, nan, nan, nan, nan],
+    [nan, nan, nan, nan, nan],
+]
+
+
+def test_blend_weighted():
+    weights = np.array([[1, 1, 2, 0, 1]] * 3)
+    ntools.assert_equal(
+        blend(MATRIX, weights).tolist()[:2],
+        [22.5, 10],
+    )
+    ntools.assert_true(np.isnan(blend(MATRIX, weights)[2]))
+
+
+def test_blend_median():
+    ntools.assert_equal(
+        blend(MATRIX, method='median').tolist()[:2],
+        [25, 10],
+    )
+
+
+def test_blend_trimmed():
+    ntools.assert_equal(
+        blend(MATRIX, method='trimmed', trim=0.25).tolist()[:2],
+        [25, 10],
+    )
+
+
+@ntools.raises(ValueError)
+def test_blend_unknown_method():
+    blend(MATRIX, method='mean')
+
+
+def test_blend_players_position_weights():
+    players = [
+        Player(name='A', cost=1, proj=0, pos='RB', team='NYG'),
+        Player(name='B', cost=1, proj=0, pos='DST', team='NYG'),
+        Player(name='C', cost=1, proj=0, pos='WR', team='NYG'),
+    ]
+    sources = [
+        ProjectionSource({'A': 10, 'B': 4}),
+        ProjectionSource(
+            {'A Jr.': 20, 'B': 10},
+            weight=3,
+            position_weights={'DST': 0},
+        ),
+    ]
+    unmatched = blend_players(players, sources)
+    ntools.assert_equal([p.proj for p in players], [17.5, 4, 0])
+    ntools.assert_equal(unmatched, [players[2]])
+
+
+def test_generate_players_with_sources():
+    source = ProjectionSource.from_csv(projections)
+    doubled = ProjectionSource(
+        {k: v * 2 for k, v in source.projections.items()},
+    )
+    single = salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        projection_file_location=projections,
+        game=DRAFT_KINGS,
+    )
+    blended = salary_download.generate_players_from_csvs(
+        salary_file_location=salaries,
+        projection_sources=[source, doubled],
+        game=DRAFT_KINGS,
+    )
+    ntools.assert_equal(
+        [round(p.proj * 1.5, 6) for p in single],
+        [round(p.proj, 6) for p in blended],
+    )
+
+    pool = salary_download.generate_columnar_pool(
+        salary_file_location=salaries,
+        projection_sources=[source, doubled],
+        blend_method='median',
+        game=DRAFT_KINGS,
+    )
+    ntools.assert_equal(
+        [round(p, 6) for p in pool.proj],
+        [round(p.proj, 6) for p in blended],
+    )
@@ -0,0 +1,83 @@
+import warnings
+from nose import tools as ntools
+from draftfast.orm import Player
+from draftfast.csv_parse.projection_index import (
+    ProjectionIndex,
+    normalize_name,
+)
+
+
+def test_normalize_name():
+    ntools.assert_equal(normalize_name('Larry Nance Jr.'), 'larry nance')
+    ntools.assert_equal(normalize_name('James Ennis III'), 'james ennis')
+    ntools.assert_equal(normalize_name("DeAndre' Bembry"), 'deandre bembry')
+    ntools.assert_equal(normalize_name('J.R. Smith'), 'jr smith')
+    ntools.assert_equal(normalize_name('Nikola Jokić'), 'nikola jokic')
+    ntools.assert_equal(normalize_name('  Tomas  Satoransky '),
+                        'tomas satoransky')
+
+
+def test_lookup_by_team():
+    index = ProjectionIndex({
+        'David Johnson ARI': 20,
+        'David Johnson PIT': 2,
+        'Kelly Oubre': 15,
+    })
+    ntools.assert_equal(index.lookup('David Johnson', 'ARI'), 20)
+    ntools.assert_equal(index.lookup('David Johnson', 'pit'), 2)
+    ntools.assert_equal(index.lookup('David Johnson'), None)
+    ntools.assert_equal(index.lookup('Kelly Oubre Jr.', 'WAS'), 15)
+
+
+def test_team_suffix_not_taken_as_team():
+    index = ProjectionIndex({'Todd Gurley II': 18})
+    ntools.assert_equal(index.lookup('Todd Gurley', 'LAR'), 18)
+
+
+def test_renames():
+    index = ProjectionIndex(
+        {'Moe Harkless': 10, 'Marvin Jones DET ': 12},
+        renames={
+            'Maurice Harkless': 'Moe Harkless',
+            'Marvin Jones DET ': 'Marvin Jones Jr.',
+        },
+    )
+    ntools.assert_equal(index.lookup('Maurice Harkless', 'POR'), 10)
+    ntools.assert_equal(index.lookup('Marvin Jones Jr.', 'DET'), 12)
+
+
+def test_join_players_reports_unmatched():
+    players = [
+        Player(name='Kelly Oubre Jr.', cost=1, proj=0, pos='SG', team='WAS'),
+        Player(name='Kelly Oubre Jr.', cost=1, proj=0, pos='SF', team='WAS'),
+        Player(name='Nobody', cost=1, proj=5, pos='C', team='WAS'),
+    ]
+    index = ProjectionIndex({'Kelly Oubre': 15.5}, teams=['WAS'])
+    unmatched = index.join_players(players)
+    ntools.assert_equal([p.proj for p in players], [15.5, 15.5, 0])
+    ntools.assert_equal(unmatched, [players[2]])
+
+
+def test_renames_list_shape():
+    index = ProjectionIndex(
+        {'Moe Harkless': 10},
+        renames=[{'dk_name': 'Maurice Harkless', 'name': 'Moe Harkless'}],
+    )
+    ntools.assert_equal(index.lookup('Maurice Harkless', 'POR'), 10)
+
+
+def test_suffix_collisions_are_reported():
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        index = ProjectionIndex({
+            'Larry Nance': 8,
+            'Larry Nance Jr.': 20,
+        })
+    ntools.assert_equal(len(caught), 1)
+    ntools.assert_equal(
+        index.collisions,
+        {('larry nance', None): ['Larry Nance', 'Larry Nance Jr.']},
+    )
+    ntools.assert_equal(index.lookup('Larry Nance'), 8)
+    ntools.assert_equal(index.lookup('Larry Nance Jr.'), 20)
+    ntools.assert_equal(index.lookup('Larry Nance III'), None)
@@ -0,0 +1,98 @@
+import json
+from nose import tools as ntools
+from draftfast import render
+from draftfast.exposure import ExposureSummary, get_exposure_matrix
+from draftfast.test.test_exposure import _mock_rosters
+
+HEADERS = ['Player', 'Points']
+
+
+def _rows(consumed):
+    for i in range(1000):
+        consumed.append(i)
+        yield ['P{}'.format(i), i]
+
+
+def test_limit_consumes_only_the_page():
+    consumed = []
+    output = render.render(HEADERS, _rows(consumed), fmt=render.CSV,
+                           limit=2, offset=3)
+    ntools.assert_equal(output, 'Player,Points\nP3,3\nP4,4')
+    ntools.assert_equal(consumed, [0, 1, 2, 3, 4])
+
+
+def test_iter_render_is_lazy():
+    consumed = []
+    lines = render.iter_render(HEADERS, _rows(consumed), fmt=render.JSON)
+    ntools.assert_equal(consumed, [])
+    ntools.assert_equal(json.loads(next(lines)), {'Player': 'P0', 'Points': 0})
+    ntools.assert_equal(consumed, [0])
+
+
+def test_plain():
+    output = render.render(HEADERS, [['A', 1], ['Bob', None]],
+                           fmt=render.PLAIN)
+    ntools.assert_equal(output, 'Player  Points\nA       1\nBob')
+
+
+def test_unknown_format():
+    with ntools.assert_raises(ValueError):
+        render.render(HEADERS, [], fmt='html')
+
+
+def test_roster_formats():
+    _, rosters = _mock_rosters()
+    roster = rosters[0]
+    ntools.assert_equal(render.render_roster(roster), repr(roster))
+
+    records = [
+        json.loads(line)
+        for line in render.render_roster(roster, fmt=render.JSON).split('\n')
+    ]
+    ntools.assert_equal([r['Player'] for r in records],
+                        ['A Player', 'B Player'])
+    ntools.assert_equal(records[0]['Salary'], 1)
+
+    plain = render.render_roster(roster, fmt=render.PLAIN).split('\n')
+    ntools.assert_false(any('\x1b' in line for line in plain))
+    ntools.assert_equal(plain[1].split()[-1], '1.00')
+
+
+def test_exposure_page():
+    _, rosters = _mock_rosters()
+    summary = ExposureSummary(rosters, [
+        {'name': 'A Player', 'min': 0, 'max': 0.5},
+    ])
+    output = summary.table(fmt=render.CSV, limit=2)
+    ntools.assert_equal(output.split('\n')[1:], [
+        'SG,B Player,,,1.0,1,3,,',
+        'PG,A Player,,,1.0,1,2,0,1.5',
+    ])
+    ntools.assert_true(summary.table().startswith('Roster Exposure:\n'))
+
+
+def test_exposure_matrix_limit():
+    _, rosters = _mock_rosters()
+    output = get_exposure_matrix(rosters, fmt=render.CSV, limit=2)
+    ntools.assert_equal(output.split('\n'), [
+        ',A. Player,B. Player',
+        'A. Player,2,2',
+        'B. Player,2,3',
+    ])
+
+
+def test_exposure_matrix_json():
+    _, rosters = _mock_rosters()
+    rows = [
+        json.loads(line) for line in
+        get_exposure_matrix(rosters, fmt=render.JSON, limit=2).split('\n')
+    ]
+    ntools.assert_equal(rows, [
+        {'': 'A Player PG None', 'A Player PG None': 2, 'B Player SG None': 2},
+        {'': 'B Player SG None', 'A Player PG None': 2, 'B Player SG None': 3},
+    ])
+
+
+def test_json_rejects_duplicate_headers():
+    with ntools.assert_raises(ValueError):
+        render.render(['A. Player', 'A. Player'], [[1, 2]], fmt=render.JSON)
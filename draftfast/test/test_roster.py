@@ -23,3 +23,37 @@ def test_roster_equality():
     ntool.assert_false(roster_a == roster_c)
     ntool.assert_true(roster_a.exact_equal(roster_b))
     ntool.assert_true(roster_a == roster_b)
+
+
+def test_sorted_players_cache_invalidation():
+    qb = Player(pos='QB', name='B', cost=1, team='X')
+    rb = Player(pos='RB', name='A', cost=1, team='X')
+
+    roster = NFLRoster()
+    roster.add_player(rb)
+    ntool.assert_equal(roster.sorted_players(), [rb])
+    roster.sorted_players().append(qb)
+    ntool.assert_equal(roster.sorted_players(), [rb])
+
+    roster.add_player(qb)
+    ntool.assert_equal(roster.sorted_players(), [qb, rb])
+
+    roster.players = [rb]
+    ntool.assert_equal(roster.sorted_players(), [rb])
+
+
+def test_sorted_players_in_place_change():
+    qb = Player(pos='QB', name='B', cost=1, team='X')
+    rb = Player(pos='RB', name='A', cost=1, team='X')
+    wr = Player(pos='WR', name='C', cost=1, team='X')
+
+    roster = NFLRoster()
+    roster.add_player(rb)
+    roster.add_player(wr)
+    ntool.assert_equal(roster.sorted_players(), [rb, wr])
+
+    roster.players[1] = qb
+    ntool.assert_equal(roster.sorted_players(), [qb, rb])
+
+    roster.players.remove(qb)
+    ntool.assert_equal(roster.sorted_players(), [rb])
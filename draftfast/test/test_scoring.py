@@ -0,0 +1,79 @@
+import numpy as np
+from nose import tools as ntools
+from draftfast.orm import Player, NFLRoster
+from draftfast.columnar import ColumnarPool
+from draftfast.lineup_store import lineup_record, PoolLookup, SITE_ID
+from draftfast import scoring
+
+
+def _pool():
+    pool = [
+        Player(name='Drew Brees', pos='QB', team='NO', cost=1, proj=20),
+        Player(name='Michael Thomas', pos='WR', team='NO', cost=1, proj=15),
+        Player(name='Mike Evans', pos='WR', team='TB', cost=1, proj=12),
+        Player(name='Odell Beckham Jr.', pos='WR', team='NYG', cost=1,
+               proj=18),
+    ]
+    for i, p in enumerate(pool):
+        p.player_id = str(100 + i)
+    return pool
+
+
+RESULTS = {
+    'Drew Brees': 31.5,
+    'Michael Thomas NO': 22,
+    'Odell Beckham': 9,
+}
+
+
+def test_actual_points():
+    pool = _pool()
+    points, matched = scoring.actual_points(pool, RESULTS)
+    ntools.assert_equal(points.tolist(), [31.5, 22, 0, 9])
+    ntools.assert_equal(matched.tolist(), [True, True, False, True])
+
+    columnar, _ = scoring.actual_points(ColumnarPool.from_players(pool),
+                                        RESULTS)
+    ntools.assert_equal(columnar.tolist(), points.tolist())
+
+    points, _ = scoring.actual_points(pool, {'101': 10, '102': 4}, by='id',
+                                      position_multipliers={'WR': 1.5})
+    ntools.assert_equal(points.tolist(), [0, 15, 6, 0])
+
+    with ntools.assert_raises(ValueError):
+        scoring.actual_points(pool, RESULTS, by='team')
+
+
+def test_score_lineups():
+    pool = _pool()
+    points, _ = scoring.actual_points(pool, RESULTS)
+
+    roster = NFLRoster()
+    roster.add_player(pool[0])
+    roster.add_player(pool[3])
+    record = lineup_record(roster, PoolLookup(pool), key=SITE_ID)
+
+    lineups = [roster, record, [1, 2], []]
+    ntools.assert_equal(
+        scoring.score_lineups(lineups, points, pool).tolist(),
+        [40.5, 40.5, 22, 0],
+    )
+    ntools.assert_equal(
+        scoring.score_lineups(iter([[0, 1]]), points).tolist(),
+        [53.5],
+    )
+    ntools.assert_equal(
+        scoring.score_lineups(np.array([[0, 1], [2, 3]]), points).tolist(),
+        [53.5, 9],
+    )
+    with ntools.assert_raises(ValueError):
+        scoring.score_lineups([roster], points)
+
+
+def test_rank_against_field():
+    rank, percentile = scoring.rank_against_field(
+        [150, 120, 90, 200],
+        [100, 120, 150, 110, 80],
+    )
+    ntools.assert_equal(rank.tolist(), [1, 2, 5, 1])
+    ntools.assert_equal(percentile.tolist(), [80, 60, 20, 100])
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+from nose import tools as ntools
+from draftfast import rules
+from draftfast import shared_pool
+from draftfast.games import GameTable
+from draftfast.csv_parse import salary_download
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+salaries = '{}/data/dk-nfl-salaries.csv'.format(CURRENT_DIR)
+
+
+def test_write_and_attach_pool():
+    pool = salary_download.generate_columnar_pool(
+        salary_file_location=salaries,
+        game=rules.DRAFT_KINGS,
+    )
+    out_dir = tempfile.mkdtemp()
+    try:
+        path = shared_pool.write_pool(
+            pool,
+            os.path.join(out_dir, 'pool.bin'),
+        )
+        attached = shared_pool.attach_pool(path)
+
+        ntools.assert_equal(len(attached), len(pool))
+        ntools.assert_equal(list(attached.name), list(pool.name))
+        ntools.assert_equal(list(attached.matchup), list(pool.matchup))
+        ntools.assert_equal(list(attached.proj), list(pool.proj))
+        ntools.assert_equal(list(attached.opp_id), list(pool.opp_id))
+        ntools.assert_false(attached.proj.flags.writeable)
+        ntools.assert_equal(attached.game_table.teams, pool.game_table.teams)
+        ntools.assert_equal(attached.to_players(), pool.to_players())
+        ntools.assert_equal(
+            [p.is_home for p in attached.to_players()],
+            [p.is_home for p in pool.to_players()],
+        )
+    finally:
+        shutil.rmtree(out_dir)
+
+
+def test_game_table_round_trip():
+    table = GameTable()
+    table.game_id('TB@Atl 01:00PM ET')
+    table.game_id('CEL vs LGN')
+    restored = GameTable.from_dict(table.to_dict())
+    ntools.assert_equal(restored.teams, table.teams)
+    ntools.assert_equal(restored.game_home, table.game_home)
+    ntools.assert_equal(restored.game_id('CEL vs LGN'), 1)
@@ -0,0 +1,67 @@
+import numpy as np
+from nose import tools as ntools
+from draftfast.orm import Player, NFLRoster
+from draftfast.simulate import Simulator, LOGNORMAL
+
+
+def _pool():
+    return [
+        Player(name='Drew Brees', pos='QB', team='NO', matchup='TB@NO',
+               cost=1, proj=20),
+        Player(name='Michael Thomas', pos='WR', team='NO', matchup='TB@NO',
+               cost=1, proj=15),
+        Player(name='Mike Evans', pos='WR', team='TB', matchup='TB@NO',
+               cost=1, proj=12),
+        Player(name='Aaron Rodgers', pos='QB', team='GB', matchup='GB@CHI',
+               cost=1, proj=18),
+    ]
+
+
+def test_zero_variance_scores_projections():
+    sim = Simulator(_pool(), default_cv=0)
+    result = sim.score([[0, 1], [2, 3, 1], [3]], n_sims=10,
+                       thresholds=(30,), seed=1)
+    ntools.assert_equal(result['mean'].tolist(), [35, 45, 18])
+    ntools.assert_equal(result['std'].tolist(), [0, 0, 0])
+    ntools.assert_equal(result['percentiles'][50].tolist(), [35, 45, 18])
+    ntools.assert_equal(result['beat'][30].tolist(), [1, 1, 0])
+
+
+def test_correlated_samples():
+    sim = Simulator(_pool(), team_corr=0.5, game_corr=0.2)
+    samples = sim.sample(20000, seed=1)
+    ntools.assert_equal(samples.shape, (20000, 4))
+    corr = np.corrcoef(samples.T)
+    ntools.assert_almost_equal(corr[0, 1], 0.5, places=1)
+    ntools.assert_almost_equal(corr[0, 2], 0.2, places=1)
+    ntools.assert_almost_equal(corr[0, 3], 0, places=1)
+    ntools.assert_almost_equal(samples[:, 0].std() / 20, 0.35, places=1)
+
+
+def test_correlation_matrix_and_lognormal():
+    correlation = np.eye(4)
+    correlation[0, 3] = correlation[3, 0] = 0.8
+    sim = Simulator(_pool(), correlation=correlation,
+                    distribution=LOGNORMAL)
+    samples = sim.sample(20000, seed=2)
+    ntools.assert_true((samples > 0).all())
+    ntools.assert_almost_equal(samples[:, 0].mean() / 20, 1, places=1)
+    ntools.assert_true(np.corrcoef(samples[:, 0], samples[:, 3])[0, 1] > 0.7)
+
+
+def test_score_rosters():
+    pool = _pool()
+    roster = NFLRoster()
+    roster.add_player(pool[0])
+    roster.add_player(pool[2])
+    sim = Simulator(pool)
+    ntools.assert_equal(sim.lineup_indexes([roster]).tolist(), [[0, 2]])
+    result = sim.score([roster], n_sims=5000, percentiles=(), seed=3)
+    ntools.assert_almost_equal(result['mean'][0] / 32, 1, places=1)
+
+
+def test_invalid_settings():
+    with ntools.assert_raises(ValueError):
+        Simulator(_pool(), team_corr=0.1, game_corr=0.2)
+    with ntools.assert_raises(ValueError):
+        Simulator(_pool(), distribution='uniform')
@@ -0,0 +1,57 @@
+from nose import tools as ntools
+from draftfast import rules
+from draftfast import dke_exceptions as dke
+from draftfast.orm import Player
+from draftfast.csv_parse.slot_assignment import (
+    SlotAssigner,
+    get_slot_assigner,
+)
+
+
+def test_assign_moves_earlier_player():
+    assigner = SlotAssigner([
+        ['G', ['PG', 'SG']],
+        ['PG', ['PG']],
+    ])
+    ntools.assert_equal(assigner.assign(['PG', 'SG']), (1, 0))
+
+
+def test_assign_multi_position_players():
+    assigner = SlotAssigner(rules.DK_NBA_RULE_SET.slots)
+    positions = ['PG/SG', 'PG', 'SF/PF', 'SF', 'C', 'PF/C', 'SG', 'C']
+    assignment = assigner.assign(positions)
+    ntools.assert_equal(sorted(assignment), list(range(8)))
+    for (slot, allowed), i in zip(assigner.slots, assignment):
+        ntools.assert_true(allowed.intersection(positions[i].split('/')))
+
+
+def test_assign_is_memoized():
+    assigner = get_slot_assigner(rules.DRAFT_KINGS, 'NFL')
+    positions = ('QB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'DST')
+    ntools.assert_true(assigner.assign(positions) is
+                       assigner.assign(list(positions)))
+    ntools.assert_equal(assigner.assign(positions),
+                        (0, 1, 2, 4, 5, 6, 7, 3, 8))
+
+
+def test_order_players():
+    players = [
+        Player(name='A', cost=1, proj=1, pos='F'),
+        Player(name='B', cost=1, proj=1, pos='G'),
+        Player(name='C', cost=1, proj=1, pos='F'),
+        Player(name='D', cost=1, proj=1, pos='F'),
+        Player(name='E', cost=1, proj=1, pos='F'),
+        Player(name='F', cost=1, proj=1, pos='G'),
+    ]
+    ordered = get_slot_assigner(rules.DRAFT_KINGS, 'EL').order(players)
+    ntools.assert_equal(
+        [p.name for p in ordered],
+        ['B', 'F', 'A', 'C', 'D', 'E'],
+    )
+
+
+@ntools.raises(dke.InvalidSlotAssignmentException)
+def test_assign_impossible():
+    get_slot_assigner(rules.DRAFT_KINGS, 'EL').assign(
+        ['G', 'F', 'F', 'F', 'F', 'F'],
+    )
@@ -1,7 +1,7 @@
 from draftfast import rules
 from draftfast.optimize import run
 from draftfast.orm import Player
-from draftfast.showdown.orm import ShowdownPlayer
+from draftfast.showdown.orm import generate_showdown_pool
 
 player_pool = [
     Player(name='A1', cost=5500, proj=100, pos='QB',
@@ -55,24 +55,7 @@ player_pool = [
 ]
 
 
-def capt_boost(p):
-    return Player(
-        name=p.name,
-        team=p.team,
-        matchup=p.matchup,
-        pos=p.pos,
-        cost=p.cost * 1.5,
-        proj=p.proj * 1.5,
-    )
-
-
-captain_pool = [capt_boost(p) for p in player_pool]
-
-mock_dk_pool = []
-for p in player_pool:
-    mock_dk_pool.append(ShowdownPlayer(p))
-for p in captain_pool:
-    mock_dk_pool.append(ShowdownPlayer(p, captain=True))
+mock_dk_pool = generate_showdown_pool(player_pool, site=rules.DRAFT_KINGS)
 
 run(
     rule_set=rules.DK_NFL_SHOWDOWN_RULE_SET,
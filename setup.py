@@ -26,4 +26,7 @@ setuptools.setup(
         'Operating System :: OS Independent',
     ],
     install_requires=requires,
+    extras_require={
+        'arrow': ['pyarrow'],
+    },
 )